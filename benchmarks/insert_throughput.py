@@ -0,0 +1,152 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The throughput of the table loaders.
+
+Compares executemany with COPY on a scratch copy of the transaction table of the
+source database. COPY is only measured on PostgreSQL.
+
+Then compares loading a chunk of customer behaviors and its transactions in turn on
+one session with loading the two tables at the same time on two sessions, each
+committed after both loads. The concurrent load is only measured on PostgreSQL.
+
+    % PYTHONPATH=src python benchmarks/insert_throughput.py --count 200000
+"""
+
+
+import argparse
+import time
+from functools import partial
+
+import numpy as np
+import sqlalchemy as sa
+
+from company_operation_data_gen.batch import RecordBatch
+from company_operation_data_gen.constants import BehaviorAttributeConstants
+from company_operation_data_gen.database import ds
+from company_operation_data_gen.loader import (
+    load_table,
+    supports_concurrent_load,
+    supports_copy,
+)
+from company_operation_data_gen.models import CustomerBehaviorSource, TransactionSource
+from company_operation_data_gen.parallel import run_in_transactions
+from company_operation_data_gen.schemas import CustomerBehaviorRecord, TransactionRecord
+
+
+def make_transactions(count: int) -> RecordBatch:
+    """Returns random transactions as columns."""
+    rng = np.random.default_rng(0)
+    quantity = rng.integers(1, 5, size=count)
+    promotion_price = rng.integers(100, 2000, size=count)
+    amount = quantity * promotion_price
+    discount = amount // 10
+    return RecordBatch(
+        schema=TransactionRecord,
+        columns={
+            "customer_id": np.char.add("c", np.arange(count).astype(str)),
+            "product_id": np.char.add(
+                "p", rng.integers(0, 500, size=count).astype(str)
+            ),
+            "quantity": quantity,
+            "promotion_price": promotion_price,
+            "amount": amount,
+            "discount": discount,
+            "gift": np.where(rng.random(count) < 0.1, "毛毯", None).astype(object),
+            "total": amount - discount,
+            "transaction_at": np.datetime64("2025-03-17T00:00:00", "us")
+            + rng.integers(0, 86_400_000_000, size=count).astype("timedelta64[us]"),
+        },
+    )
+
+
+def make_behaviors(count: int) -> RecordBatch:
+    """Returns random customer behaviors as columns."""
+    rng = np.random.default_rng(1)
+    return RecordBatch(
+        schema=CustomerBehaviorRecord,
+        columns={
+            "customer_id": np.char.add("c", np.arange(count).astype(str)),
+            "product_id": np.char.add(
+                "p", rng.integers(0, 500, size=count).astype(str)
+            ),
+            "action_type": rng.choice(["view", "add_to_cart", "purchase"], size=count),
+            "device_type": rng.choice(
+                BehaviorAttributeConstants.DEVICE_TYPE, size=count
+            ),
+            "referrer": rng.choice(BehaviorAttributeConstants.REFERRER, size=count),
+            "action_at": np.datetime64("2025-03-17T00:00:00", "us")
+            + rng.integers(0, 86_400_000_000, size=count).astype("timedelta64[us]"),
+        },
+    )
+
+
+def compare_activity_loads(count: int) -> None:
+    """Prints the seconds of loading a chunk of both activity tables in turn and concurrently."""
+    metadata = sa.MetaData()
+    tables = {
+        CustomerBehaviorSource.__table__.to_metadata(
+            metadata, name="benchmark_customer_behavior"
+        ): make_behaviors(count),
+        TransactionSource.__table__.to_metadata(
+            metadata, name="benchmark_transaction"
+        ): make_transactions(count),
+    }
+    with ds.get_db() as db:
+        methods = ["serial"] + (["concurrent"] if supports_concurrent_load(db) else [])
+        for method in methods:
+            metadata.drop_all(db.bind)
+            metadata.create_all(db.bind)
+            t_start = time.perf_counter()
+            if method == "serial":
+                for table, data in tables.items():
+                    load_table(db, table, data)
+                db.commit()
+            else:
+                run_in_transactions(
+                    db.bind,
+                    {
+                        table.name: partial(load_table, table=table, data=data)
+                        for table, data in tables.items()
+                    },
+                )
+            elapsed = time.perf_counter() - t_start
+            print(
+                f"{method:>11}: 2 x {count} rows in {elapsed:.2f}s, {2 * count / elapsed:,.0f} rows/s"
+            )
+        metadata.drop_all(db.bind)
+
+
+def main():
+    """Prints the rows per second of each loader."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=200_000)
+    args = parser.parse_args()
+
+    data = make_transactions(args.count)
+    metadata = sa.MetaData()
+    table = TransactionSource.__table__.to_metadata(
+        metadata, name="benchmark_transaction"
+    )
+    with ds.get_db() as db:
+        methods = ["executemany"] + (["copy"] if supports_copy(db) else [])
+        for method in methods:
+            metadata.drop_all(db.bind)
+            metadata.create_all(db.bind)
+            t_start = time.perf_counter()
+            load_table(db, table, data, method=method)
+            db.commit()
+            elapsed = time.perf_counter() - t_start
+            print(
+                f"{method:>11}: {args.count} rows in {elapsed:.2f}s, {args.count / elapsed:,.0f} rows/s"
+            )
+        metadata.drop_all(db.bind)
+
+    compare_activity_loads(args.count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The throughput of the personal data generation.
+
+Compares the per-customer Faker calls with the bulk personal data generator.
+
+    % PYTHONPATH=src python benchmarks/pii_throughput.py --count 100000
+"""
+
+
+import argparse
+import time
+
+import numpy as np
+from faker import Faker
+
+from company_operation_data_gen.pii import pii_gen
+
+
+def faker_path(count: int) -> None:
+    """Generates the personal data with five Faker calls per customer."""
+    fake = Faker("zh-TW")
+    for _ in range(count):
+        fake.name()
+        fake.random_element(elements=("M", "F"))
+        fake.date_of_birth(minimum_age=16, maximum_age=70)
+        fake.email()
+        fake.phone_number()
+
+
+def bulk_path(count: int) -> None:
+    """Generates the personal data with the bulk generator."""
+    pii_gen.generate(count, rng=np.random.default_rng(0))
+
+
+def main():
+    """Prints the customers per second of both paths."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    for name, function in [("faker", faker_path), ("bulk", bulk_path)]:
+        t_start = time.perf_counter()
+        function(args.count)
+        elapsed = time.perf_counter() - t_start
+        print(
+            f"{name:>6}: {args.count} customers in {elapsed:.2f}s, {args.count / elapsed:,.0f} customers/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
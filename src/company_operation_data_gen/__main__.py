@@ -13,6 +13,10 @@ from .generate import (
     daily_register_customer,
     daily_behavior_transaction,
 )
+from .backfill import activity_backfill
+from .journal import DEFAULT_JOURNAL_PATH
+from .profile import get_profile, list_profiles, load_profile, set_profile
+from .staging import CONFLICT_MODES
 from . import VERSION
 
 
@@ -20,17 +24,55 @@ def main():
     """The main program."""
     t_start: dt.datetime = dt.datetime.now()
     args: argparse.Namespace = parse_args()
+    profile = load_profile(args.profile)
+    if args.batch_size is not None:
+        profile = profile.model_copy(update={"batch_size": args.batch_size})
+    if args.on_conflict is not None:
+        profile = profile.model_copy(update={"on_conflict": args.on_conflict})
+    if args.concurrent_load is not None:
+        profile = profile.model_copy(update={"concurrent_load": args.concurrent_load})
+    set_profile(profile)
+    LOGGER.info(f"Using the '{args.profile}' scale profile.")
 
     if args.command == "init":
         LOGGER.info("Generating the initial customer data.")
-        init_customer()
+        init_customer(
+            count=args.count,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            seed=args.seed,
+            writers=args.writers,
+        )
     elif args.command == "weekly":
         LOGGER.info("Generating weekly product data.")
         weekly_scrape_product()
     elif args.command == "daily":
         LOGGER.info("Generating daily customer behavior data and transaction data.")
-        daily_register_customer()
-        daily_behavior_transaction()
+        daily_register_customer(seed=args.seed)
+        daily_behavior_transaction(
+            engine=args.engine,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            seed=args.seed,
+            writers=args.writers,
+        )
+    elif args.command == "backfill":
+        LOGGER.info(
+            f"Backfilling customer behavior data and transaction data from {args.start} to {args.end}."
+        )
+        behavior_count, transaction_count = activity_backfill.run(
+            args.start,
+            args.end,
+            workers=args.workers or get_profile().workers,
+            seed=args.seed,
+            engine=args.engine,
+            chunk_size=args.chunk_size,
+            journal=args.journal,
+            writers=args.writers,
+        )
+        LOGGER.info(
+            f"Finished backfilling {behavior_count} customer behavior records and {transaction_count} transaction records."
+        )
 
     LOGGER.info(
         f"Finished at {dt.datetime.now()}. {dt.datetime.now() - t_start} elapsed."
@@ -44,13 +86,104 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "command",
-        choices=["init", "weekly", "daily"],
+        choices=["init", "weekly", "daily", "backfill"],
         help="Choose the command to execute.",
     )
+    parser.add_argument(
+        "--engine",
+        choices=["loop", "vectorized"],
+        default=None,
+        help="Choose the customer activity generator for the daily command. Defaults to the engine of the profile.",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        help="The number of customers in the init command, or viewed products in the daily command, generated and committed at a time. Defaults to the chunk size of the profile.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="The number of processes generating the data. The backfill command generates that many days concurrently. The daily command requires the vectorized engine. Defaults to the workers of the profile.",
+    )
+    parser.add_argument(
+        "--writers",
+        type=int,
+        default=None,
+        help="The number of threads writing the generated chunks to the database while the next chunks are generated. 0 writes in turn with the generation. Defaults to the writers of the profile.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="The run seed for reproducible data. The daily command requires the vectorized engine.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="The number of records sent to the database per statement. Defaults to the batch size of the profile.",
+    )
+    parser.add_argument(
+        "--on-conflict",
+        choices=CONFLICT_MODES,
+        default=None,
+        help="What to do with the records whose keys exist already, so that a rerun after a partial failure does not fail. 'nothing' keeps them and 'update' overwrites them, both merging through a staging table. Defaults to the conflict mode of the profile.",
+    )
+    parser.add_argument(
+        "--concurrent-load",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Load the customer behaviors and the transactions of each chunk at the same time on two connections, committed after both loads. SQLite loads them in turn. Defaults to the concurrent load setting of the profile.",
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=None,
+        help="The number of initial customers in the init command. Defaults to the initial customer count of the profile.",
+    )
+    parser.add_argument(
+        "--start",
+        type=dt.date.fromisoformat,
+        default=None,
+        help="The first day of the backfill command, as YYYY-MM-DD.",
+    )
+    parser.add_argument(
+        "--end",
+        type=dt.date.fromisoformat,
+        default=None,
+        help="The last day of the backfill command, as YYYY-MM-DD.",
+    )
+    parser.add_argument(
+        "--journal",
+        default=DEFAULT_JOURNAL_PATH,
+        help=f"The journal file of the backfill command, which records the finished days and chunks, so that a rerun continues where it stopped. Defaults to '{DEFAULT_JOURNAL_PATH}'.",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=list_profiles(),
+        default="default",
+        help="Choose the scale profile, which sets the number of customers, customer behaviors and products together.",
+    )
     parser.add_argument(
         "-v", "--version", action="version", version=f"%(prog)s {VERSION}"
     )
-    return parser.parse_args()
+    args: argparse.Namespace = parser.parse_args()
+    engine = args.engine or load_profile(args.profile).engine
+    workers = args.workers or 1
+    if (
+        args.command == "daily"
+        and engine != "vectorized"
+        and (workers > 1 or args.seed is not None)
+    ):
+        parser.error("--workers and --seed require --engine vectorized.")
+    if args.command == "backfill":
+        if args.start is None or args.end is None:
+            parser.error("The backfill command requires --start and --end.")
+        if args.end < args.start:
+            parser.error("--end must not be earlier than --start.")
+    return args
 
 
 if __name__ == "__main__":
@@ -0,0 +1,365 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The history data backfill.
+
+Generates the customer behavior data and transaction data of a date range, running
+the days concurrently in a process pool, where each worker keeps its own database
+connections, product catalog, promotion calendar and customers sorted by
+registration time, from which the customers of a day are a prefix. Each day draws
+from a seed derived from the run seed and the date, so a day is reproducible
+whichever worker runs it, and an interrupted backfill continues from the chunks
+recorded in its journal.
+"""
+
+
+import random
+from dataclasses import dataclass
+from functools import partial
+from datetime import date, datetime, timedelta
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+from .database import ds
+from .models import CustomerBehaviorSource, TransactionSource
+from .catalog import (
+    CustomerSnapshots,
+    ProductCatalog,
+    load_product_catalog,
+    load_customer_snapshots,
+)
+from .schemas import CustomerActivityData, PromotionConstants
+from .batch import ActivityBatch
+from .promotion import PromotionCalendar, load_promotion_calendar
+from .transaction import activity_gen
+from .engine import vectorized_activity_gen
+from .generate import insert_activity_chunk
+from .parallel import iter_parallel, iter_pipelined
+from .partition import ensure_partitions, next_month
+from .schema import schema_manager
+from .journal import DAY_SHARD, BackfillJournal
+from .profile import ScaleProfile, get_profile, set_profile
+from .timestamps import day_seed
+from .logging import LOGGER
+
+
+@dataclass
+class BackfillContext:
+    """The settings shared by every day of a backfill."""
+
+    env: str
+    """The database environment, "dev" or "test"."""
+    engine: str
+    """The customer activity generator, "loop" or "vectorized"."""
+    chunk_size: int | None
+    """The maximum number of viewed products generated and committed at a time."""
+    seed: int
+    """The run seed, from which the seed of each day is derived."""
+    profile: ScaleProfile
+    """The scale profile of the run."""
+    journal: str | None = None
+    """The journal file. If None, the progress is not recorded."""
+    writers: int = 0
+    """The number of threads of each worker writing the chunks while the next chunks are generated."""
+
+
+@dataclass
+class BackfillResult:
+    """The records generated for a day."""
+
+    day: date
+    """The day of the customer behaviors."""
+    behavior_count: int
+    """The number of inserted customer behavior records."""
+    transaction_count: int
+    """The number of inserted transaction records."""
+
+
+def date_range(start: date, end: date) -> List[date]:
+    """Returns the days from the start to the end, both included."""
+    if end < start:
+        raise ValueError("The end date must not be earlier than the start date.")
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+ACTIVITY_TABLES: List[str] = [
+    CustomerBehaviorSource.__tablename__,
+    TransactionSource.__tablename__,
+]
+"""The tables inserted by the backfill."""
+
+
+class ActivityBackfill:
+    """The customer behavior data and transaction data backfill."""
+
+    def run(
+        self,
+        start: date,
+        end: date,
+        workers: int = 1,
+        max_in_flight: int = None,
+        seed: int = None,
+        engine: str = None,
+        chunk_size: int = None,
+        env: str = "dev",
+        journal: str = None,
+        writers: int = None,
+    ) -> Tuple[int, int]:
+        """Generates and inserts the customer activity data of every day from the start to the end.
+
+        :param start: The first day of the customer behaviors.
+        :param end: The last day of the customer behaviors.
+        :param workers: The number of processes generating the days concurrently.
+        :param max_in_flight: The maximum number of days generated but not yet reported. If no parameters are provided, twice the number of workers.
+        :param seed: The run seed. If no parameters are provided, a fresh seed will be used and logged.
+        :param engine: "loop" or "vectorized". If no parameters are provided, the engine of the scale profile will be used.
+        :param chunk_size: The maximum number of viewed products generated and committed at a time. If no parameters are provided, the chunk size of the scale profile will be used.
+        :param env: "dev", "test"
+        :param journal: The journal file, which records the committed chunks of every day.
+            A rerun with the same journal skips the finished days, regenerates the unfinished days
+            with the recorded seed, and only inserts the chunks which are not recorded.
+            If no parameters are provided, the progress is not recorded.
+        :param writers: The number of threads of each worker writing the chunks of a day while the next chunks are generated. If no parameters are provided, the writers of the scale profile will be used.
+        :return:
+            - The number of inserted customer behavior records.
+            - The number of inserted transaction records.
+        """
+        days = date_range(start, end)
+        profile = get_profile()
+        if journal is not None:
+            progress = BackfillJournal(journal)
+            recorded_seed = progress.get_seed(ACTIVITY_TABLES, start, end)
+            if seed is None:
+                seed = recorded_seed
+            elif recorded_seed is not None and recorded_seed != seed:
+                raise ValueError(
+                    f"The journal records seed {recorded_seed} for the days, not {seed}."
+                )
+            finished = [
+                day
+                for day in days
+                if all(progress.is_finished(table, day) for table in ACTIVITY_TABLES)
+            ]
+            progress.close()
+            if finished:
+                LOGGER.info(f"Skipping {len(finished)} days finished in {journal}.")
+                days = [day for day in days if day not in finished]
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        LOGGER.info(
+            f"Backfilling {len(days)} days from {start} to {end} with seed {seed} and {workers} workers."
+        )
+
+        with ds.session_scope(env=env) as db:
+            schema_manager.ensure_schema(db)
+            ensure_partitions(db, start, next_month(end))
+
+        context = BackfillContext(
+            env=env,
+            engine=engine or profile.engine,
+            chunk_size=chunk_size or profile.chunk_size,
+            seed=seed,
+            profile=profile,
+            journal=journal,
+            writers=writers if writers is not None else profile.writers,
+        )
+        behavior_count = 0
+        transaction_count = 0
+        results: Iterator[BackfillResult] = iter_parallel(
+            _backfill_day,
+            days,
+            workers=workers,
+            max_in_flight=max_in_flight,
+            initializer=_init_backfill_worker,
+            initargs=(context,),
+        )
+        for result in results:
+            behavior_count += result.behavior_count
+            transaction_count += result.transaction_count
+            LOGGER.info(
+                f"Finished {result.day}: {result.behavior_count} customer behavior records and {result.transaction_count} transaction records."
+            )
+        return behavior_count, transaction_count
+
+    def backfill_day(
+        self,
+        context: BackfillContext,
+        catalog: ProductCatalog,
+        customers: CustomerSnapshots,
+        calendar: PromotionCalendar,
+        day: date,
+        journal: BackfillJournal = None,
+    ) -> BackfillResult:
+        """Generates and inserts the customer activity data of a day.
+
+        :param context: The settings shared by every day of the backfill.
+        :param catalog: The product catalog.
+        :param customers: The customers sorted by registration time.
+        :param calendar: The promotion calendar.
+        :param day: The day of the customer behaviors.
+        :param journal: The journal, in which the committed chunks are recorded and then skipped. If no parameters are provided, every chunk will be inserted.
+        :return: The number of records inserted for the day.
+        """
+        day_start = datetime(day.year, day.month, day.day)
+        day_end = day_start + timedelta(days=1)
+        promotion: PromotionConstants | None = calendar.get_promotion_constants(
+            day.weekday(), effective_at=day_end
+        )
+        if promotion is None:
+            LOGGER.warning(f"No promotion was published by {day}, skipping the day.")
+            return BackfillResult(day=day, behavior_count=0, transaction_count=0)
+        customer_ids = customers.registered_before(day_end)
+        if len(customer_ids) == 0:
+            LOGGER.warning(f"No customer has registered by {day}, skipping the day.")
+            return BackfillResult(day=day, behavior_count=0, transaction_count=0)
+
+        seed = day_seed(context.seed, day)
+        if context.engine == "vectorized":
+            activity = vectorized_activity_gen.iter_generate(
+                promotion,
+                chunk_size=context.chunk_size,
+                catalog=catalog,
+                day=day_start,
+                seed=seed,
+                customer_ids=customer_ids,
+            )
+        else:
+            activity = activity_gen.iter_generate(
+                promotion,
+                chunk_size=context.chunk_size,
+                catalog=catalog,
+                day=day_start,
+                customer_ids=customer_ids,
+                rng=random.Random(seed),
+            )
+
+        recorded = {}
+        if journal is not None:
+            recorded = journal.get_units(CustomerBehaviorSource.__tablename__, day)
+            recorded.pop(DAY_SHARD, None)
+            if any(unit.chunk_size != context.chunk_size for unit in recorded.values()):
+                raise ValueError(
+                    f"The journal records chunks of {day} of another chunk size than {context.chunk_size}."
+                )
+            if recorded:
+                LOGGER.info(f"Skipping {len(recorded)} recorded chunks of {day}.")
+
+        shards = (
+            (shard, chunk)
+            for shard, chunk in enumerate(activity)
+            if shard not in recorded
+        )
+        behavior_count = 0
+        transaction_count = 0
+        for chunk_behavior, chunk_transaction in iter_pipelined(
+            partial(self.__write_shard, context, day, journal),
+            shards,
+            writers=context.writers,
+        ):
+            behavior_count += chunk_behavior
+            transaction_count += chunk_transaction
+
+        if journal is not None:
+            totals = [
+                sum(
+                    unit.row_count
+                    for shard, unit in journal.get_units(table, day).items()
+                    if shard != DAY_SHARD
+                )
+                for table in ACTIVITY_TABLES
+            ]
+            journal.record(
+                day,
+                DAY_SHARD,
+                dict(zip(ACTIVITY_TABLES, totals)),
+                seed=context.seed,
+                chunk_size=context.chunk_size,
+            )
+        return BackfillResult(
+            day=day,
+            behavior_count=behavior_count,
+            transaction_count=transaction_count,
+        )
+
+    def __write_shard(
+        self,
+        context: BackfillContext,
+        day: date,
+        journal: BackfillJournal | None,
+        task: Tuple[int, ActivityBatch | CustomerActivityData],
+    ) -> Tuple[int, int]:
+        """Inserts and commits a chunk of the day on its own session, then records it in the journal.
+        The chunk is merged skipping the existing records, since a chunk committed just before
+        an interruption is not recorded yet, and is regenerated with the same records by the rerun.
+        """
+        shard, chunk = task
+        with ds.session_scope(env=context.env) as db:
+            behavior_count, transaction_count = insert_activity_chunk(
+                db, chunk, on_conflict="nothing"
+            )
+        if journal is not None:
+            journal.record(
+                day,
+                shard,
+                dict(zip(ACTIVITY_TABLES, _count_records(chunk))),
+                seed=context.seed,
+                chunk_size=context.chunk_size,
+            )
+        return behavior_count, transaction_count
+
+
+activity_backfill: ActivityBackfill = ActivityBackfill()
+"""The customer activity data backfill."""
+
+
+__backfill_context: BackfillContext | None = None
+"""The backfill settings of the worker process."""
+
+__backfill_catalog: ProductCatalog | None = None
+"""The product catalog of the worker process."""
+
+__backfill_customers: CustomerSnapshots | None = None
+"""The customers of the worker process, sorted by registration time."""
+
+__backfill_calendar: PromotionCalendar | None = None
+"""The promotion calendar of the worker process."""
+
+__backfill_journal: BackfillJournal | None = None
+"""The journal of the worker process."""
+
+
+def _count_records(chunk: ActivityBatch | CustomerActivityData) -> List[int]:
+    """Returns the number of customer behavior records and transaction records of a chunk, whether inserted now or before."""
+    if isinstance(chunk, ActivityBatch):
+        return [len(chunk.customer_behavior), len(chunk.transaction)]
+    return [len(chunk.customer_behavior.root), len(chunk.transaction.root)]
+
+
+def _init_backfill_worker(context: BackfillContext) -> None:
+    """Prepares the worker process with the scale profile, the product catalog, the customers, the promotion calendar and the journal."""
+    global __backfill_context, __backfill_catalog, __backfill_customers, __backfill_calendar, __backfill_journal
+    set_profile(context.profile)
+    __backfill_context = context
+    with ds.get_db(env=context.env) as db:
+        __backfill_catalog = load_product_catalog(db)
+        __backfill_customers = load_customer_snapshots(db)
+        __backfill_calendar = load_promotion_calendar(db)
+    __backfill_journal = (
+        None if context.journal is None else BackfillJournal(context.journal)
+    )
+
+
+def _backfill_day(day: date) -> BackfillResult:
+    """Backfills a day in the worker process."""
+    return activity_backfill.backfill_day(
+        __backfill_context,
+        __backfill_catalog,
+        __backfill_customers,
+        __backfill_calendar,
+        day,
+        __backfill_journal,
+    )
@@ -0,0 +1,137 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The columnar record batches.
+
+Stores the generated records as one NumPy array per schema field, so that the
+generators and the database writers do not allocate an object per row.
+"""
+
+
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Type
+
+import numpy as np
+from pydantic import BaseModel
+
+
+@dataclass
+class RecordBatch:
+    """The records of one table, stored as columns."""
+
+    schema: Type[BaseModel]
+    """The Pydantic schema of a record, which defines the columns."""
+    columns: Dict[str, np.ndarray]
+    """The column arrays, keyed by the schema field names."""
+
+    def __post_init__(self):
+        fields = list(self.schema.model_fields.keys())
+        if sorted(self.columns.keys()) != sorted(fields):
+            raise ValueError(
+                f"The columns {list(self.columns.keys())} do not match the fields of {self.schema.__name__}."
+            )
+        self.columns = {field: self.columns[field] for field in fields}
+        lengths = {len(column) for column in self.columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("The columns must have the same length.")
+
+    @property
+    def fields(self) -> List[str]:
+        """The column names in schema order."""
+        return list(self.columns.keys())
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), ()))
+
+    def take(self, index: np.ndarray | slice) -> "RecordBatch":
+        """Returns the rows selected by an index, a mask or a slice."""
+        return RecordBatch(
+            schema=self.schema,
+            columns={field: column[index] for field, column in self.columns.items()},
+        )
+
+    def to_records(self) -> Iterator[dict]:
+        """Yields each row as a dictionary of Python values.
+        Only used at the database boundary, where the driver needs the rows.
+        """
+        values = [column.tolist() for column in self.columns.values()]
+        fields = self.fields
+        for row in zip(*values):
+            yield dict(zip(fields, row))
+
+
+@dataclass
+class ActivityBatch:
+    """The customer activity data, stored as columns."""
+
+    customer_behavior: RecordBatch
+    """The customer behavior data."""
+    transaction: RecordBatch
+    """The transaction data."""
+
+
+def concat_batches(batches: List[RecordBatch]) -> RecordBatch:
+    """Concatenates the record batches of the same schema."""
+    if not batches:
+        raise ValueError("No record batch to concatenate.")
+    schema = batches[0].schema
+    return RecordBatch(
+        schema=schema,
+        columns={
+            field: np.concatenate([batch.columns[field] for batch in batches])
+            for field in batches[0].fields
+        },
+    )
+
+
+def split_chunks(total: int, chunk_size: int | None) -> List[int]:
+    """Splits a total count into chunk sizes.
+
+    :param total: The total count.
+    :param chunk_size: The maximum size of a chunk. If no chunk size is provided, the total is one chunk.
+    :return: The size of each chunk. There is always at least one chunk.
+    """
+    if not chunk_size or total <= chunk_size:
+        return [total]
+    return [chunk_size] * (total // chunk_size) + (
+        [total % chunk_size] if total % chunk_size else []
+    )
+
+
+def split_activity(batch: ActivityBatch, chunk_size: int | None) -> List[ActivityBatch]:
+    """Splits the customer activity data sorted by time into chunks of the viewed products,
+    cut at the same times in both tables, so that the chunks stay in time order.
+
+    :param batch: The customer activity data, each table sorted by time.
+    :param chunk_size: The number of viewed products of a chunk. If no chunk size is provided, the data is one chunk.
+    :return: The chunks. There is always at least one chunk.
+    """
+    behavior = batch.customer_behavior
+    views = np.flatnonzero(behavior.columns["action_type"] == "view")
+    if not chunk_size or len(views) <= chunk_size:
+        return [batch]
+    behavior_cuts = views[chunk_size::chunk_size]
+    transaction_cuts = np.searchsorted(
+        batch.transaction.columns["transaction_at"],
+        behavior.columns["action_at"][behavior_cuts],
+        side="left",
+    )
+    behavior_bounds = [0, *behavior_cuts.tolist(), len(behavior)]
+    transaction_bounds = [0, *transaction_cuts.tolist(), len(batch.transaction)]
+    return [
+        ActivityBatch(
+            customer_behavior=behavior.take(slice(behavior_start, behavior_end)),
+            transaction=batch.transaction.take(
+                slice(transaction_start, transaction_end)
+            ),
+        )
+        for behavior_start, behavior_end, transaction_start, transaction_end in zip(
+            behavior_bounds,
+            behavior_bounds[1:],
+            transaction_bounds,
+            transaction_bounds[1:],
+        )
+    ]
@@ -0,0 +1,282 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The in-memory catalogs.
+
+Loads the reference data once per run, so that the generators do not query the
+database for every simulated customer behavior.
+"""
+
+
+import random
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import numpy as np
+import sqlalchemy as sa
+
+from .models import ProductSource, CustomerSource
+from .constants import (
+    PopularityConstants,
+    StreamConstants,
+    PROMO_PRODUCT_PREFERENCES,
+)
+from .sampler import AliasSampler, popularity_sampler
+
+
+@dataclass(frozen=True)
+class CatalogProduct:
+    """The product fields used by the generators."""
+
+    product_id: str
+    """The product ID."""
+    promotion_price: int
+    """The promotion price."""
+
+
+@dataclass
+class CategoryProducts:
+    """The products of one category, stored as columns."""
+
+    product_id: np.ndarray
+    """The product IDs."""
+    promotion_price: np.ndarray
+    """The promotion prices."""
+    sampler: AliasSampler | None = None
+    """The popularity sampler of the products. If None, the products are equally popular."""
+
+    def draw_one(self, rng: random.Random = None) -> int:
+        """Draws the index of one product. If no generator is provided, the 'random' module will be used."""
+        if self.sampler is None:
+            return (rng or random).randrange(len(self.product_id))
+        return self.sampler.draw_one(rng)
+
+    def draw(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """Draws the indexes of a batch of products at once."""
+        if self.sampler is None:
+            return rng.integers(0, len(self.product_id), size=size)
+        return self.sampler.draw(rng, size)
+
+    def __len__(self) -> int:
+        return len(self.product_id)
+
+
+class ProductCatalog:
+    """The product catalog indexed by category."""
+
+    def __init__(self, categories: Dict[str, CategoryProducts]):
+        self.__categories: Dict[str, CategoryProducts] = categories
+        """The products of each category."""
+        self.__category_samplers: Dict[str, Tuple[List[str], AliasSampler]] = {}
+        """The category sampler of each promotion type, built on first use."""
+
+    @property
+    def categories(self) -> List[str]:
+        """The categories which have at least one product."""
+        return list(self.__categories.keys())
+
+    def get_category(self, category: str) -> CategoryProducts:
+        """Returns the products of a category."""
+        return self.__categories[category]
+
+    def available_probabilities(
+        self, product_probabilities: Dict[str, float]
+    ) -> Dict[str, float]:
+        """Returns the category probabilities restricted to the categories in the catalog.
+
+        :param product_probabilities: The probabilities for choosing each category.
+        :return: The probabilities of the categories which have products.
+        """
+        available = {
+            category: probability
+            for category, probability in product_probabilities.items()
+            if category in self.__categories
+        }
+        if not available:
+            raise ValueError("No product is available for the promotion categories.")
+        return available
+
+    def get_category_sampler(
+        self, promotion_type: str
+    ) -> Tuple[List[str], AliasSampler]:
+        """Returns the categories and their sampler weighted by the product preferences of the promotion type.
+        The sampler is built once per promotion type.
+
+        :param promotion_type: The promotion type.
+        :return:
+            - The categories which have products.
+            - The sampler of the index into the categories.
+        """
+        if promotion_type not in self.__category_samplers:
+            probabilities = self.available_probabilities(
+                PROMO_PRODUCT_PREFERENCES[promotion_type]
+            )
+            self.__category_samplers[promotion_type] = (
+                list(probabilities.keys()),
+                AliasSampler(list(probabilities.values())),
+            )
+        return self.__category_samplers[promotion_type]
+
+    def sample(self, category: str, rng: random.Random = None) -> CatalogProduct:
+        """Randomly chooses a product from the category. If no generator is provided, the 'random' module will be used."""
+        products = self.__categories[category]
+        index = products.draw_one(rng)
+        return CatalogProduct(
+            product_id=str(products.product_id[index]),
+            promotion_price=int(products.promotion_price[index]),
+        )
+
+    def sample_many(
+        self,
+        categories: List[str],
+        category_index: np.ndarray,
+        rng: np.random.Generator,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Randomly chooses a product for each drawn category at once.
+
+        :param categories: The categories referred by the category index.
+        :param category_index: The index into the categories of each draw.
+        :param rng: The random number generator.
+        :return:
+            - The product IDs.
+            - The promotion prices.
+        """
+        product_id = np.empty(len(category_index), dtype=object)
+        promotion_price = np.empty(len(category_index), dtype=np.int64)
+        for index, category in enumerate(categories):
+            mask = category_index == index
+            count = int(np.count_nonzero(mask))
+            if count == 0:
+                continue
+            products = self.__categories[category]
+            chosen = products.draw(rng, count)
+            product_id[mask] = products.product_id[chosen]
+            promotion_price[mask] = products.promotion_price[chosen]
+        return product_id, promotion_price
+
+    def __len__(self) -> int:
+        return sum(len(products) for products in self.__categories.values())
+
+
+def load_product_catalog(
+    db: sa.orm.Session,
+    popularity_exponent: float = PopularityConstants.PRODUCT_EXPONENT,
+) -> ProductCatalog:
+    """Loads the product catalog with a single query.
+
+    :param db: The database session.
+    :param popularity_exponent: The Zipf exponent of the product popularity within a category. 0 means equally popular.
+    :return: The product catalog.
+    """
+    with db:
+        rows = db.execute(
+            sa.select(
+                ProductSource.category,
+                ProductSource.product_id,
+                ProductSource.promotion_price,
+            ).order_by(ProductSource.product_id)
+        ).all()
+
+    grouped: Dict[str, List[tuple]] = {}
+    for category, product_id, promotion_price in rows:
+        grouped.setdefault(category, []).append((product_id, promotion_price))
+
+    categories = {
+        category: CategoryProducts(
+            product_id=np.array([product[0] for product in products], dtype=object),
+            promotion_price=np.array(
+                [product[1] for product in products], dtype=np.int64
+            ),
+            sampler=popularity_sampler(len(products), popularity_exponent),
+        )
+        for category, products in grouped.items()
+    }
+    return ProductCatalog(categories)
+
+
+def load_customer_ids(
+    db: sa.orm.Session,
+    yield_per: int = StreamConstants.YIELD_PER,
+) -> np.ndarray:
+    """Loads only the customer IDs, streamed from the server in partitions,
+    instead of hydrating every customer ORM object.
+
+    :param db: The database session.
+    :param yield_per: The number of rows fetched per partition.
+    :return: The customer IDs in key order.
+    """
+    with db:
+        result = db.scalars(
+            sa.select(CustomerSource.customer_id)
+            .order_by(CustomerSource.customer_id)
+            .execution_options(yield_per=yield_per)
+        )
+        partitions = [
+            np.array(partition, dtype=object) for partition in result.partitions()
+        ]
+    if not partitions:
+        return np.empty(0, dtype=object)
+    return np.concatenate(partitions)
+
+
+@dataclass
+class CustomerSnapshots:
+    """The customers sorted by registration time, from which the customers of any
+    point in time are a prefix."""
+
+    customer_id: np.ndarray
+    """The customer IDs, in the order of the registration times."""
+    registered_at: np.ndarray
+    """The sorted registration times."""
+
+    def registered_before(self, time: datetime) -> np.ndarray:
+        """Returns the IDs of the customers registered before the time, found by bisection.
+
+        :param time: The point in time.
+        :return: A view of the customer IDs, without copying.
+        """
+        end = np.searchsorted(
+            self.registered_at, np.datetime64(time, "us"), side="left"
+        )
+        return self.customer_id[:end]
+
+    def __len__(self) -> int:
+        return len(self.customer_id)
+
+
+def load_customer_snapshots(
+    db: sa.orm.Session,
+    yield_per: int = StreamConstants.YIELD_PER,
+) -> CustomerSnapshots:
+    """Loads every customer ID and registration time once, sorted by the registration time.
+
+    :param db: The database session.
+    :param yield_per: The number of rows fetched per partition.
+    :return: The customer snapshots.
+    """
+    customer_ids: List[np.ndarray] = []
+    registered_at: List[np.ndarray] = []
+    with db:
+        result = db.execute(
+            sa.select(CustomerSource.customer_id, CustomerSource.registered_at)
+            .order_by(CustomerSource.registered_at, CustomerSource.customer_id)
+            .execution_options(yield_per=yield_per)
+        )
+        for partition in result.partitions():
+            customer_ids.append(np.array([row[0] for row in partition], dtype=object))
+            registered_at.append(
+                np.array([row[1] for row in partition], dtype="datetime64[us]")
+            )
+    if not customer_ids:
+        return CustomerSnapshots(
+            customer_id=np.empty(0, dtype=object),
+            registered_at=np.empty(0, dtype="datetime64[us]"),
+        )
+    return CustomerSnapshots(
+        customer_id=np.concatenate(customer_ids),
+        registered_at=np.concatenate(registered_at),
+    )
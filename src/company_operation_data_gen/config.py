@@ -15,6 +15,18 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     SQLALCHEMY_SOURCE_DATABASE_URL: str
     SQLALCHEMY_TEST_DATABASE_URL: str
+    SQLALCHEMY_POOL_SIZE: int = 5
+    """The number of connections kept open in the pool of each process. Not used by SQLite."""
+    SQLALCHEMY_MAX_OVERFLOW: int = 10
+    """The number of connections opened beyond the pool size under load. Not used by SQLite."""
+    SQLALCHEMY_POOL_PRE_PING: bool = True
+    """Tests each pooled connection before use, replacing the connections the server has closed."""
+    SQLALCHEMY_STATEMENT_TIMEOUT: int | None = None
+    """The PostgreSQL statement timeout in milliseconds. None keeps the server default."""
+    SQLALCHEMY_EXECUTEMANY_MODE: str = "values_only"
+    """The psycopg2 executemany mode, "values_only" or "values_plus_batch"."""
+    SQLALCHEMY_INSERTMANYVALUES_PAGE_SIZE: int = 1000
+    """The default number of rows per statement of the 'insertmanyvalues' batching."""
     model_config = SettingsConfigDict(env_file=".env")
 
 
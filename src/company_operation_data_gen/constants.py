@@ -8,9 +8,14 @@
 include:
 - The variables for web crawler.
 - The number of customer data to generate.
+- The customer attributes.
 - The number of customer behavior data for different promotion activities.
 - The purchase quantity for different promotion activities.
 - The product preferences for different promotion activities.
+- The customer behavior attributes and the funnel between behaviors.
+- The number of rows fetched per partition when loading large tables.
+- The popularity of the products and the customers.
+- The size of a shard of the daily data.
 """
 
 
@@ -39,12 +44,36 @@ class CrawlerConstants:
     )
 
 
-class CustomerCountConstants:
-    """The number of customer data to generate."""
-
-    CUSTOMER_COUNT_INIT: int = 100
-    CUSTOMER_COUNT_MIN: int = 5
-    CUSTOMER_COUNT_MAX: int = 15
+class CustomerAttributeConstants:
+    """The customer attributes."""
+
+    CITY: List[str] = [
+        "臺北市",
+        "新北市",
+        "桃園市",
+        "臺中市",
+        "臺南市",
+        "高雄市",
+        "新竹縣",
+        "苗栗縣",
+        "彰化縣",
+        "南投縣",
+        "雲林縣",
+        "嘉義縣",
+        "屏東縣",
+        "宜蘭縣",
+        "花蓮縣",
+        "臺東縣",
+        "澎湖縣",
+        "金門縣",
+        "連江縣",
+        "基隆市",
+        "新竹市",
+        "嘉義市",
+    ]
+    GENDER: List[str] = ["M", "F"]
+    AGE_MIN: int = 16
+    AGE_MAX: int = 70
 
 
 class BehaviorCountConstants:
@@ -95,6 +124,51 @@ class QuantityCountConstants:
     MULTI_QUANTITY_SIGMA = 2
 
 
+class BehaviorAttributeConstants:
+    """
+    The customer behavior attributes and the funnel between behaviors.
+    A customer views a product, then adds it to the cart, then purchases it,
+    and each step continues with the same probability.
+    """
+
+    DEVICE_TYPE: List[str] = ["mobile", "tablet", "desktop", "laptop", "unknown"]
+    REFERRER: List[str] = [
+        "direct",
+        "search_engine",
+        "social_media",
+        "email",
+        "paid_ads",
+        "referral",
+        "unknown",
+    ]
+
+    FUNNEL_CONTINUE_PROB = 0.5
+    FUNNEL_GAP_MIN_SECONDS = 300
+    FUNNEL_GAP_MAX_SECONDS = 7200
+
+
+class StreamConstants:
+    """The number of rows fetched per partition when loading large tables."""
+
+    YIELD_PER = 100_000
+
+
+class PopularityConstants:
+    """
+    The Zipf exponent of the popularity, 1 / rank ** exponent.
+    0 means every product of a category, or every customer, is equally likely to be chosen.
+    """
+
+    PRODUCT_EXPONENT = 0.0
+    CUSTOMER_EXPONENT = 0.0
+
+
+class ShardConstants:
+    """The size of a shard when the daily data are generated from a run seed."""
+
+    SHARD_SIZE = 100_000
+
+
 """The product preferences for different promotion activities."""
 PROMO_PRODUCT_PREFERENCES = {
     "免運滿額贈": {
@@ -8,22 +8,23 @@ The customer data generator.
 """
 
 
-import uuid
-import random
 from datetime import datetime, timedelta
+from typing import Iterator, Tuple
 
-from faker import Faker
 import numpy as np
 
+from .batch import RecordBatch, split_chunks
+from .ids import id_allocator
+from .constants import ShardConstants
+from .parallel import iter_parallel
+from .pii import pii_gen
+from .timestamps import day_seed
 from .schemas import (
     CustomerData,
     CustomerRecord,
 )
 
 
-fake = Faker("zh-TW")
-
-
 class CustomerGenerator:
     """The customer data generator."""
 
@@ -35,48 +36,110 @@ class CustomerGenerator:
         """A random count of new customer data."""
         return self.__generate(count=np.random.randint(min, max))
 
+    def gen_day_customer(
+        self, day: datetime, seed: int, min: int, max: int
+    ) -> RecordBatch:
+        """A count of new customer data of a day, drawn from the seed of the day,
+        so that a rerun of the day reproduces the same customers and customer IDs.
+
+        :param day: The midnight of the registration day.
+        :param seed: The run seed, from which the seed of the day is derived.
+        :param min: The minimum number of customers.
+        :param max: The maximum number of customers, excluded.
+        :return: The customer data.
+        """
+        seed = day_seed(seed, day.date())
+        rng = np.random.default_rng(seed)
+        return self.gen_customer_batch(
+            int(rng.integers(min, max)), rng, registered_at=day, seed=seed
+        )
+
+    def iter_generate(
+        self,
+        count: int,
+        chunk_size: int = None,
+        workers: int = 1,
+        seed: int = None,
+        registered_at: datetime = None,
+    ) -> Iterator[RecordBatch]:
+        """Generates the customer data as columns in chunks, across processes,
+        and yields each chunk in order as soon as it is ready.
+
+        :param count: The number of customers.
+        :param chunk_size: The maximum number of customers in a chunk. If no parameters are provided, the shard size will be used.
+        :param workers: The number of processes generating the chunks.
+        :param seed: The run seed. Each chunk draws from its own random stream spawned from the seed,
+            and allocates the customer IDs from the seed and the chunk index, so a rerun reproduces the same keys.
+            If no parameters are provided, a fresh seed and random customer IDs will be used.
+        :param registered_at: The registration time of the customers. If no parameters are provided, the previous day will be used.
+        :return: The customer data of each chunk.
+        """
+        if registered_at is None:
+            registered_at = datetime.now() - timedelta(days=1)
+        chunk_sizes = split_chunks(count, chunk_size or ShardConstants.SHARD_SIZE)
+        seed_sequences = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+        tasks = [
+            (chunk_count, seed_sequence, registered_at, seed, shard)
+            for shard, (chunk_count, seed_sequence) in enumerate(
+                zip(chunk_sizes, seed_sequences)
+            )
+        ]
+        yield from iter_parallel(_gen_customer_chunk, tasks, workers=workers)
+
+    def gen_customer_batch(
+        self,
+        count: int,
+        rng: np.random.Generator,
+        registered_at: datetime,
+        seed: int = None,
+        shard: int = 0,
+    ) -> RecordBatch:
+        """Generates the customer data as columns.
+
+        :param count: The number of customers.
+        :param rng: The random number generator.
+        :param registered_at: The registration time of the customers.
+        :param seed: The run seed of the customer IDs. If no parameters are provided, the customer IDs will be random.
+        :param shard: The shard of the customer IDs, which must be different for each chunk of the same seed.
+        :return: The customer data.
+        """
+        columns = pii_gen.generate(count, rng=rng)
+        # The birth column is a timestamp in the database.
+        columns["birth"] = columns["birth"].astype("datetime64[us]")
+        columns["customer_id"] = id_allocator.allocate(count, seed=seed, shard=shard)
+        columns["registered_at"] = np.full(
+            count, np.datetime64(registered_at, "us"), dtype="datetime64[us]"
+        )
+        return RecordBatch(schema=CustomerRecord, columns=columns)
+
     def __generate(self, count: int) -> CustomerData:
         """Generates and returns customer data."""
 
         yesterday = datetime.now() - timedelta(days=1)
         """Generates customer data of previous day."""
 
-        cities = [
-            "臺北市",
-            "新北市",
-            "桃園市",
-            "臺中市",
-            "臺南市",
-            "高雄市",
-            "新竹縣",
-            "苗栗縣",
-            "彰化縣",
-            "南投縣",
-            "雲林縣",
-            "嘉義縣",
-            "屏東縣",
-            "宜蘭縣",
-            "花蓮縣",
-            "臺東縣",
-            "澎湖縣",
-            "金門縣",
-            "連江縣",
-            "基隆市",
-            "新竹市",
-            "嘉義市",
-        ]
+        columns = pii_gen.generate(count)
+        columns["customer_id"] = id_allocator.allocate(count)
         record = [
             CustomerRecord(
-                customer_id=str(uuid.uuid4()),
-                customer_name=fake.name(),
-                gender=fake.random_element(elements=("M", "F")),
-                birth=fake.date_of_birth(minimum_age=16, maximum_age=70),
-                email=fake.email(),
-                phone_number=fake.phone_number(),
-                city=random.choice(cities),
+                customer_id=customer_id,
+                customer_name=customer_name,
+                gender=gender,
+                birth=birth,
+                email=email,
+                phone_number=phone_number,
+                city=city,
                 registered_at=yesterday,
             )
-            for _ in range(count)
+            for customer_id, customer_name, gender, birth, email, phone_number, city in zip(
+                columns["customer_id"].tolist(),
+                columns["customer_name"].tolist(),
+                columns["gender"].tolist(),
+                columns["birth"].tolist(),
+                columns["email"].tolist(),
+                columns["phone_number"].tolist(),
+                columns["city"].tolist(),
+            )
         ]
 
         return CustomerData(root=record)
@@ -84,3 +147,21 @@ class CustomerGenerator:
 
 customer_gen: CustomerGenerator = CustomerGenerator()
 """The customer data generator."""
+
+
+def _gen_customer_chunk(
+    task: Tuple[int, np.random.SeedSequence, datetime, int | None, int],
+) -> RecordBatch:
+    """Generates a chunk of customers in the worker process.
+
+    :param task: The number of customers, the seed sequence, the registration time, the run seed and the index of the chunk.
+    :return: The customer data of the chunk.
+    """
+    count, seed_sequence, registered_at, seed, shard = task
+    return customer_gen.gen_customer_batch(
+        count,
+        np.random.default_rng(seed_sequence),
+        registered_at,
+        seed=seed,
+        shard=shard,
+    )
@@ -8,13 +8,15 @@ The database connection.
 """
 
 
+import os
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Type
+from typing import Any, Dict, Iterator, Type
 
 import sqlalchemy as sa
 from sqlalchemy.orm import DeclarativeBase, sessionmaker, Session
 
-from .config import get_settings
+from .config import Settings, get_settings
 
 
 class SBase(DeclarativeBase):
@@ -29,6 +31,8 @@ class URLSessionMakerCache:
     """The SQLAlchemy database URL."""
     session_local: sessionmaker
     """The session maker."""
+    pid: int
+    """The process which created the engine."""
 
 
 class DataSource:
@@ -52,28 +56,84 @@ class DataSource:
         session_local = self.__get_db_sessionmaker(url, SBase)
         return session_local()
 
+    @contextmanager
+    def session_scope(self, env: str = "dev") -> Iterator[Session]:
+        """Provides a session from the pool of the process, committed when the block succeeds,
+        rolled back when it raises, and closed in either case.
+
+        :param env: "dev", "test"
+        :return: The database session.
+        """
+        session = self.get_db(env=env)
+        try:
+            yield session
+            session.commit()
+        except BaseException:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
     def __get_db_sessionmaker(
         self, url: str, base: Type[DeclarativeBase]
     ) -> sessionmaker:
         """Connects and returns a database sessionmaker.
+        An engine inherited from the parent process is dropped and created again.
 
         :param url: The SQLAlchemy database URL.
         :param base: The base data model.
         :return: The database sessionmaker.
         """
-        if url not in self.__cache:
-            engine: sa.Engine = sa.create_engine(url)
+        cache = self.__cache.get(url)
+        if cache is not None and cache.pid != os.getpid():
+            cache.session_local.kw["bind"].dispose(close=False)
+            cache = None
+        if cache is None:
+            engine: sa.Engine = sa.create_engine(url, **engine_options(url))
             base.metadata.bind = engine
             session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-            self.__cache[url] = URLSessionMakerCache(
-                url=url, session_local=session_local
+            cache = URLSessionMakerCache(
+                url=url, session_local=session_local, pid=os.getpid()
             )
-        return self.__cache[url].session_local
+            self.__cache[url] = cache
+        return cache.session_local
 
     def clear_cache(self) -> None:
         """Cleans-up the cache sessionmaker."""
         self.__cache.clear()
 
 
+def engine_options(url: str, settings: Settings = None) -> Dict[str, Any]:
+    """Returns the engine options of the database URL from the settings.
+    The pool size and the overflow only apply to the pooled server databases,
+    and the statement timeout and the executemany mode only to PostgreSQL with psycopg2.
+
+    :param url: The SQLAlchemy database URL.
+    :param settings: The configuration settings. If no parameters are provided, the current settings will be used.
+    :return: The keyword arguments of 'sa.create_engine'.
+    """
+    settings = settings or get_settings()
+    database_url = sa.engine.make_url(url)
+    options: Dict[str, Any] = {
+        "pool_pre_ping": settings.SQLALCHEMY_POOL_PRE_PING,
+        "insertmanyvalues_page_size": settings.SQLALCHEMY_INSERTMANYVALUES_PAGE_SIZE,
+    }
+    if database_url.get_backend_name() == "sqlite":
+        return options
+
+    options["pool_size"] = settings.SQLALCHEMY_POOL_SIZE
+    options["max_overflow"] = settings.SQLALCHEMY_MAX_OVERFLOW
+    if (
+        database_url.get_backend_name() == "postgresql"
+        and database_url.get_driver_name() == "psycopg2"
+    ):
+        options["executemany_mode"] = settings.SQLALCHEMY_EXECUTEMANY_MODE
+        if settings.SQLALCHEMY_STATEMENT_TIMEOUT is not None:
+            options["connect_args"] = {
+                "options": f"-c statement_timeout={settings.SQLALCHEMY_STATEMENT_TIMEOUT}"
+            }
+    return options
+
+
 ds: DataSource = DataSource()
 """The data source."""
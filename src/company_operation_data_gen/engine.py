@@ -0,0 +1,349 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The vectorized customer behavior data and transaction data generator.
+
+Draws the whole view → add_to_cart → purchase funnel of a day as NumPy arrays,
+with the same distributions as the customer activity data generator.
+"""
+
+
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator, Tuple
+
+import numpy as np
+import sqlalchemy as sa
+
+from .database import ds
+from .catalog import ProductCatalog, load_product_catalog, load_customer_ids
+from .batch import ActivityBatch, RecordBatch, split_activity, split_chunks
+from .schemas import (
+    CustomerBehaviorRecord,
+    TransactionRecord,
+    PromotionConstants,
+)
+from .constants import (
+    BehaviorAttributeConstants,
+    PopularityConstants,
+    ShardConstants,
+)
+from .parallel import iter_parallel
+from .sampler import AliasSampler, popularity_sampler
+from .profile import get_profile
+from .timestamps import DayWindow, draw_funnel_offsets
+
+
+@dataclass
+class ShardContext:
+    """The data shared by every shard of a day."""
+
+    promotion_constants: PromotionConstants
+    """The constants based on the different promotion type."""
+    catalog: ProductCatalog
+    """The product catalog."""
+    customer_ids: np.ndarray
+    """The IDs of the customers to choose from."""
+    customer_sampler: AliasSampler | None
+    """The popularity sampler of the customers. If None, the customers are equally active."""
+    window: DayWindow
+    """The day of the customer behaviors."""
+
+
+class VectorizedActivityGenerator:
+    """The vectorized customer behavior data and transaction data generator."""
+
+    def generate(
+        self,
+        promotion_constants: PromotionConstants,
+        session: sa.orm.Session = None,
+        catalog: ProductCatalog = None,
+        rng: np.random.Generator = None,
+        day: datetime = None,
+    ) -> ActivityBatch:
+        """Generates and returns the customer behavior data and transaction data as columns.
+
+        :param promotion_constants: The constants based on the different promotion type.
+        :param session: Passes the test database for testing purposes. If no parameters are provided, the source database will be used.
+        :param catalog: The product catalog loaded for this run. If no parameters are provided, it will be loaded from the database.
+        :param rng: The random number generator. If no parameters are provided, a fresh one will be used.
+        :param day: The day of the customer behaviors. If no parameters are provided, the previous day will be used.
+        :return:
+            - The customer behavior data.
+            - The transaction data.
+        """
+        return next(
+            self.iter_generate(
+                promotion_constants,
+                session=session,
+                catalog=catalog,
+                rng=rng,
+                day=day,
+            )
+        )
+
+    def iter_generate(
+        self,
+        promotion_constants: PromotionConstants,
+        chunk_size: int = None,
+        session: sa.orm.Session = None,
+        catalog: ProductCatalog = None,
+        rng: np.random.Generator = None,
+        day: datetime = None,
+        seed: int = None,
+        workers: int = 1,
+        customer_ids: np.ndarray = None,
+    ) -> Iterator[ActivityBatch]:
+        """Generates the customer behavior data and transaction data as columns in chunks,
+        so that only one chunk is kept in memory at a time.
+
+        :param promotion_constants: The constants based on the different promotion type.
+        :param chunk_size: The maximum number of viewed products in a chunk. If no parameters are provided, the whole day is one chunk.
+        :param session: Passes the test database for testing purposes. If no parameters are provided, the source database will be used.
+        :param catalog: The product catalog loaded for this run. If no parameters are provided, it will be loaded from the database.
+        :param rng: The random number generator. If no parameters are provided, a fresh one will be used.
+        :param day: The day of the customer behaviors. If no parameters are provided, the previous day will be used.
+        :param seed: The run seed. When provided, the day is split into shards of a fixed number of viewed products,
+            each shard draws from its own random stream spawned from the seed, and the shards are cut into the chunks,
+            so the records only depend on the seed, not on the chunk size or the number of workers.
+        :param workers: The number of processes generating the shards. More than one worker requires a seed.
+        :param customer_ids: The IDs of the customers to choose from. If no parameters are provided, every customer will be loaded from the database.
+        :return: The customer behavior data and the transaction data of each chunk.
+        """
+        if workers > 1 and seed is None:
+            raise ValueError("Generating with more than one worker requires a seed.")
+
+        unit = get_profile().timestamp_unit
+        window = (
+            DayWindow.previous_day(unit=unit)
+            if day is None
+            else DayWindow.of(day, unit=unit)
+        )
+
+        if catalog is None or customer_ids is None:
+            # A session opened here is closed as soon as the catalog and the customers are loaded.
+            with nullcontext(session) if session else ds.get_db() as db:
+                if catalog is None:
+                    catalog = load_product_catalog(db)
+                if customer_ids is None:
+                    customer_ids = load_customer_ids(db)
+
+        context = ShardContext(
+            promotion_constants=promotion_constants,
+            catalog=catalog,
+            customer_ids=customer_ids,
+            customer_sampler=popularity_sampler(
+                len(customer_ids), PopularityConstants.CUSTOMER_EXPONENT
+            ),
+            window=window,
+        )
+
+        if seed is None:
+            if rng is None:
+                rng = np.random.default_rng()
+            num_behavior = self.__gen_num_behavior(rng, promotion_constants)
+            chunk_sizes = split_chunks(num_behavior, chunk_size)
+            for num_chunk_behavior, span in zip(
+                chunk_sizes, window.split_ticks(chunk_sizes)
+            ):
+                yield self.draw_shard(context, num_chunk_behavior, rng, span=span)
+            return
+
+        seed_sequence = np.random.SeedSequence(seed)
+        num_behavior = self.__gen_num_behavior(
+            np.random.default_rng(seed_sequence.spawn(1)[0]), promotion_constants
+        )
+        # The shards do not follow the chunk size, so that a rerun with another chunk size draws the same records.
+        shard_sizes = split_chunks(num_behavior, ShardConstants.SHARD_SIZE)
+        tasks = list(
+            zip(
+                shard_sizes,
+                seed_sequence.spawn(len(shard_sizes)),
+                window.split_ticks(shard_sizes),
+            )
+        )
+        for shard in iter_parallel(
+            _draw_shard,
+            tasks,
+            workers=workers,
+            initializer=_init_shard_worker,
+            initargs=(context,),
+        ):
+            yield from split_activity(shard, chunk_size)
+
+    def __gen_num_behavior(
+        self, rng: np.random.Generator, promotion_constants: PromotionConstants
+    ) -> int:
+        """Generates the number of viewed products of the day."""
+        return int(
+            self.__gen_random_count(
+                rng,
+                promotion_constants.behavior_avg,
+                promotion_constants.behavior_sigma,
+                promotion_constants.behavior_min,
+                promotion_constants.behavior_max,
+            )
+        )
+
+    def __gen_random_count(
+        self,
+        rng: np.random.Generator,
+        mu: float,
+        sigma: float,
+        minimum: int,
+        maximum: int,
+        size: int = None,
+    ) -> np.ndarray:
+        """Generates random counts within a defined minimum and maximum range.
+        The normal draws are truncated toward zero like 'int()' before clamping.
+        """
+        counts = np.trunc(rng.normal(mu, sigma, size=size)).astype(np.int64)
+        return np.clip(counts, minimum, maximum)
+
+    def draw_shard(
+        self,
+        context: ShardContext,
+        num_behavior: int,
+        rng: np.random.Generator,
+        span: Tuple[int, int] = None,
+    ) -> ActivityBatch:
+        """Draws the funnel of every view of a shard at once and returns the columns of both tables,
+        each sorted by time, so that the rows are written in time order.
+
+        :param context: The data shared by every shard of the day.
+        :param num_behavior: The number of viewed products in the shard.
+        :param rng: The random number generator of the shard.
+        :param span: The ticks of the day the views of the shard are drawn from. If no parameters are provided, the whole day will be used.
+        :return: The customer behavior data and the transaction data of the shard.
+        """
+        promotion_constants = context.promotion_constants
+        catalog = context.catalog
+        customer_ids = context.customer_ids
+        categories, category_sampler = catalog.get_category_sampler(
+            promotion_constants.promotion_type
+        )
+
+        if context.customer_sampler is None:
+            customer_index = rng.integers(0, len(customer_ids), size=num_behavior)
+        else:
+            customer_index = context.customer_sampler.draw(rng, num_behavior)
+        customer = customer_ids[customer_index]
+        category_index = category_sampler.draw(rng, num_behavior)
+        product, promotion_price = catalog.sample_many(categories, category_index, rng)
+
+        device_types = np.array(BehaviorAttributeConstants.DEVICE_TYPE, dtype=object)
+        referrers = np.array(BehaviorAttributeConstants.REFERRER, dtype=object)
+        device_type = device_types[
+            rng.integers(0, len(device_types), size=num_behavior)
+        ]
+        referrer = referrers[rng.integers(0, len(referrers), size=num_behavior)]
+
+        is_cart = (
+            rng.random(num_behavior) < BehaviorAttributeConstants.FUNNEL_CONTINUE_PROB
+        )
+        is_purchase = is_cart & (
+            rng.random(num_behavior) < BehaviorAttributeConstants.FUNNEL_CONTINUE_PROB
+        )
+
+        view_at = context.window.draw_times(rng, num_behavior, span=span)
+        offsets = draw_funnel_offsets(rng, num_behavior, steps=2)
+        cart_at = view_at + offsets[:, 0]
+        purchase_at = view_at + offsets[:, 1]
+
+        behavior = RecordBatch(
+            schema=CustomerBehaviorRecord,
+            columns={
+                "customer_id": np.concatenate(
+                    [customer, customer[is_cart], customer[is_purchase]]
+                ),
+                "product_id": np.concatenate(
+                    [product, product[is_cart], product[is_purchase]]
+                ),
+                "action_type": np.repeat(
+                    np.array(["view", "add_to_cart", "purchase"], dtype=object),
+                    [
+                        num_behavior,
+                        int(np.count_nonzero(is_cart)),
+                        int(np.count_nonzero(is_purchase)),
+                    ],
+                ),
+                "device_type": np.concatenate(
+                    [device_type, device_type[is_cart], device_type[is_purchase]]
+                ),
+                "referrer": np.concatenate(
+                    [referrer, referrer[is_cart], referrer[is_purchase]]
+                ),
+                "action_at": np.concatenate(
+                    [view_at, cart_at[is_cart], purchase_at[is_purchase]]
+                ),
+            },
+        )
+
+        quantity = self.__gen_random_count(
+            rng,
+            promotion_constants.quantity_avg,
+            promotion_constants.quantity_sigma,
+            promotion_constants.quantity_min,
+            promotion_constants.quantity_max,
+            size=int(np.count_nonzero(is_purchase)),
+        )
+        price = promotion_price[is_purchase]
+        amount = quantity * price
+        discount, gift, total = promotion_constants.promotion_index.apply(
+            quantity, amount
+        )
+
+        transaction = RecordBatch(
+            schema=TransactionRecord,
+            columns={
+                "customer_id": customer[is_purchase],
+                "product_id": product[is_purchase],
+                "quantity": quantity,
+                "promotion_price": price,
+                "amount": amount,
+                "discount": discount,
+                "gift": gift,
+                "total": total,
+                "transaction_at": purchase_at[is_purchase],
+            },
+        )
+        return ActivityBatch(
+            customer_behavior=behavior.take(
+                np.argsort(behavior.columns["action_at"], kind="stable")
+            ),
+            transaction=transaction.take(
+                np.argsort(transaction.columns["transaction_at"], kind="stable")
+            ),
+        )
+
+
+vectorized_activity_gen: VectorizedActivityGenerator = VectorizedActivityGenerator()
+"""The vectorized customer activity data generator."""
+
+
+__shard_context: ShardContext | None = None
+"""The shard context of the worker process."""
+
+
+def _init_shard_worker(context: ShardContext) -> None:
+    """Keeps the shard context in the worker process, so it is sent only once."""
+    global __shard_context
+    __shard_context = context
+
+
+def _draw_shard(
+    task: Tuple[int, np.random.SeedSequence, Tuple[int, int]],
+) -> ActivityBatch:
+    """Draws a shard in the worker process.
+
+    :param task: The number of viewed products, the seed sequence and the ticks of the day of the shard.
+    :return: The customer behavior data and the transaction data of the shard.
+    """
+    num_behavior, seed_sequence, span = task
+    return vectorized_activity_gen.draw_shard(
+        __shard_context, num_behavior, np.random.default_rng(seed_sequence), span=span
+    )
@@ -8,14 +8,17 @@ Inserts the customer data, the product data, and the customer activity data into
 """
 
 
-from typing import Type
+from functools import partial
+from typing import Iterable, Iterator, Tuple, Type
 import datetime as dt
+import time
 
+import numpy as np
 import sqlalchemy as sa
-from pydantic import RootModel
+from pydantic import BaseModel, RootModel
 from sqlalchemy.orm import DeclarativeBase, Session
 
-from .database import SBase, ds
+from .database import ds
 from .models import (
     ProductSource,
     CustomerSource,
@@ -27,48 +30,89 @@ from .schemas import (
     ProductData,
     PromotionConstants,
     CustomerActivityData,
-    CustomerBehaviorData,
-    TransactionData,
 )
-from .constants import CustomerCountConstants
+from .batch import ActivityBatch, RecordBatch
+from .loader import iter_batches, load_table, supports_concurrent_load
+from .parallel import iter_pipelined, run_in_transactions
+from .partition import ensure_partitions, next_month
+from .profile import get_profile
+from .schema import schema_manager
+from .staging import load_table_staged
 from .customer import customer_gen
 from .scrape import product_gen
-from .promotion import promotion_choose
+from .promotion import load_promotion_calendar
 from .transaction import activity_gen
+from .engine import vectorized_activity_gen
+from .timestamps import DayWindow, day_seed
 from .logging import LOGGER
 
 
-def init_customer(env: str = "dev") -> None:
-    """Inserts the initial customer data into source database."""
+def init_customer(
+    env: str = "dev",
+    count: int = None,
+    chunk_size: int = None,
+    workers: int = None,
+    seed: int = None,
+    writers: int = None,
+) -> None:
+    """Inserts the initial customer data into source database.
+    The customers are generated in chunks across processes, and each chunk is committed as soon as it is ready.
+
+    :param env: "dev", "test"
+    :param count: The number of customers. If no parameters are provided, the initial customer count of the scale profile will be used.
+    :param chunk_size: The maximum number of customers generated and committed at a time. If no parameters are provided, the chunk size of the scale profile will be used.
+    :param workers: The number of processes generating the chunks. If no parameters are provided, the workers of the scale profile will be used.
+    :param seed: The run seed, which makes the customer data reproducible regardless of the number of workers.
+    :param writers: The number of threads writing the chunks while the next chunks are generated. 0 writes in turn with the generation. If no parameters are provided, the writers of the scale profile will be used.
+    """
     t_start: dt.datetime = dt.datetime.now()
-    init_customer: CustomerData = customer_gen.gen_init_customer(
-        count=CustomerCountConstants.CUSTOMER_COUNT_INIT
+    profile = get_profile()
+    count = count if count is not None else profile.customer_count_init
+    chunk_size = chunk_size or profile.chunk_size
+    workers = workers or profile.workers
+    writers = writers if writers is not None else profile.writers
+
+    chunks: Iterator[RecordBatch] = customer_gen.iter_generate(
+        count, chunk_size=chunk_size, workers=workers, seed=seed
     )
     with ds.get_db(env=env) as db:
-        SBase.metadata.create_all(db.bind)
-        db.commit()
-        insert_table(db, CustomerSource, init_customer)
-        db.commit()
+        schema_manager.ensure_schema(db)
+        customer_count = insert_table_chunks(
+            db, CustomerSource, chunks, total=count, writers=writers
+        )
     LOGGER.info(
-        f"Finished generating {len(init_customer.root)} initial customer records. {dt.datetime.now() - t_start}."
+        f"Finished generating {customer_count} initial customer records. {dt.datetime.now() - t_start}."
     )
 
 
-def daily_register_customer(env: str = "dev") -> None:
-    """Inserts the customer data daily."""
+def daily_register_customer(env: str = "dev", seed: int = None) -> None:
+    """Inserts the customer data daily.
+
+    :param env: "dev", "test"
+    :param seed: The run seed. The customers of the previous day are drawn from the seed of the day,
+        with customer IDs derived from it, so that a rerun of the day inserts the same customers.
+        If no parameters are provided, new random customers will be generated.
+    """
     t_start: dt.datetime = dt.datetime.now()
-    customer: CustomerData = customer_gen.gen_new_customer(
-        min=CustomerCountConstants.CUSTOMER_COUNT_MIN,
-        max=CustomerCountConstants.CUSTOMER_COUNT_MAX,
-    )
+    profile = get_profile()
+    if seed is None:
+        customer: CustomerData = customer_gen.gen_new_customer(
+            min=profile.customer_count_min,
+            max=profile.customer_count_max,
+        )
+    else:
+        customer: RecordBatch = customer_gen.gen_day_customer(
+            DayWindow.previous_day().start,
+            seed,
+            min=profile.customer_count_min,
+            max=profile.customer_count_max,
+        )
 
     with ds.get_db(env=env) as db:
-        SBase.metadata.create_all(db.bind)
-        db.commit()
-        insert_table(db, CustomerSource, customer)
-        db.commit()
+        schema_manager.ensure_schema(db)
+        customer_count = insert_table(db, CustomerSource, customer)
         LOGGER.info(
-            f"Finished generating {len(customer.root)} new customer records. {dt.datetime.now() - t_start}."
+            f"Finished generating {customer_count} new customer records. {dt.datetime.now() - t_start}."
         )
 
 
@@ -76,41 +120,267 @@ def weekly_scrape_product(env: str = "dev") -> None:
     """Inserts the product data weekly."""
     t_start: dt.datetime = dt.datetime.now()
 
+    product_gen.pages = get_profile().crawler_pages
     product_gen.scrape()
     product: ProductData = product_gen.get_data()
 
     with ds.get_db(env=env) as db:
-        SBase.metadata.create_all(db.bind)
-        db.commit()
+        schema_manager.ensure_schema(db)
         insert_table(db, ProductSource, product)
-        db.commit()
         LOGGER.info(
             f"Finished generating {len(product.root)} new product records. {dt.datetime.now() - t_start}."
         )
 
 
-def daily_behavior_transaction(env: str = "dev") -> None:
-    """Inserts the customer behavior data and transaction data daily."""
+def daily_behavior_transaction(
+    env: str = "dev",
+    engine: str = None,
+    chunk_size: int = None,
+    workers: int = None,
+    seed: int = None,
+    writers: int = None,
+) -> None:
+    """Inserts the customer behavior data and transaction data daily.
+
+    :param env: "dev", "test"
+    :param engine: "loop" generates behavior by behavior, "vectorized" draws the whole day at once. If no parameters are provided, the engine of the scale profile will be used.
+    :param chunk_size: The maximum number of viewed products generated and committed at a time. If no parameters are provided, the chunk size of the scale profile will be used.
+    :param workers: The number of processes generating the shards of the day. Only for the vectorized engine. If no parameters are provided, the workers of the scale profile will be used.
+    :param seed: The run seed, from which the seed of the day is derived, so that a rerun of the day reproduces the same records regardless of the number of workers. Only for the vectorized engine.
+    :param writers: The number of threads writing the chunks while the next chunks are generated. 0 writes in turn with the generation. If no parameters are provided, the writers of the scale profile will be used.
+    """
     t_start: dt.datetime = dt.datetime.now()
-    promotion: PromotionConstants = promotion_choose.get_promotion_constants()
-    activity: CustomerActivityData = activity_gen.generate(promotion)
-    behavior: CustomerBehaviorData = activity.customer_behavior
-    transaction: TransactionData = activity.transaction
+    profile = get_profile()
+    engine = engine or profile.engine
+    chunk_size = chunk_size or profile.chunk_size
+    writers = writers if writers is not None else profile.writers
+    if workers is None:
+        workers = profile.workers if engine == "vectorized" else 1
 
+    if engine != "vectorized" and (workers > 1 or seed is not None):
+        raise ValueError(
+            "Workers and seed are only supported by the vectorized engine."
+        )
+
+    window = DayWindow.previous_day()
     with ds.get_db(env=env) as db:
-        SBase.metadata.create_all(db.bind)
-        db.commit()
-        insert_table(db, CustomerBehaviorSource, behavior)
-        insert_table(db, TransactionSource, transaction)
+        schema_manager.ensure_schema(db)
+        day = window.start.date()
+        ensure_partitions(db, day, next_month(day))
         db.commit()
+
+        # The promotions, the catalog and the customers are read from the database the records are written to.
+        promotion: PromotionConstants = load_promotion_calendar(
+            db
+        ).get_promotion_constants(window.weekday)
+        if engine == "vectorized":
+            if seed is not None:
+                seed = day_seed(seed, window.start.date())
+            elif workers > 1:
+                seed = np.random.SeedSequence().entropy
+            if seed is not None:
+                LOGGER.info(f"Generating with seed {seed} and {workers} workers.")
+            activity: Iterator[ActivityBatch] = vectorized_activity_gen.iter_generate(
+                promotion,
+                chunk_size=chunk_size,
+                session=db,
+                day=window.start,
+                seed=seed,
+                workers=workers,
+            )
+        else:
+            activity: Iterator[CustomerActivityData] = activity_gen.iter_generate(
+                promotion, chunk_size=chunk_size, session=db, day=window.start
+            )
+        behavior_count, transaction_count = insert_activity_chunks(
+            db, activity, writers=writers
+        )
     LOGGER.info(
-        f"Finished generating {len(behavior.root)} customer behavior records and {len(transaction.root)} transaction records. {dt.datetime.now() - t_start}."
+        f"Finished generating {behavior_count} customer behavior records and {transaction_count} transaction records. {dt.datetime.now() - t_start}."
     )
 
 
-def insert_table(db: Session, model: Type[DeclarativeBase], data: RootModel) -> None:
-    """Populates the database table with data."""
+def insert_table(
+    db: Session,
+    model: Type[DeclarativeBase],
+    data: RootModel | RecordBatch | Iterable[BaseModel],
+    commit: bool = True,
+    batch_size: int = None,
+    on_conflict: str = None,
+) -> int:
+    """Populates the database table with data in batches,
+    streamed with COPY on PostgreSQL and inserted with executemany otherwise.
+    The data is consumed lazily, so only one batch of driver parameters is built at a time.
+
+    :param db: The database session.
+    :param model: The data model of the table.
+    :param data: The Pydantic data, the record batch whose columns are passed to the driver directly, or Pydantic records generated lazily.
+    :param commit: Commits after inserting. Passes False to commit together with other tables.
+    :param batch_size: The maximum number of records sent at a time. If no parameters are provided, the batch size of the scale profile will be used.
+    :param on_conflict: "error" inserts into the table directly and fails on an existing key. "nothing" or "update" loads a staging table
+        and merges it with 'INSERT ... ON CONFLICT', which skips or overwrites the existing records. If no parameters are provided, the conflict mode of the scale profile will be used.
+    :return: The number of inserted records, including the updated records with "update".
+    """
     table: sa.Table = model.__table__
-    records = [record.model_dump() for record in data.root]
-    db.execute(sa.insert(table), records)
+    batch_size = batch_size or get_profile().batch_size
+    on_conflict = on_conflict or get_profile().on_conflict
+    if on_conflict != "error":
+        t_start = time.perf_counter()
+        count = load_table_staged(db, table, data, batch_size, on_conflict)
+        LOGGER.debug(
+            f"Merged {count} {table.name} records on conflict do {on_conflict} in {time.perf_counter() - t_start:.2f}s."
+        )
+        if commit:
+            db.commit()
+        return count
+
+    count = 0
+    for index, batch in enumerate(iter_batches(data, batch_size)):
+        t_start = time.perf_counter()
+        batch_count = load_table(db, table, batch, page_size=batch_size)
+        elapsed = time.perf_counter() - t_start
+        count += batch_count
+        LOGGER.debug(
+            f"Inserted batch {index}: {batch_count} {table.name} records, {batch_count / max(elapsed, 1e-9):,.0f} rows/s."
+        )
+    if commit:
+        db.commit()
+    return count
+
+
+def insert_table_chunks(
+    db: Session,
+    model: Type[DeclarativeBase],
+    chunks: Iterable[RootModel | RecordBatch],
+    total: int = None,
+    writers: int = 0,
+) -> int:
+    """Populates the database table with the chunks of data, and commits each chunk.
+
+    :param db: The database session.
+    :param model: The data model of the table.
+    :param chunks: The chunks of data, generated lazily.
+    :param total: The expected number of records, for the progress log.
+    :param writers: The number of threads writing the chunks, each on its own session from the pool of the session, while the next chunks are generated. 0 writes with the session in turn with the generation.
+    :return: The number of inserted records.
+    """
+    table_name: str = model.__tablename__
+    if writers:
+        write = partial(_write_table_chunk, db.get_bind(), model)
+    else:
+        write = partial(insert_table, db, model)
+    count = 0
+    for index, chunk_count in enumerate(iter_pipelined(write, chunks, writers=writers)):
+        count += chunk_count
+        progress = f"{count}/{total}" if total else f"{count}"
+        LOGGER.info(f"Committed chunk {index}: {progress} {table_name} records.")
+    return count
+
+
+def insert_activity_chunk(
+    db: Session,
+    chunk: CustomerActivityData | ActivityBatch,
+    concurrent: bool = None,
+    on_conflict: str = None,
+) -> Tuple[int, int]:
+    """Populates the customer behavior table and the transaction table with a chunk of data,
+    and commits after both tables are inserted.
+
+    :param db: The database session.
+    :param chunk: The customer activity data.
+    :param concurrent: Loads the two tables at the same time into the tables directly, each on its own session from the pool of the session,
+        and commits both sessions after both loads succeeded. SQLite locks the whole database for a writer, so its tables are loaded in turn.
+        If no parameters are provided, the concurrent load setting of the scale profile will be used.
+    :param on_conflict: "error", "nothing" or "update", for the records whose keys exist already. If no parameters are provided, the conflict mode of the scale profile will be used.
+    :return:
+        - The number of inserted customer behavior records.
+        - The number of inserted transaction records.
+    """
+    on_conflict = on_conflict or get_profile().on_conflict
+    if concurrent is None:
+        concurrent = get_profile().concurrent_load
+    if concurrent and supports_concurrent_load(db):
+        counts = run_in_transactions(
+            db.get_bind(),
+            {
+                CustomerBehaviorSource.__tablename__: partial(
+                    insert_table,
+                    model=CustomerBehaviorSource,
+                    data=chunk.customer_behavior,
+                    commit=False,
+                    on_conflict=on_conflict,
+                ),
+                TransactionSource.__tablename__: partial(
+                    insert_table,
+                    model=TransactionSource,
+                    data=chunk.transaction,
+                    commit=False,
+                    on_conflict=on_conflict,
+                ),
+            },
+        )
+        return (
+            counts[CustomerBehaviorSource.__tablename__],
+            counts[TransactionSource.__tablename__],
+        )
+
+    behavior_count = insert_table(
+        db,
+        CustomerBehaviorSource,
+        chunk.customer_behavior,
+        commit=False,
+        on_conflict=on_conflict,
+    )
+    transaction_count = insert_table(
+        db, TransactionSource, chunk.transaction, commit=False, on_conflict=on_conflict
+    )
     db.commit()
+    return behavior_count, transaction_count
+
+
+def insert_activity_chunks(
+    db: Session,
+    chunks: Iterable[CustomerActivityData | ActivityBatch],
+    writers: int = 0,
+) -> Tuple[int, int]:
+    """Populates the customer behavior table and the transaction table with the chunks of data,
+    and commits each chunk after both tables are inserted.
+
+    :param db: The database session.
+    :param chunks: The chunks of customer activity data, generated lazily.
+    :param writers: The number of threads writing the chunks, each on its own session from the pool of the session, while the next chunks are generated. 0 writes with the session in turn with the generation.
+    :return:
+        - The number of inserted customer behavior records.
+        - The number of inserted transaction records.
+    """
+    if writers:
+        write = partial(_write_activity_chunk, db.get_bind())
+    else:
+        write = partial(insert_activity_chunk, db)
+    behavior_count = 0
+    transaction_count = 0
+    for index, (chunk_behavior, chunk_transaction) in enumerate(
+        iter_pipelined(write, chunks, writers=writers)
+    ):
+        behavior_count += chunk_behavior
+        transaction_count += chunk_transaction
+        LOGGER.debug(
+            f"Committed chunk {index}: {behavior_count} customer behavior records and {transaction_count} transaction records so far."
+        )
+    return behavior_count, transaction_count
+
+
+def _write_table_chunk(
+    bind: sa.Engine, model: Type[DeclarativeBase], chunk: RootModel | RecordBatch
+) -> int:
+    """Writes a chunk of a table on a session of the writer thread."""
+    with Session(bind=bind) as db:
+        return insert_table(db, model, chunk)
+
+
+def _write_activity_chunk(
+    bind: sa.Engine, chunk: CustomerActivityData | ActivityBatch
+) -> Tuple[int, int]:
+    """Writes a chunk of customer activity data on a session of the writer thread."""
+    with Session(bind=bind) as db:
+        return insert_activity_chunk(db, chunk)
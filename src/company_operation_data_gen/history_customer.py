@@ -1,21 +1,15 @@
-import uuid
 from datetime import datetime, timedelta
-from typing import Type
-from faker import Faker
 import numpy as np
 
-import sqlalchemy as sa
-from pydantic import RootModel
-from sqlalchemy.orm import DeclarativeBase, Session
-
-from .database import SBase, ds
+from .database import ds
 from .scrape import product_gen
+from .customer import customer_gen
+from .generate import insert_table
+from .journal import DAY_SHARD, DEFAULT_JOURNAL_PATH, BackfillJournal
+from .schema import schema_manager
+from .logging import LOGGER
 
-from .schemas import (
-    CustomerData,
-    CustomerRecord,
-    ProductData,
-)
+from .schemas import ProductData
 
 from .models import (
     ProductSource,
@@ -23,51 +17,70 @@ from .models import (
 )
 
 
-fake = Faker("zh-TW")
-
-
-def insert_table(db: Session, model: Type[DeclarativeBase], data: RootModel) -> None:
-    """Populates the database table with data."""
-    table: sa.Table = model.__table__
-    records = [record.model_dump() for record in data.root]
-    db.execute(sa.insert(table), records)
-    db.commit()
-
-
 def history_customer(
-    min_records: int, max_records: int, start_date: str, end_date: str
+    min_records: int,
+    max_records: int,
+    start_date: str,
+    end_date: str,
+    journal: BackfillJournal = None,
+    seed: int = None,
+    env: str = "dev",
 ) -> None:
+    """Inserts the customers registered on every day from the start to the end,
+    committing and recording each day in the journal, so that a rerun skips the recorded days.
+    Each day is drawn from the seed of the day, with customer IDs derived from it, and merged
+    with 'ON CONFLICT DO NOTHING', so that a day committed but not recorded before a crash
+    is reproduced and skipped by the rerun.
+
+    :param min_records: The minimum number of customers of a day.
+    :param max_records: The maximum number of customers of a day, excluded.
+    :param start_date: The first day, as YYYY-MM-DD.
+    :param end_date: The last day, as YYYY-MM-DD.
+    :param journal: The journal, which records the committed days with the run seed. If no parameters are provided, the progress is not recorded.
+    :param seed: The run seed. If no parameters are provided, the seed recorded in the journal, or a fresh seed, will be used.
+    :param env: "dev", "test"
+    """
 
     start = datetime.strptime(start_date, "%Y-%m-%d")
     end = datetime.strptime(end_date, "%Y-%m-%d")
 
     date_range = [start + timedelta(days=i) for i in range((end - start).days + 1)]
 
-    record = []
-
-    for date in date_range:
-        count = np.random.randint(min_records, max_records)
-        for _ in range(count):
-            record.append(
-                CustomerRecord(
-                    customer_id=str(uuid.uuid4()),
-                    customer_name=fake.name(),
-                    gender=fake.random_element(elements=("M", "F")),
-                    birth=fake.date_of_birth(minimum_age=16, maximum_age=70),
-                    email=fake.email(),
-                    phone_number=fake.phone_number(),
-                    city=fake.city_name(),
-                    registered_at=date,
-                )
+    if journal is not None:
+        recorded_seed = journal.get_seed(
+            [CustomerSource.__tablename__], start.date(), end.date()
+        )
+        if seed is None:
+            seed = recorded_seed
+        elif recorded_seed is not None and recorded_seed != seed:
+            raise ValueError(
+                f"The journal records seed {recorded_seed} for the days, not {seed}."
             )
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    LOGGER.info(f"Backfilling the customers with seed {seed}.")
 
-    customer = CustomerData(root=record)
+    with ds.get_db(env=env) as db:
+        schema_manager.ensure_schema(db)
 
-    with ds.get_db() as db:
-        SBase.metadata.create_all(db.bind)
-        db.commit()
-        insert_table(db, CustomerSource, customer)
-        db.commit()
+    for date in date_range:
+        if journal is not None and journal.is_finished(
+            CustomerSource.__tablename__, date.date()
+        ):
+            continue
+        customer = customer_gen.gen_day_customer(
+            date, seed, min=min_records, max=max_records
+        )
+
+        with ds.get_db(env=env) as db:
+            insert_table(db, CustomerSource, customer, on_conflict="nothing")
+        if journal is not None:
+            journal.record(
+                date.date(),
+                DAY_SHARD,
+                {CustomerSource.__tablename__: len(customer)},
+                seed=seed,
+            )
 
 
 def history_product(scrape_date: str) -> None:
@@ -78,11 +91,12 @@ def history_product(scrape_date: str) -> None:
         root=[p.model_copy(update={"fetched_at": init_date}) for p in product.root]
     )
     with ds.get_db() as db:
-        SBase.metadata.create_all(db.bind)
-        db.commit()
+        schema_manager.ensure_schema(db)
         insert_table(db, ProductSource, init_product)
-        db.commit()
 
 
-history_customer(5, 15, "2025-03-15", "2025-03-18")
-history_product("2025-01-01")
+if __name__ == "__main__":
+    history_customer(
+        5, 15, "2025-03-15", "2025-03-18", journal=BackfillJournal(DEFAULT_JOURNAL_PATH)
+    )
+    history_product("2025-01-01")
@@ -0,0 +1,104 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The ID allocator.
+
+Allocates the UUID strings of many records at once, either from one large random
+read, or deterministically from the run seed, the shard and a counter, so that
+parallel workers never collide and a rerun with the same seed reproduces the keys.
+"""
+
+
+import hashlib
+import os
+
+import numpy as np
+
+
+HEX_DIGITS: np.ndarray = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+"""The ASCII codes of the hexadecimal digits."""
+
+UUID_DASHES: np.ndarray = np.array([8, 13, 18, 23])
+"""The positions of the dashes in a UUID string."""
+
+UUID_DIGITS: np.ndarray = np.setdiff1d(np.arange(36), UUID_DASHES)
+"""The positions of the hexadecimal digits in a UUID string."""
+
+MAX_SHARD: int = 2**14
+"""The number of shards a seeded UUID can distinguish."""
+
+MAX_COUNTER: int = 2**48
+"""The number of records per shard a seeded UUID can distinguish."""
+
+
+class IdAllocator:
+    """The bulk UUID allocator."""
+
+    def allocate(
+        self, count: int, seed: int = None, shard: int = 0, start: int = 0
+    ) -> np.ndarray:
+        """Allocates the UUID strings of a batch of records.
+
+        Without a seed, the UUIDs are version 4 UUIDs from a single random read.
+        With a seed, the UUIDs are version 8 UUIDs made of a hash of the seed,
+        the shard and the counter of the record in the shard, which are unique
+        for every shard and counter of the same seed.
+
+        :param count: The number of UUIDs.
+        :param seed: The run seed. If no parameters are provided, the UUIDs will be random.
+        :param shard: The shard of the records, for example the chunk index of a worker. Only with a seed.
+        :param start: The counter of the first record in the shard. Only with a seed.
+        :return: The UUID strings.
+        """
+        if seed is None:
+            return _format_uuids(self.__random_bytes(count))
+        return _format_uuids(self.__seeded_bytes(count, seed, shard, start))
+
+    def __random_bytes(self, count: int) -> np.ndarray:
+        """Returns the bytes of version 4 UUIDs from a single random read."""
+        data = np.frombuffer(os.urandom(16 * count), dtype=np.uint8).reshape(count, 16)
+        data = data.copy()
+        data[:, 6] = (data[:, 6] & 0x0F) | 0x40
+        data[:, 8] = (data[:, 8] & 0x3F) | 0x80
+        return data
+
+    def __seeded_bytes(
+        self, count: int, seed: int, shard: int, start: int
+    ) -> np.ndarray:
+        """Returns the bytes of version 8 UUIDs.
+        The first 60 bits hash the seed, then 14 bits hold the shard and 48 bits the counter.
+        """
+        if not 0 <= shard < MAX_SHARD:
+            raise ValueError(f"The shard must be between 0 and {MAX_SHARD - 1}.")
+        if not 0 <= start or start + count > MAX_COUNTER:
+            raise ValueError(f"The counter must be between 0 and {MAX_COUNTER - 1}.")
+
+        digest = hashlib.blake2b(str(seed).encode("ascii"), digest_size=8).digest()
+        data = np.zeros((count, 16), dtype=np.uint8)
+        data[:, :8] = np.frombuffer(digest, dtype=np.uint8)
+        data[:, 6] = (data[:, 6] & 0x0F) | 0x80
+        data[:, 8] = 0x80 | (shard >> 8)
+        data[:, 9] = shard & 0xFF
+
+        counter = np.arange(start, start + count, dtype=">u8").view(np.uint8)
+        data[:, 10:] = counter.reshape(count, 8)[:, 2:]
+        return data
+
+
+def _format_uuids(data: np.ndarray) -> np.ndarray:
+    """Formats the bytes of the UUIDs as the 36-character strings, for a batch at once."""
+    count = len(data)
+    digits = np.empty((count, 32), dtype=np.uint8)
+    digits[:, 0::2] = HEX_DIGITS[data >> 4]
+    digits[:, 1::2] = HEX_DIGITS[data & 0x0F]
+
+    codes = np.full((count, 36), ord("-"), dtype=np.uint8)
+    codes[:, UUID_DIGITS] = digits
+    return codes.view("S36").ravel().astype(str)
+
+
+id_allocator: IdAllocator = IdAllocator()
+"""The ID allocator."""
@@ -0,0 +1,166 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The backfill progress journal.
+
+Records every committed unit of a backfill, a (table, day, shard) triple with its
+row count and run seed, in a local SQLite file, so that an interrupted backfill is
+continued by regenerating only the units which are not recorded yet.
+"""
+
+
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, List
+
+
+DEFAULT_JOURNAL_PATH: str = "backfill-journal.sqlite3"
+"""The journal file of the backfill command."""
+
+DAY_SHARD: int = -1
+"""The shard of the unit which records that every shard of the day is committed."""
+
+BUSY_TIMEOUT: float = 30.0
+"""The seconds to wait for another process writing the journal."""
+
+
+@dataclass(frozen=True)
+class JournalUnit:
+    """A committed unit of a backfill."""
+
+    table_name: str
+    """The table of the records."""
+    day: date
+    """The day of the records."""
+    shard: int
+    """The index of the committed chunk in the day, or DAY_SHARD for the whole day."""
+    seed: int | None
+    """The run seed of the records."""
+    chunk_size: int | None
+    """The chunk size the shards were generated with."""
+    row_count: int
+    """The number of inserted records."""
+
+
+class BackfillJournal:
+    """The backfill progress journal, kept in a local SQLite file."""
+
+    def __init__(self, path: str = DEFAULT_JOURNAL_PATH):
+        """
+        :param path: The journal file, created if it does not exist.
+        """
+        self.__connection: sqlite3.Connection = sqlite3.connect(
+            path, timeout=BUSY_TIMEOUT, check_same_thread=False
+        )
+        """The connection to the journal file, shared by the writer threads."""
+        self.__lock: threading.Lock = threading.Lock()
+        """Serializes the use of the connection across the writer threads."""
+        with self.__connection:
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS backfill_unit (
+                    table_name TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    shard INTEGER NOT NULL,
+                    seed TEXT,
+                    chunk_size INTEGER,
+                    row_count INTEGER NOT NULL,
+                    finished_at TEXT NOT NULL,
+                    PRIMARY KEY (table_name, day, shard)
+                )
+                """
+            )
+
+    def record(
+        self,
+        day: date,
+        shard: int,
+        row_counts: Dict[str, int],
+        seed: int = None,
+        chunk_size: int = None,
+    ) -> None:
+        """Records a committed unit of every table at once. Call it after the records are committed to the database.
+
+        :param day: The day of the records.
+        :param shard: The index of the committed chunk in the day, or DAY_SHARD for the whole day.
+        :param row_counts: The number of inserted records of each table.
+        :param seed: The run seed of the records.
+        :param chunk_size: The chunk size the shards were generated with.
+        """
+        finished_at = datetime.now().isoformat()
+        with self.__lock, self.__connection:
+            self.__connection.executemany(
+                "INSERT OR REPLACE INTO backfill_unit VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        table_name,
+                        day.isoformat(),
+                        shard,
+                        None if seed is None else str(seed),
+                        chunk_size,
+                        row_count,
+                        finished_at,
+                    )
+                    for table_name, row_count in row_counts.items()
+                ],
+            )
+
+    def get_units(self, table_name: str, day: date) -> Dict[int, JournalUnit]:
+        """Returns the committed units of a table on a day.
+
+        :param table_name: The table of the records.
+        :param day: The day of the records.
+        :return: The units by shard.
+        """
+        with self.__lock:
+            rows = self.__connection.execute(
+                "SELECT shard, seed, chunk_size, row_count FROM backfill_unit"
+                " WHERE table_name = ? AND day = ?",
+                (table_name, day.isoformat()),
+            ).fetchall()
+        return {
+            shard: JournalUnit(
+                table_name=table_name,
+                day=day,
+                shard=shard,
+                seed=None if seed is None else int(seed),
+                chunk_size=chunk_size,
+                row_count=row_count,
+            )
+            for shard, seed, chunk_size, row_count in rows
+        }
+
+    def is_finished(self, table_name: str, day: date) -> bool:
+        """Returns whether every shard of a table on a day is committed."""
+        return DAY_SHARD in self.get_units(table_name, day)
+
+    def get_seed(self, table_names: List[str], start: date, end: date) -> int | None:
+        """Returns the run seed recorded for the tables between the days, to continue with the same data.
+
+        :param table_names: The tables of the records.
+        :param start: The first day of the records.
+        :param end: The last day of the records.
+        :return: The run seed, or None if nothing is recorded.
+        """
+        with self.__lock:
+            rows = self.__connection.execute(
+                "SELECT DISTINCT seed FROM backfill_unit WHERE table_name IN"
+                f" ({', '.join('?' * len(table_names))}) AND day BETWEEN ? AND ?",
+                (*table_names, start.isoformat(), end.isoformat()),
+            ).fetchall()
+        seeds = {None if row[0] is None else int(row[0]) for row in rows}
+        if len(seeds) > 1:
+            raise ValueError(
+                f"The journal records different seeds {sorted(seeds, key=str)} between {start} and {end}."
+            )
+        return seeds.pop() if seeds else None
+
+    def close(self) -> None:
+        """Closes the journal file."""
+        self.__connection.close()
@@ -0,0 +1,179 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The bulk table loader.
+
+Streams the records into PostgreSQL with 'COPY ... FROM STDIN' from an in-memory
+CSV buffer, which skips the per-row statement overhead of executemany, and falls
+back to executemany for the other databases such as the SQLite test database.
+"""
+
+
+import io
+from datetime import date, datetime
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Sequence
+
+import numpy as np
+import sqlalchemy as sa
+from pydantic import BaseModel, RootModel
+from sqlalchemy.orm import Session
+
+from .batch import RecordBatch
+
+
+LOADER_METHODS: List[str] = ["auto", "copy", "executemany"]
+"""The loader methods. "auto" uses COPY when the database supports it."""
+
+
+def supports_copy(db: Session) -> bool:
+    """Returns whether the database of the session supports COPY through psycopg2."""
+    dialect = db.get_bind().dialect
+    return dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+
+def supports_concurrent_load(db: Session) -> bool:
+    """Returns whether the database of the session takes writes from several connections at once.
+    SQLite locks the whole database for a writer, so its tables are loaded in turn.
+    """
+    return db.get_bind().dialect.name != "sqlite"
+
+
+def load_table(
+    db: Session,
+    table: sa.Table,
+    data: RootModel | RecordBatch | Sequence[BaseModel],
+    method: str = "auto",
+    page_size: int = None,
+) -> int:
+    """Inserts the records into the table in the transaction of the session, without committing.
+
+    :param db: The database session.
+    :param table: The table.
+    :param data: The Pydantic data, the record batch, or a list of Pydantic records.
+    :param method: "auto" uses COPY on PostgreSQL and executemany otherwise, "copy" or "executemany" forces one.
+    :param page_size: The number of rows per statement which executemany sends with the 'insertmanyvalues' batching. If no parameters are provided, the default of SQLAlchemy will be used.
+    :return: The number of inserted records.
+    """
+    if method not in LOADER_METHODS:
+        raise ValueError(f"The loader method must be one of {LOADER_METHODS}.")
+    if method == "auto":
+        method = "copy" if supports_copy(db) else "executemany"
+
+    if method == "executemany":
+        if isinstance(data, RecordBatch):
+            records = list(data.to_records())
+        else:
+            records = [record.model_dump() for record in _to_rows(data)]
+        if records:
+            options = (
+                {} if page_size is None else {"insertmanyvalues_page_size": page_size}
+            )
+            db.execute(sa.insert(table), records, execution_options=options)
+        return len(records)
+
+    fields, columns = _to_columns(data)
+    count = len(columns[0]) if columns else 0
+    if count:
+        copy_csv(db, table, fields, format_csv(columns))
+    return count
+
+
+def copy_csv(
+    db: Session, table: sa.Table, fields: List[str], buffer: io.StringIO
+) -> None:
+    """Streams a CSV buffer into the table with 'COPY ... FROM STDIN'.
+
+    :param db: The database session, whose transaction the COPY joins.
+    :param table: The table.
+    :param fields: The columns in the order of the CSV fields.
+    :param buffer: The CSV rows without a header.
+    """
+    preparer = db.get_bind().dialect.identifier_preparer
+    statement = (
+        f"COPY {preparer.format_table(table)}"
+        f" ({', '.join(preparer.quote(field) for field in fields)})"
+        " FROM STDIN WITH (FORMAT csv)"
+    )
+    connection = db.connection().connection
+    with connection.cursor() as cursor:
+        cursor.copy_expert(statement, buffer)
+
+
+def format_csv(columns: Sequence[Sequence[Any] | np.ndarray]) -> io.StringIO:
+    """Formats the columns as CSV rows for COPY.
+    A NULL is an unquoted empty field, and every string is quoted,
+    so an empty string stays distinct from a NULL.
+
+    :param columns: The values of each column.
+    :return: The CSV buffer, positioned at the start.
+    """
+    texts = [_format_column(column) for column in columns]
+    buffer = io.StringIO()
+    buffer.writelines(",".join(row) + "\n" for row in zip(*texts))
+    buffer.seek(0)
+    return buffer
+
+
+def iter_batches(
+    data: RootModel | RecordBatch | Iterable[BaseModel], batch_size: int
+) -> Iterator[RecordBatch | List[BaseModel]]:
+    """Splits the data into batches lazily, so that only one batch of driver parameters is built at a time.
+
+    :param data: The Pydantic data, the record batch, or Pydantic records generated lazily.
+    :param batch_size: The maximum number of records of a batch.
+    :return: The record batch slices, or the lists of Pydantic records.
+    """
+    if isinstance(data, RecordBatch):
+        for start in range(0, len(data), batch_size):
+            yield data.take(slice(start, start + batch_size))
+        return
+    records = iter(_to_rows(data))
+    while batch := list(islice(records, batch_size)):
+        yield batch
+
+
+def _to_rows(data: RootModel | Iterable[BaseModel]) -> Iterable[BaseModel]:
+    """Returns the Pydantic records of the data."""
+    return data.root if hasattr(data, "root") else data
+
+
+def _to_columns(data: RootModel | RecordBatch | Sequence[BaseModel]) -> tuple:
+    """Returns the field names and the values of each field."""
+    if isinstance(data, RecordBatch):
+        return data.fields, list(data.columns.values())
+    rows = _to_rows(data)
+    if not rows:
+        return [], []
+    fields = list(type(rows[0]).model_fields.keys())
+    return fields, [[getattr(record, field) for record in rows] for field in fields]
+
+
+def _format_column(column: Sequence[Any] | np.ndarray) -> List[str]:
+    """Formats the values of a column as CSV fields, with whole-array conversions for the NumPy columns."""
+    if isinstance(column, np.ndarray):
+        if column.dtype.kind in "iu":
+            return column.astype(str).tolist()
+        if column.dtype.kind == "b":
+            return np.where(column, "t", "f").tolist()
+        if column.dtype.kind == "M":
+            text = np.datetime_as_string(column, unit="us")
+            return np.where(np.isnat(column), "", text).tolist()
+        column = column.tolist()
+    return [_format_value(value) for value in column]
+
+
+def _format_value(value: Any) -> str:
+    """Formats a Python value as a CSV field."""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return '"' + value.replace('"', '""') + '"'
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
@@ -20,6 +20,7 @@ class ProductSource(SBase):
     """The product record."""
 
     __tablename__ = "product"
+    __table_args__ = (sa.Index("product_category_idx", "category"),)
 
     product_id: Mapped[str] = mapped_column(sa.VARCHAR(36), primary_key=True)
     product_name: Mapped[str] = mapped_column(sa.VARCHAR(255))
@@ -34,6 +35,7 @@ class CustomerSource(SBase):
     """The customer record."""
 
     __tablename__ = "customer"
+    __table_args__ = (sa.Index("customer_registered_at_idx", "registered_at"),)
 
     customer_id: Mapped[str] = mapped_column(sa.VARCHAR(36), primary_key=True)
     customer_name: Mapped[str] = mapped_column(sa.VARCHAR(50))
@@ -49,6 +51,12 @@ class CustomerBehaviorSource(SBase):
     """The customer behavior record."""
 
     __tablename__ = "customer_behavior"
+    __table_args__ = (
+        sa.Index(
+            "customer_behavior_action_at_brin", "action_at", postgresql_using="brin"
+        ).ddl_if(dialect="postgresql"),
+        {"postgresql_partition_by": "RANGE (action_at)"},
+    )
 
     customer_id: Mapped[str] = mapped_column(sa.VARCHAR(36), primary_key=True)
     product_id: Mapped[str] = mapped_column(sa.VARCHAR(36), primary_key=True)
@@ -62,6 +70,14 @@ class TransactionSource(SBase):
     """The transaction record."""
 
     __tablename__ = "transaction"
+    __table_args__ = (
+        sa.Index(
+            "transaction_transaction_at_brin",
+            "transaction_at",
+            postgresql_using="brin",
+        ).ddl_if(dialect="postgresql"),
+        {"postgresql_partition_by": "RANGE (transaction_at)"},
+    )
 
     customer_id: Mapped[str] = mapped_column(sa.VARCHAR(36), primary_key=True)
     product_id: Mapped[str] = mapped_column(sa.VARCHAR(36), primary_key=True)
@@ -88,6 +104,7 @@ class PromotionSource(SBase):
     """The promotion record."""
 
     __tablename__ = "promotion"
+    __table_args__ = (sa.Index("promotion_published_at_idx", "published_at"),)
 
     promotion_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     promotion_name: Mapped[str] = mapped_column(sa.VARCHAR(50))
@@ -97,3 +114,12 @@ class PromotionSource(SBase):
     discount_rate: Mapped[float] = mapped_column(sa.Float, nullable=True)
     gift: Mapped[str] = mapped_column(sa.VARCHAR(20), nullable=True)
     published_at: Mapped[dt.datetime]
+
+
+class SchemaVersionSource(SBase):
+    """The applied schema version."""
+
+    __tablename__ = "schema_version"
+
+    version: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    applied_at: Mapped[dt.datetime]
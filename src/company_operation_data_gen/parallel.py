@@ -0,0 +1,129 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The process pool and writer thread helpers.
+
+Runs the independent tasks of a job across processes, and returns the results in
+task order, so that the output does not depend on the number of workers. Writes
+the generated chunks on writer threads while the next chunks are generated, and
+loads several tables of a chunk at once on their own connections.
+"""
+
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+
+def iter_parallel(
+    function: Callable[[Any], Any],
+    tasks: Iterable[Any],
+    workers: int = 1,
+    max_in_flight: int = None,
+    initializer: Callable[..., None] = None,
+    initargs: Tuple = (),
+) -> Iterator[Any]:
+    """Runs the function on each task and yields the results in task order.
+
+    :param function: The module-level function to run on each task.
+    :param tasks: The tasks.
+    :param workers: The number of worker processes. With one worker, the tasks run in the current process.
+    :param max_in_flight: The maximum number of submitted tasks whose results are not yet consumed. If no parameters are provided, twice the number of workers.
+    :param initializer: The function to prepare each worker, for example to share a large context once.
+    :param initargs: The arguments of the initializer.
+    :return: The results in task order.
+    """
+    if workers <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for task in tasks:
+            yield function(task)
+        return
+
+    if max_in_flight is None:
+        max_in_flight = 2 * workers
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=initializer, initargs=initargs
+    ) as executor:
+        pending: Deque[Future] = deque()
+        for task in tasks:
+            pending.append(executor.submit(function, task))
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_pipelined(
+    function: Callable[[Any], Any],
+    tasks: Iterable[Any],
+    writers: int = 1,
+    max_in_flight: int = None,
+) -> Iterator[Any]:
+    """Runs the function on each task in writer threads, while the tasks are still being generated,
+    and yields the results in task order.
+    Pulling the next task from a generator runs in the current thread, so the generation
+    overlaps the writes, and stops while the maximum number of tasks is in flight,
+    so that a slow database holds back the generation instead of queueing chunks in memory.
+
+    :param function: The function to run on each task, for example writing a chunk on its own session.
+    :param tasks: The tasks, generated lazily.
+    :param writers: The number of writer threads. With no writers, the tasks run in the current thread.
+    :param max_in_flight: The maximum number of generated tasks whose results are not yet consumed. If no parameters are provided, twice the number of writers.
+    :return: The results in task order.
+    """
+    if writers < 1:
+        for task in tasks:
+            yield function(task)
+        return
+
+    if max_in_flight is None:
+        max_in_flight = 2 * writers
+
+    with ThreadPoolExecutor(
+        max_workers=writers, thread_name_prefix="writer"
+    ) as executor:
+        pending: Deque[Future] = deque()
+        for task in tasks:
+            pending.append(executor.submit(function, task))
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def run_in_transactions(
+    bind: sa.Engine, functions: Dict[str, Callable[[Session], Any]]
+) -> Dict[str, Any]:
+    """Runs the functions at the same time in threads, each on its own session from the pool of the engine,
+    and commits the sessions only after every function succeeded, so that a failure rolls all of them back.
+    The commits follow each other, so a crash between two of them leaves the earlier ones committed,
+    which a rerun merging with 'ON CONFLICT DO NOTHING' skips.
+
+    :param bind: The engine.
+    :param functions: The functions by name, each of which writes with the given session without committing.
+    :return: The results by name.
+    """
+    sessions = {name: Session(bind=bind) for name in functions}
+    try:
+        with ThreadPoolExecutor(
+            max_workers=len(functions), thread_name_prefix="loader"
+        ) as executor:
+            futures = {
+                name: executor.submit(function, sessions[name])
+                for name, function in functions.items()
+            }
+            results = {name: future.result() for name, future in futures.items()}
+        for session in sessions.values():
+            session.commit()
+    finally:
+        for session in sessions.values():
+            session.close()
+    return results
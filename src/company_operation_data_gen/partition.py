@@ -0,0 +1,104 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The monthly partitions of the time-series tables.
+
+On PostgreSQL, the customer behavior table and the transaction table are range
+partitioned by month on their timestamp, so that each month is a separate small
+heap with its own keys, and the date range scans only read the months they cover.
+The partition of a month is created before the first records of the month are
+inserted, together with the partition of the following month.
+"""
+
+
+from datetime import date
+from typing import List
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from .models import CustomerBehaviorSource, TransactionSource
+from .logging import LOGGER
+
+
+PARTITIONED_TABLES: List[sa.Table] = [
+    CustomerBehaviorSource.__table__,
+    TransactionSource.__table__,
+]
+"""The tables partitioned by month on their timestamp."""
+
+
+def month_start(day: date) -> date:
+    """Returns the first day of the month of the day."""
+    return date(day.year, day.month, 1)
+
+
+def next_month(day: date) -> date:
+    """Returns the first day of the month after the day."""
+    if day.month == 12:
+        return date(day.year + 1, 1, 1)
+    return date(day.year, day.month + 1, 1)
+
+
+def iter_months(start: date, end: date) -> List[date]:
+    """Returns the first day of every month from the month of the start to the month of the end."""
+    months = []
+    month = month_start(start)
+    while month <= end:
+        months.append(month)
+        month = next_month(month)
+    return months
+
+
+def partition_name(table: sa.Table, month: date) -> str:
+    """Returns the name of the partition of a table for a month, such as 'transaction_2025_03'."""
+    return f"{table.name}_{month:%Y_%m}"
+
+
+def is_partitioned(db: Session, table: sa.Table) -> bool:
+    """Returns whether the table is a partitioned table in the database of the session.
+    A table created by an earlier schema stays a plain table, and gets no partitions.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return (
+        db.execute(
+            sa.text(
+                "SELECT 1 FROM pg_catalog.pg_partitioned_table"
+                " WHERE partrelid = to_regclass(:table_name)"
+            ),
+            {"table_name": table.name},
+        ).scalar()
+        is not None
+    )
+
+
+def ensure_partitions(db: Session, start: date, end: date) -> List[str]:
+    """Creates the missing monthly partitions of the partitioned tables, without committing.
+
+    :param db: The database session.
+    :param start: The first day of the records to insert.
+    :param end: The last day of the records to insert.
+    :return: The names of the partitions, whether they existed already or not.
+    """
+    preparer = db.get_bind().dialect.identifier_preparer
+    names = []
+    for table in PARTITIONED_TABLES:
+        if not is_partitioned(db, table):
+            continue
+        for month in iter_months(start, end):
+            name = partition_name(table, month)
+            db.execute(
+                sa.text(
+                    f"CREATE TABLE IF NOT EXISTS {preparer.quote(name)}"
+                    f" PARTITION OF {preparer.format_table(table)}"
+                    f" FOR VALUES FROM ('{month}') TO ('{next_month(month)}')"
+                )
+            )
+            names.append(name)
+    if names:
+        LOGGER.debug(f"Ensured the partitions {names}.")
+    return names
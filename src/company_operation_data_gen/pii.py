@@ -0,0 +1,168 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The bulk personal data generator.
+
+Builds the zh-TW name, email domain and phone number pools of Faker once, then
+composes the personal data of many customers with NumPy draws, instead of calling
+Faker several times per customer.
+"""
+
+
+from datetime import date, timedelta
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+from faker.providers.internet import Provider as InternetProvider
+from faker.providers.person.zh_TW import Provider as PersonProvider
+from faker.providers.phone_number.zh_TW import Provider as PhoneNumberProvider
+
+from .constants import CustomerAttributeConstants
+from .sampler import AliasSampler
+
+
+class WeightedPool:
+    """The values of a pool and the sampler of their weights."""
+
+    def __init__(self, weights: Dict[str, float]):
+        self.values: np.ndarray = np.array(list(weights.keys()))
+        """The values of the pool."""
+        self.sampler: AliasSampler = AliasSampler(list(weights.values()))
+        """The sampler of the values by weight."""
+
+    def draw(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """Draws the values of a batch at once."""
+        return self.values[self.sampler.draw(rng, size)]
+
+
+class PiiGenerator:
+    """The bulk generator of the customer names, genders, birth dates, emails, phone numbers and cities."""
+
+    def __init__(self):
+        self.__last_names = WeightedPool(PersonProvider.last_names)
+        """The surnames, weighted by frequency."""
+        self.__first_names: Dict[str, WeightedPool] = {
+            "M": WeightedPool(PersonProvider.first_names_male),
+            "F": WeightedPool(PersonProvider.first_names_female),
+        }
+        """The given names of each gender, weighted by frequency."""
+        self.__last_romanized_names = WeightedPool(PersonProvider.last_romanized_names)
+        """The romanized surnames for the email user names."""
+        self.__first_romanized_names = WeightedPool(
+            PersonProvider.first_romanized_names
+        )
+        """The romanized given names for the email user names."""
+        self.__email_domains: np.ndarray = np.array(InternetProvider.safe_domain_names)
+        """The email domains."""
+        self.__phone_formats: Tuple[str, ...] = PhoneNumberProvider.formats
+        """The phone number formats, where '#' is any digit and '%' is a non-zero digit."""
+        self.__genders: np.ndarray = np.array(CustomerAttributeConstants.GENDER)
+        """The genders."""
+        self.__cities: np.ndarray = np.array(CustomerAttributeConstants.CITY)
+        """The cities."""
+
+    def generate(
+        self, count: int, rng: np.random.Generator = None, today: date = None
+    ) -> Dict[str, np.ndarray]:
+        """Generates the personal data of the customers as columns.
+
+        :param count: The number of customers.
+        :param rng: The random number generator. If no parameters are provided, a fresh one will be used.
+        :param today: Passes the current date for testing purposes. If no parameters are provided, today will be used.
+        :return: The customer_name, gender, birth, email, phone_number and city columns.
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+
+        gender = self.__genders[rng.integers(0, len(self.__genders), size=count)]
+        return {
+            "customer_name": self.__gen_name(rng, gender),
+            "gender": gender,
+            "birth": self.__gen_birth(rng, count, today),
+            "email": self.__gen_email(rng, count),
+            "phone_number": self.__gen_phone_number(rng, count),
+            "city": self.__cities[rng.integers(0, len(self.__cities), size=count)],
+        }
+
+    def __gen_name(self, rng: np.random.Generator, gender: np.ndarray) -> np.ndarray:
+        """Generates the names, a surname followed by a given name of the gender."""
+        first_name = np.empty(len(gender), dtype=object)
+        for key, pool in self.__first_names.items():
+            mask = gender == key
+            first_name[mask] = pool.draw(rng, int(np.count_nonzero(mask)))
+        last_name = self.__last_names.draw(rng, len(gender))
+        return np.char.add(last_name, first_name.astype(str))
+
+    def __gen_birth(
+        self, rng: np.random.Generator, count: int, today: date = None
+    ) -> np.ndarray:
+        """Generates the birth dates of the customers aged between the minimum and maximum ages."""
+        if today is None:
+            today = date.today()
+        earliest = _years_before(today, CustomerAttributeConstants.AGE_MAX + 1)
+        latest = _years_before(today, CustomerAttributeConstants.AGE_MIN)
+        days = rng.integers(0, (latest - earliest).days, size=count).astype(
+            "timedelta64[D]"
+        )
+        return np.datetime64(earliest + timedelta(days=1), "D") + days
+
+    def __gen_email(self, rng: np.random.Generator, count: int) -> np.ndarray:
+        """Generates the emails from the romanized names, like 'chia-hao.chen27@example.org'."""
+        return _concat(
+            [
+                np.char.lower(self.__first_romanized_names.draw(rng, count)),
+                ".",
+                np.char.lower(self.__last_romanized_names.draw(rng, count)),
+                rng.integers(0, 100, size=count).astype(str),
+                "@",
+                self.__email_domains[
+                    rng.integers(0, len(self.__email_domains), size=count)
+                ],
+            ]
+        )
+
+    def __gen_phone_number(self, rng: np.random.Generator, count: int) -> np.ndarray:
+        """Generates the phone numbers from the formats of the zh-TW locale."""
+        phone_number = np.empty(count, dtype=object)
+        format_index = rng.integers(0, len(self.__phone_formats), size=count)
+        for index, phone_format in enumerate(self.__phone_formats):
+            mask = format_index == index
+            phone_number[mask] = _numerify(
+                phone_format, rng, int(np.count_nonzero(mask))
+            )
+        return phone_number.astype(str)
+
+
+def _concat(parts: Iterable[np.ndarray | str]) -> np.ndarray:
+    """Concatenates the string columns and constants element-wise."""
+    result = None
+    for part in parts:
+        result = part if result is None else np.char.add(result, part)
+    return result
+
+
+def _numerify(phone_format: str, rng: np.random.Generator, size: int) -> np.ndarray:
+    """Fills the '#' of the format with any digit and the '%' with a non-zero digit, for a batch at once."""
+    template = np.frombuffer(phone_format.encode("ascii"), dtype=np.uint8)
+    codes = np.tile(template, (size, 1))
+    for placeholder, low in ((b"#", 0), (b"%", 1)):
+        columns = np.flatnonzero(template == ord(placeholder))
+        codes[:, columns] = ord("0") + rng.integers(
+            low, 10, size=(size, len(columns)), dtype=np.uint8
+        )
+    return codes.view(f"S{len(template)}").ravel().astype(str)
+
+
+def _years_before(day: date, years: int) -> date:
+    """Returns the same day of the years before, or February 28 for February 29."""
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28)
+
+
+pii_gen: PiiGenerator = PiiGenerator()
+"""The bulk personal data generator."""
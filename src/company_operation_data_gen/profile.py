@@ -0,0 +1,96 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The scale profiles.
+
+Loads the data volume of a run from the YAML profiles, so that the same generators
+produce a toy data set or tens of millions of records without code changes.
+"""
+
+
+import os
+from functools import lru_cache
+from typing import Dict, List, Literal, Optional
+
+import yaml
+from pydantic import BaseModel, Field
+
+
+PROFILE_FILE: str = os.path.join(os.path.dirname(__file__), "profiles.yaml")
+"""The YAML file of the scale profiles shipped with the package."""
+
+
+class ScaleProfile(BaseModel):
+    """The data volume of a run."""
+
+    name: str
+    customer_count_init: int = Field(gt=0)
+    customer_count_min: int = Field(ge=0)
+    customer_count_max: int = Field(ge=0)
+    behavior_scale: float = Field(gt=0)
+    crawler_pages: int = Field(gt=0)
+    engine: Literal["loop", "vectorized"] = "loop"
+    chunk_size: Optional[int] = Field(default=None, gt=0)
+    workers: int = Field(default=1, gt=0)
+    batch_size: int = Field(default=10_000, gt=0)
+    writers: int = Field(default=0, ge=0)
+    on_conflict: Literal["error", "nothing", "update"] = "error"
+    concurrent_load: bool = False
+    timestamp_unit: Literal["s", "ms", "us"] = "s"
+
+    def scale_behavior(self, count: float) -> int:
+        """Scales a daily customer behavior count of the constants, keeping at least one."""
+        return max(1, round(count * self.behavior_scale))
+
+
+@lru_cache
+def read_profiles(file_path: str = PROFILE_FILE) -> Dict[str, ScaleProfile]:
+    """Reads and validates every profile of the YAML file.
+
+    :param file_path: The YAML file of the profiles. If no parameters are provided, the profiles shipped with the package will be used.
+    :return: The profiles by name.
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+    return {name: ScaleProfile(name=name, **values) for name, values in data.items()}
+
+
+def list_profiles(file_path: str = PROFILE_FILE) -> List[str]:
+    """Returns the names of the profiles."""
+    return list(read_profiles(file_path).keys())
+
+
+def load_profile(name: str, file_path: str = PROFILE_FILE) -> ScaleProfile:
+    """Returns a profile by name.
+
+    :param name: The profile name, for example "default" or "xl".
+    :param file_path: The YAML file of the profiles. If no parameters are provided, the profiles shipped with the package will be used.
+    :return: The profile.
+    """
+    profiles = read_profiles(file_path)
+    if name not in profiles:
+        raise ValueError(
+            f"Unknown profile '{name}'. Choose from {', '.join(profiles.keys())}."
+        )
+    return profiles[name]
+
+
+__profile: ScaleProfile | None = None
+"""The scale profile of the run."""
+
+
+def get_profile() -> ScaleProfile:
+    """Returns the scale profile of the run. If no profile is set, the default profile will be used."""
+    global __profile
+    if __profile is None:
+        __profile = load_profile("default")
+    return __profile
+
+
+def set_profile(profile: ScaleProfile) -> None:
+    """Sets the scale profile of the run."""
+    global __profile
+    __profile = profile
@@ -11,8 +11,9 @@ and the corresponding constants, including the number of customer behavior data
 """
 
 
+from bisect import bisect_right
 from datetime import datetime, timedelta
-from typing import Tuple
+from typing import Dict, List, Tuple
 
 import sqlalchemy as sa
 
@@ -20,6 +21,179 @@ from .database import ds
 from .models import PromotionDateSource, PromotionSource
 from .schemas import PromotionRecord, PromotionData, PromotionConstants
 from .constants import BehaviorCountConstants, QuantityCountConstants
+from .profile import get_profile
+
+
+PROMOTION_COUNTS: Dict[str, Dict[str, int | float]] = {
+    "免運滿額贈": {
+        "behavior_avg": BehaviorCountConstants.GIFT_BEHAVIOR_AVG,
+        "behavior_sigma": BehaviorCountConstants.GIFT_BEHAVIOR_SIGMA,
+        "behavior_min": BehaviorCountConstants.GIFT_BEHAVIOR_MIN,
+        "behavior_max": BehaviorCountConstants.GIFT_BEHAVIOR_MAX,
+        "quantity_avg": QuantityCountConstants.GIFT_QUANTITY_AVG,
+        "quantity_sigma": QuantityCountConstants.GIFT_QUANTITY_SIGMA,
+        "quantity_min": QuantityCountConstants.GIFT_QUANTITY_MIN,
+        "quantity_max": QuantityCountConstants.GIFT_QUANTITY_MAX,
+    },
+    "滿額折扣": {
+        "behavior_avg": BehaviorCountConstants.DISCOUNT_BEHAVIOR_AVG,
+        "behavior_sigma": BehaviorCountConstants.DISCOUNT_BEHAVIOR_SIGMA,
+        "behavior_min": BehaviorCountConstants.DISCOUNT_BEHAVIOR_MIN,
+        "behavior_max": BehaviorCountConstants.DISCOUNT_BEHAVIOR_MAX,
+        "quantity_avg": QuantityCountConstants.DISCOUNT_QUANTITY_AVG,
+        "quantity_sigma": QuantityCountConstants.DISCOUNT_QUANTITY_SIGMA,
+        "quantity_min": QuantityCountConstants.DISCOUNT_QUANTITY_MIN,
+        "quantity_max": QuantityCountConstants.DISCOUNT_QUANTITY_MAX,
+    },
+    "多件優惠": {
+        "behavior_avg": BehaviorCountConstants.MULTI_BEHAVIOR_AVG,
+        "behavior_sigma": BehaviorCountConstants.MULTI_BEHAVIOR_SIGMA,
+        "behavior_min": BehaviorCountConstants.MULTI_BEHAVIOR_MIN,
+        "behavior_max": BehaviorCountConstants.MULTI_BEHAVIOR_MAX,
+        "quantity_avg": QuantityCountConstants.MULTI_QUANTITY_AVG,
+        "quantity_sigma": QuantityCountConstants.MULTI_QUANTITY_SIGMA,
+        "quantity_min": QuantityCountConstants.MULTI_QUANTITY_MIN,
+        "quantity_max": QuantityCountConstants.MULTI_QUANTITY_MAX,
+    },
+}
+"""The customer behavior counts and purchase quantities of each promotion type."""
+
+BEHAVIOR_COUNTS: Tuple[str, ...] = (
+    "behavior_avg",
+    "behavior_sigma",
+    "behavior_min",
+    "behavior_max",
+)
+"""The counts scaled by the scale profile."""
+
+
+def build_promotion_constants(
+    promotion_type: str, promotion_detail: PromotionData
+) -> PromotionConstants:
+    """Returns the constants of the promotion type, with the behavior counts scaled by the scale profile.
+
+    :param promotion_type: The promotion type.
+    :param promotion_detail: The promotion data.
+    :return: The constants based on the promotion type.
+    """
+    profile = get_profile()
+    counts = {
+        name: profile.scale_behavior(value) if name in BEHAVIOR_COUNTS else value
+        for name, value in PROMOTION_COUNTS[promotion_type].items()
+    }
+    return PromotionConstants(
+        promotion_type=promotion_type, promotion_detail=promotion_detail, **counts
+    )
+
+
+class PromotionCalendar:
+    """The promotion schedule and promotion data, indexed by weekday and publication time,
+    which answers the promotion of any day from memory."""
+
+    def __init__(
+        self,
+        schedule: Dict[int, List[Tuple[datetime, str]]],
+        promotions: List[PromotionRecord],
+    ):
+        """
+        :param schedule: The publication times and promotion types of each weekday.
+        :param promotions: The promotion data of every publication.
+        """
+        self.__schedule_times: Dict[int, List[datetime]] = {}
+        """The sorted publication times of the promotion type of each weekday."""
+        self.__schedule_types: Dict[int, List[str]] = {}
+        """The promotion types of each weekday, in the order of the publication times."""
+        for weekday, entries in schedule.items():
+            entries = sorted(entries)
+            self.__schedule_times[weekday] = [entry[0] for entry in entries]
+            self.__schedule_types[weekday] = [entry[1] for entry in entries]
+
+        self.__published_at: List[datetime] = sorted(
+            {promotion.published_at for promotion in promotions}
+        )
+        """The sorted publication times of the promotion data."""
+        self.__constants: Dict[Tuple[datetime, str], PromotionConstants] = {}
+        """The constants of each publication and promotion type."""
+        for published_at in self.__published_at:
+            for promotion_type in PROMOTION_COUNTS:
+                detail = [
+                    promotion
+                    for promotion in promotions
+                    if promotion.published_at == published_at
+                    and promotion.promotion_type == promotion_type
+                ]
+                self.__constants[(published_at, promotion_type)] = (
+                    build_promotion_constants(
+                        promotion_type, PromotionData(root=detail)
+                    )
+                )
+
+    def get_promotion_constants(
+        self, weekday: int, effective_at: datetime = None
+    ) -> PromotionConstants | None:
+        """Returns the promotion of the weekday in effect at the time, from the latest publications before the time.
+
+        :param weekday: The weekday of the promotion.
+        :param effective_at: The time at which the promotion is in effect. If no parameters are provided, the latest publications will be used.
+        :return: The constants based on the promotion type, or None if the promotion type of the weekday
+            or the promotion data were not published yet at the time.
+        """
+        if weekday not in self.__schedule_times or not self.__published_at:
+            raise ValueError(f"No promotion is published for weekday {weekday}.")
+        schedule_index = self.__latest(self.__schedule_times[weekday], effective_at)
+        published_index = self.__latest(self.__published_at, effective_at)
+        if schedule_index < 0 or published_index < 0:
+            return None
+        promotion_type = self.__schedule_types[weekday][schedule_index]
+        published_at = self.__published_at[published_index]
+        return self.__constants[(published_at, promotion_type)]
+
+    def __latest(self, published_at: List[datetime], effective_at: datetime) -> int:
+        """Returns the index of the latest publication time before the time, found by bisection,
+        or -1 if the time is before the first publication.
+        """
+        if effective_at is None:
+            return len(published_at) - 1
+        return bisect_right(published_at, effective_at) - 1
+
+
+def to_local_naive(value: datetime) -> datetime:
+    """Returns the time as a naive local time, like the day windows of the generators.
+    PostgreSQL returns the TIMESTAMPTZ columns as aware times, which cannot be compared with naive times.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+def load_promotion_calendar(db: sa.orm.Session) -> PromotionCalendar:
+    """Loads the promotion schedule and promotion data with a query each.
+    The publication times are converted to naive local times.
+
+    :param db: The database session.
+    :return: The promotion calendar.
+    """
+    with db:
+        schedule: Dict[int, List[Tuple[datetime, str]]] = {}
+        for day_of_week, promotion_type, published_at in db.execute(
+            sa.select(
+                PromotionDateSource.day_of_week,
+                PromotionDateSource.promotion_type,
+                PromotionDateSource.published_at,
+            )
+        ):
+            schedule.setdefault(day_of_week, []).append(
+                (to_local_naive(published_at), promotion_type)
+            )
+        promotions = [
+            PromotionRecord.model_validate(promotion).model_copy(
+                update={"published_at": to_local_naive(promotion.published_at)}
+            )
+            for promotion in db.scalars(
+                sa.select(PromotionSource).order_by(PromotionSource.promotion_id)
+            )
+        ]
+    return PromotionCalendar(schedule, promotions)
 
 
 class PromotionChoose:
@@ -29,9 +203,9 @@ class PromotionChoose:
         yesterday_weekday: int = None,
         session: sa.orm.Session = None,
     ) -> PromotionConstants:
-        """Returns the promotion data and the corresponding constants.
+        """Returns the latest promotion data of the weekday and the corresponding constants.
 
-        :param today_weekday: Passes the weekday for testing purposes. If no parameters are provided, today's weekday will be used.
+        :param yesterday_weekday: Passes the weekday for testing purposes. If no parameters are provided, yesterday's weekday will be used.
         :param session: Passes the test database for testing purposes. If no parameters are provided, the source database will be used.
         :return:
             - The promotion type.
@@ -44,90 +218,8 @@ class PromotionChoose:
             if yesterday_weekday is not None
             else (datetime.now() - timedelta(days=1)).weekday()
         )
-        result = self.__get_yesterday_promotion(
-            yesterday_weekday=yesterday_weekday, session=session
-        )
-        yesterday_promotion_type: str = result[0]
-        latest_promotion_content: PromotionData = result[1]
-
-        if yesterday_promotion_type == "免運滿額贈":
-            return PromotionConstants(
-                promotion_type=yesterday_promotion_type,
-                promotion_detail=latest_promotion_content,
-                behavior_avg=BehaviorCountConstants.GIFT_BEHAVIOR_AVG,
-                behavior_sigma=BehaviorCountConstants.GIFT_BEHAVIOR_SIGMA,
-                behavior_min=BehaviorCountConstants.GIFT_BEHAVIOR_MIN,
-                behavior_max=BehaviorCountConstants.GIFT_BEHAVIOR_MAX,
-                quantity_avg=QuantityCountConstants.GIFT_QUANTITY_AVG,
-                quantity_sigma=QuantityCountConstants.GIFT_QUANTITY_SIGMA,
-                quantity_min=QuantityCountConstants.GIFT_QUANTITY_MIN,
-                quantity_max=QuantityCountConstants.GIFT_QUANTITY_MAX,
-            )
-        elif yesterday_promotion_type == "滿額折扣":
-            return PromotionConstants(
-                promotion_type=yesterday_promotion_type,
-                promotion_detail=latest_promotion_content,
-                behavior_avg=BehaviorCountConstants.DISCOUNT_BEHAVIOR_AVG,
-                behavior_sigma=BehaviorCountConstants.DISCOUNT_BEHAVIOR_SIGMA,
-                behavior_min=BehaviorCountConstants.DISCOUNT_BEHAVIOR_MIN,
-                behavior_max=BehaviorCountConstants.DISCOUNT_BEHAVIOR_MAX,
-                quantity_avg=QuantityCountConstants.DISCOUNT_QUANTITY_AVG,
-                quantity_sigma=QuantityCountConstants.DISCOUNT_QUANTITY_SIGMA,
-                quantity_min=QuantityCountConstants.DISCOUNT_QUANTITY_MIN,
-                quantity_max=QuantityCountConstants.DISCOUNT_QUANTITY_MAX,
-            )
-        elif yesterday_promotion_type == "多件優惠":
-            return PromotionConstants(
-                promotion_type=yesterday_promotion_type,
-                promotion_detail=latest_promotion_content,
-                behavior_avg=BehaviorCountConstants.MULTI_BEHAVIOR_AVG,
-                behavior_sigma=BehaviorCountConstants.MULTI_BEHAVIOR_SIGMA,
-                behavior_min=BehaviorCountConstants.MULTI_BEHAVIOR_MIN,
-                behavior_max=BehaviorCountConstants.MULTI_BEHAVIOR_MAX,
-                quantity_avg=QuantityCountConstants.MULTI_QUANTITY_AVG,
-                quantity_sigma=QuantityCountConstants.MULTI_QUANTITY_SIGMA,
-                quantity_min=QuantityCountConstants.MULTI_QUANTITY_MIN,
-                quantity_max=QuantityCountConstants.MULTI_QUANTITY_MAX,
-            )
-
-    def __get_yesterday_promotion(
-        self, yesterday_weekday: int, session: sa.orm.Session
-    ) -> Tuple[str, PromotionData]:
-        """Returns the promotion type based on the weekday, then query the latest promotion data."""
-
-        if session:
-            db = session
-        else:
-            db = ds.get_db()
-
-        with db:
-            yesterday_promotion_type = (
-                db.query(PromotionDateSource.promotion_type)
-                .filter(PromotionDateSource.day_of_week == yesterday_weekday)
-                .order_by(PromotionDateSource.published_at.desc())
-                .first()
-            )
-            yesterday_promotion_type = (
-                yesterday_promotion_type[0] if yesterday_promotion_type else None
-            )
-            latest_promotion_date = db.scalar(sa.func.max(PromotionSource.published_at))
-
-            latest_promotion_content = (
-                db.query(PromotionSource)
-                .filter(
-                    PromotionSource.promotion_type == yesterday_promotion_type,
-                    PromotionSource.published_at == latest_promotion_date,
-                )
-                .all()
-            )
-            latest_promotion_content_models = [
-                PromotionRecord.model_validate(promotion)
-                for promotion in latest_promotion_content
-            ]
-
-        return yesterday_promotion_type, PromotionData(
-            root=latest_promotion_content_models
-        )
+        calendar = load_promotion_calendar(session if session else ds.get_db())
+        return calendar.get_promotion_constants(yesterday_weekday)
 
 
 promotion_choose: PromotionChoose = PromotionChoose()
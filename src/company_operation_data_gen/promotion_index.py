@@ -0,0 +1,111 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The promotion lookup table.
+
+Sorts the promotions of a type by threshold once, then finds the best promotion of
+a transaction by binary search instead of sorting and scanning every time.
+"""
+
+
+from bisect import bisect_right
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .schemas import PromotionRecord
+
+
+class PromotionIndex:
+    """The promotions of a type, sorted by threshold.
+    "多件優惠" uses the quantity threshold, "滿額折扣" and "免運滿額贈" use the cash threshold.
+    The applicable promotion is the one with the highest threshold reached.
+    """
+
+    def __init__(self, promotion_type: str, promotions: List["PromotionRecord"]):
+        self.promotion_type: str = promotion_type
+        """The promotion type."""
+        self.__by_quantity: bool = promotion_type == "多件優惠"
+        """Whether the threshold is the quantity rather than the amount."""
+
+        if promotion_type in ["滿額折扣", "免運滿額贈", "多件優惠"]:
+            threshold = "quantity_threshold" if self.__by_quantity else "cash_threshold"
+            candidates = [
+                (getattr(promotion, threshold), -position, promotion)
+                for position, promotion in enumerate(promotions)
+                if getattr(promotion, threshold) is not None
+            ]
+        else:
+            candidates = []
+        # Among equal thresholds, the first listed promotion sorts last, so it wins.
+        candidates.sort(key=lambda candidate: candidate[:2])
+
+        self.__promotions: List["PromotionRecord"] = [
+            candidate[2] for candidate in candidates
+        ]
+        """The promotions in ascending threshold order."""
+        self.__threshold_list: List[int] = [candidate[0] for candidate in candidates]
+        """The ascending thresholds."""
+        self.__thresholds: np.ndarray = np.array(self.__threshold_list, dtype=np.int64)
+        """The ascending thresholds as an array."""
+        self.__discount_rate: np.ndarray = np.array(
+            [
+                (
+                    promotion.discount_rate
+                    if promotion.promotion_type in ["滿額折扣", "多件優惠"]
+                    else 0.0
+                )
+                for promotion in self.__promotions
+            ]
+            + [0.0],
+            dtype=np.float64,
+        )
+        """The discount rate of each promotion, followed by 0 for no promotion."""
+        self.__gift: np.ndarray = np.array(
+            [
+                promotion.gift if promotion.promotion_type == "免運滿額贈" else None
+                for promotion in self.__promotions
+            ]
+            + [None],
+            dtype=object,
+        )
+        """The gift of each promotion, followed by None for no promotion."""
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PromotionIndex):
+            return NotImplemented
+        return (
+            self.promotion_type == other.promotion_type
+            and self.__promotions == other.__promotions
+        )
+
+    def select(self, quantity: int, amount: int) -> Optional["PromotionRecord"]:
+        """Returns the applicable promotion of a transaction, or None if no threshold is reached."""
+        value = quantity if self.__by_quantity else amount
+        position = bisect_right(self.__threshold_list, value) - 1
+        return self.__promotions[position] if position >= 0 else None
+
+    def lookup(self, quantity: np.ndarray, amount: np.ndarray) -> np.ndarray:
+        """Returns the position of the applicable promotion of every transaction, or -1 if no threshold is reached."""
+        value = quantity if self.__by_quantity else amount
+        return np.searchsorted(self.__thresholds, value, side="right") - 1
+
+    def apply(
+        self, quantity: np.ndarray, amount: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Applies the applicable promotion to every transaction at once.
+
+        :param quantity: The purchase quantities.
+        :param amount: The amounts before the discount.
+        :return:
+            - The discounts.
+            - The gifts.
+            - The totals after the discount.
+        """
+        position = self.lookup(quantity, amount)
+        discount = np.round(amount * self.__discount_rate[position]).astype(np.int64)
+        return discount, self.__gift[position], amount - discount
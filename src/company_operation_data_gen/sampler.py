@@ -0,0 +1,106 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The weighted samplers.
+
+Builds Walker's alias table once for a discrete distribution, so that each draw
+costs one uniform index and one coin flip, whatever the number of outcomes.
+"""
+
+
+import random
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+class AliasSampler:
+    """The weighted sampler of the outcomes 0 to n - 1, using Walker's alias method."""
+
+    def __init__(self, weights: Sequence[float]):
+        weights = np.asarray(weights, dtype=np.float64)
+        if len(weights) == 0 or np.any(weights < 0) or weights.sum() <= 0:
+            raise ValueError("The weights must be non-negative with a positive sum.")
+
+        size = len(weights)
+        scaled = weights * size / weights.sum()
+        prob = np.ones(size, dtype=np.float64)
+        alias = np.arange(size, dtype=np.int64)
+        small = np.flatnonzero(scaled < 1.0)
+        large = np.flatnonzero(scaled >= 1.0)
+        # Each round pairs every small column at once with the large column whose surplus covers
+        # the start of its deficit. The large columns pushed below one are paired in the next round.
+        while len(small) and len(large):
+            deficit = 1.0 - scaled[small]
+            surplus_end = np.cumsum(scaled[large] - 1.0)
+            donor = np.searchsorted(
+                surplus_end, np.cumsum(deficit) - deficit, side="right"
+            )
+            paired = donor < len(large)
+            if not paired.any():
+                break
+            less = small[paired]
+            prob[less] = scaled[less]
+            alias[less] = large[donor[paired]]
+            scaled[large] -= np.bincount(
+                donor[paired], weights=deficit[paired], minlength=len(large)
+            )
+            small = np.concatenate([small[~paired], large[scaled[large] < 1.0]])
+            large = large[scaled[large] >= 1.0]
+
+        self.__prob_list: List[float] = prob.tolist()
+        """The probability of keeping each column, for the single draws."""
+        self.__alias_list: List[int] = alias.tolist()
+        """The alias of each column, for the single draws."""
+        self.__prob: np.ndarray = prob
+        """The probability of keeping each column."""
+        self.__alias: np.ndarray = alias
+        """The alias of each column."""
+
+    def __len__(self) -> int:
+        return len(self.__prob_list)
+
+    def draw_one(self, rng: random.Random = None) -> int:
+        """Draws one outcome, for the generators looping one behavior at a time.
+
+        :param rng: The random number generator. If no parameters are provided, the 'random' module will be used.
+        :return: The drawn outcome.
+        """
+        rng = rng or random
+        column = rng.randrange(len(self.__prob_list))
+        if rng.random() < self.__prob_list[column]:
+            return column
+        return self.__alias_list[column]
+
+    def draw(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """Draws the outcomes of a batch at once.
+
+        :param rng: The random number generator.
+        :param size: The number of draws.
+        :return: The drawn outcomes.
+        """
+        column = rng.integers(0, len(self.__prob), size=size)
+        coin = rng.random(size)
+        return np.where(coin < self.__prob[column], column, self.__alias[column])
+
+
+def zipf_weights(size: int, exponent: float) -> np.ndarray:
+    """Returns the popularity weights which decrease with the rank, 1 / rank ** exponent.
+    An exponent of 0 gives the uniform weights.
+    """
+    return 1.0 / np.arange(1, size + 1, dtype=np.float64) ** exponent
+
+
+def popularity_sampler(size: int, exponent: float) -> Optional[AliasSampler]:
+    """Returns the sampler of the Zipf popularity, or None for the uniform popularity.
+
+    :param size: The number of items, ranked by their order.
+    :param exponent: The Zipf exponent. 0 means the items are equally popular.
+    :return: The sampler, or None if the items are equally popular or there is no item.
+    """
+    if exponent == 0 or size == 0:
+        return None
+    return AliasSampler(zipf_weights(size, exponent))
@@ -0,0 +1,108 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The versioned schema manager.
+
+Keeps the applied schema version in the schema_version table, and applies the
+missing migrations in order. The version is checked once per process and database,
+so that the generators do not reflect the schema before every insert.
+"""
+
+
+import os
+from datetime import datetime
+from typing import Callable, List, Set, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from .database import SBase
+from .models import (
+    CustomerSource,
+    ProductSource,
+    PromotionSource,
+    SchemaVersionSource,
+)
+from .logging import LOGGER
+
+
+SCHEMA_LOCK_KEY: int = 2025_0317
+"""The PostgreSQL advisory lock, which serializes the processes migrating the same database."""
+
+
+def _create_tables(connection: sa.Connection) -> None:
+    """Creates the missing tables of the data model."""
+    SBase.metadata.create_all(connection)
+
+
+def _create_filter_indexes(connection: sa.Connection) -> None:
+    """Creates the indexes of the columns the catalog and the promotion calendar filter on.
+    The promotion weekday is the first column of its primary key, which already indexes it.
+    """
+    for model in [ProductSource, CustomerSource, PromotionSource]:
+        for index in model.__table__.indexes:
+            index.create(connection, checkfirst=True)
+
+
+MIGRATIONS: List[Callable[[sa.Connection], None]] = [
+    _create_tables,
+    _create_filter_indexes,
+]
+"""The migrations in order. The schema version is the number of applied migrations."""
+
+SCHEMA_VERSION: int = len(MIGRATIONS)
+"""The schema version of the data model."""
+
+
+class SchemaManager:
+    """The versioned schema manager."""
+
+    def __init__(self):
+        self.__checked: Set[Tuple[str, int]] = set()
+        """The databases whose schema is up to date, with the process which checked them."""
+
+    def ensure_schema(self, db: Session) -> int:
+        """Applies the missing migrations to the database of the session, and commits.
+        Only the first call of a process for a database touches the database.
+
+        :param db: The database session.
+        :return: The schema version the database had before, or the current version if it was checked already.
+        """
+        key = (db.get_bind().url.render_as_string(), os.getpid())
+        if key in self.__checked:
+            return SCHEMA_VERSION
+
+        connection = db.connection()
+        if connection.dialect.name == "postgresql":
+            connection.execute(
+                sa.text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_LOCK_KEY}
+            )
+        SchemaVersionSource.__table__.create(connection, checkfirst=True)
+        version = (
+            connection.execute(
+                sa.func.max(SchemaVersionSource.version).select()
+            ).scalar()
+            or 0
+        )
+        for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            LOGGER.info(f"Applying the schema version {number}.")
+            migration(connection)
+            connection.execute(
+                sa.insert(SchemaVersionSource.__table__).values(
+                    version=number, applied_at=datetime.now()
+                )
+            )
+        db.commit()
+        self.__checked.add(key)
+        return version
+
+    def clear_cache(self) -> None:
+        """Forgets the checked databases, so that the next call checks them again."""
+        self.__checked.clear()
+
+
+schema_manager: SchemaManager = SchemaManager()
+"""The versioned schema manager."""
@@ -11,7 +11,9 @@ The Pydantic schemas.
 import datetime as dt
 from typing import Literal, List, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+from .promotion_index import PromotionIndex
 
 
 class ProductRecord(BaseModel):
@@ -159,3 +161,15 @@ class PromotionConstants(BaseModel):
     quantity_sigma: float
     quantity_min: int
     quantity_max: int
+
+    _promotion_index: PromotionIndex = PrivateAttr()
+
+    def model_post_init(self, __context) -> None:
+        self._promotion_index = PromotionIndex(
+            self.promotion_type, self.promotion_detail.root
+        )
+
+    @property
+    def promotion_index(self) -> PromotionIndex:
+        """The promotion lookup table, built once with the constants."""
+        return self._promotion_index
@@ -10,13 +10,13 @@ The product data scraper.
 
 import re
 import time
-import uuid
 from datetime import datetime
 
 import requests
 from bs4 import BeautifulSoup
 
 from .constants import CrawlerConstants
+from .ids import id_allocator
 from .schemas import ProductData
 
 
@@ -54,8 +54,9 @@ class ProductScraper:
             )
 
     def _parse_products(self, soup, keyword):
-        for item in soup.select("li.goodsItemLi"):
-            product_id = str(uuid.uuid4())
+        items = soup.select("li.goodsItemLi")
+        product_ids = id_allocator.allocate(len(items)).tolist()
+        for item, product_id in zip(items, product_ids):
             product_name = item.select_one(".prdName").get_text(strip=True)
             brand_match = self.brand_pattern.search(product_name)
             brand_name = brand_match.group(1) if brand_match else None
@@ -0,0 +1,130 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The staged merge loader.
+
+Loads the records into a staging table, and merges the staging table into its target
+table with 'INSERT ... ON CONFLICT', so that a rerun after a partial failure skips or
+updates the records which were committed already instead of failing on their keys.
+"""
+
+
+from typing import Iterable, List
+from uuid import uuid4
+
+import sqlalchemy as sa
+from pydantic import BaseModel, RootModel
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from .batch import RecordBatch
+from .loader import iter_batches, load_table
+
+
+CONFLICT_MODES: List[str] = ["error", "nothing", "update"]
+"""What the merge does with the records whose keys exist already.
+"error" fails, "nothing" keeps the existing records, and "update" overwrites them."""
+
+
+def load_table_staged(
+    db: Session,
+    table: sa.Table,
+    data: RootModel | RecordBatch | Iterable[BaseModel],
+    batch_size: int,
+    on_conflict: str = "error",
+) -> int:
+    """Loads the table into a staging table and merges it into the table with one statement,
+    in the transaction of the session, without committing.
+
+    :param db: The database session.
+    :param table: The target table.
+    :param data: The Pydantic data, the record batch, or Pydantic records generated lazily.
+    :param batch_size: The maximum number of records sent at a time.
+    :param on_conflict: "error", "nothing" or "update", for the records whose keys exist already.
+    :return: The number of inserted or updated records.
+    """
+    dialect_name = db.get_bind().dialect.name
+    staging = create_staging_table(table, sa.MetaData(), dialect_name, uuid4().hex[:12])
+    staging.create(db.connection())
+    for batch in iter_batches(data, batch_size):
+        load_table(db, staging, batch, page_size=batch_size)
+    count = db.execute(
+        merge_statement(table, staging, dialect_name, on_conflict)
+    ).rowcount
+    staging.drop(db.connection())
+    return count
+
+
+def merge_statement(
+    table: sa.Table, staging: sa.Table, dialect_name: str, on_conflict: str
+) -> sa.Insert:
+    """Returns the 'INSERT ... SELECT' statement which moves the staging table into the target table.
+
+    :param table: The target table.
+    :param staging: The staging table.
+    :param dialect_name: The database dialect, "postgresql" or "sqlite" for the conflict modes other than "error".
+    :param on_conflict: "error", "nothing" or "update", for the records whose keys exist already.
+    :return: The statement.
+    """
+    if on_conflict not in CONFLICT_MODES:
+        raise ValueError(f"The conflict mode must be one of {CONFLICT_MODES}.")
+    columns = [column.name for column in table.columns]
+    select = sa.select(*[staging.c[column] for column in columns])
+    if on_conflict == "error":
+        return sa.insert(table).from_select(columns, select)
+
+    if dialect_name == "postgresql":
+        insert = postgresql.insert
+    elif dialect_name == "sqlite":
+        insert = sqlite.insert
+    else:
+        raise ValueError(
+            f"The conflict mode '{on_conflict}' is not supported by {dialect_name}."
+        )
+    keys = [column.name for column in table.primary_key.columns]
+    if on_conflict == "update" and dialect_name == "postgresql":
+        # PostgreSQL cannot update a row twice in one statement, so a key repeated in the staging table is merged once.
+        ranked = sa.select(
+            *[staging.c[column] for column in columns],
+            sa.func.row_number()
+            .over(partition_by=[staging.c[key] for key in keys])
+            .label("key_rank"),
+        ).subquery()
+        select = sa.select(*[ranked.c[column] for column in columns]).where(
+            ranked.c.key_rank == 1
+        )
+    # SQLite needs the WHERE clause to tell the ON CONFLICT of the upsert from a join of the SELECT.
+    statement = insert(table).from_select(columns, select.where(sa.true()))
+    if on_conflict == "nothing":
+        return statement.on_conflict_do_nothing(index_elements=keys)
+    return statement.on_conflict_do_update(
+        index_elements=keys,
+        set_={
+            column: statement.excluded[column]
+            for column in columns
+            if column not in keys
+        },
+    )
+
+
+def create_staging_table(
+    table: sa.Table, metadata: sa.MetaData, dialect_name: str, token: str
+) -> sa.Table:
+    """Declares the staging table of a target table, with the same columns but no constraints or indexes,
+    and unlogged on PostgreSQL since its rows are copied to the target table before the commit.
+
+    :param table: The target table.
+    :param metadata: The metadata of the staging table.
+    :param dialect_name: The database dialect.
+    :param token: The unique suffix of the load, so that concurrent loads do not share a staging table.
+    :return: The staging table, which is not created yet.
+    """
+    return sa.Table(
+        f"{table.name}_staging_{token}",
+        metadata,
+        *[sa.Column(column.name, column.type) for column in table.columns],
+        prefixes=["UNLOGGED"] if dialect_name == "postgresql" else [],
+    )
@@ -0,0 +1,156 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The timestamp generator.
+
+Fixes the day window once per run, so that every customer behavior of the run falls
+on the same day even if the run crosses midnight, and draws the timestamps of a
+whole batch as NumPy datetime64 arrays.
+"""
+
+
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Literal, Tuple
+
+import numpy as np
+
+from .constants import BehaviorAttributeConstants
+
+
+SECONDS_PER_DAY: int = 24 * 60 * 60
+"""The number of seconds in a day."""
+
+TICKS_PER_SECOND: Dict[str, int] = {"s": 1, "ms": 1_000, "us": 1_000_000}
+"""The number of ticks per second of each timestamp unit."""
+
+
+@dataclass(frozen=True)
+class DayWindow:
+    """The day of the generated customer behaviors, from midnight to the last tick of the day.
+    The times are drawn to the unit of the window. A finer unit than the second keeps the
+    customer behavior keys unique when millions of behaviors are generated in a day.
+    """
+
+    start: datetime
+    """The midnight starting the day."""
+    unit: Literal["s", "ms", "us"] = "s"
+    """The unit of the drawn times."""
+
+    @classmethod
+    def of(cls, day: datetime, unit: str = "s") -> "DayWindow":
+        """Returns the window of the day containing the given time."""
+        return cls(
+            start=day.replace(hour=0, minute=0, second=0, microsecond=0), unit=unit
+        )
+
+    @classmethod
+    def previous_day(cls, now: datetime = None, unit: str = "s") -> "DayWindow":
+        """Returns the window of the previous day.
+
+        :param now: Passes the current time for testing purposes. If no parameters are provided, the current time will be used.
+        :param unit: The unit of the drawn times, "s", "ms" or "us".
+        :return: The window of the day before 'now'.
+        """
+        if now is None:
+            now = datetime.now()
+        return cls.of(now - timedelta(days=1), unit=unit)
+
+    @property
+    def weekday(self) -> int:
+        """The weekday of the day, where Monday is 0."""
+        return self.start.weekday()
+
+    @property
+    def ticks(self) -> int:
+        """The number of ticks in the day."""
+        return SECONDS_PER_DAY * TICKS_PER_SECOND[self.unit]
+
+    def random_time(
+        self, rng: random.Random = None, span: Tuple[int, int] = None
+    ) -> datetime:
+        """Draws one time of the day.
+
+        :param rng: The random number generator. If no parameters are provided, the 'random' module will be used.
+        :param span: The first tick and the tick after the last of the part of the day to draw from. If no parameters are provided, the whole day will be used.
+        :return: The time of the day, to the unit of the window.
+        """
+        low, high = span or (0, self.ticks)
+        tick = (rng or random).randrange(low, high)
+        return self.start + timedelta(
+            microseconds=tick * (TICKS_PER_SECOND["us"] // TICKS_PER_SECOND[self.unit])
+        )
+
+    def draw_times(
+        self, rng: np.random.Generator, size: int, span: Tuple[int, int] = None
+    ) -> np.ndarray:
+        """Draws the times of a batch at once.
+
+        :param rng: The random number generator.
+        :param size: The number of times.
+        :param span: The first tick and the tick after the last of the part of the day to draw from. If no parameters are provided, the whole day will be used.
+        :return: The times of the day, to the unit of the window, as 'datetime64[us]'.
+        """
+        low, high = span or (0, self.ticks)
+        ticks = rng.integers(low, high, size=size)
+        return np.datetime64(self.start, "us") + ticks.astype(
+            f"timedelta64[{self.unit}]"
+        )
+
+    def split_ticks(self, sizes: List[int]) -> List[Tuple[int, int]]:
+        """Splits the day into consecutive spans in proportion to the sizes of the shards,
+        so that the shards drawn in order are in time order, while the times of the whole day stay uniform.
+
+        :param sizes: The number of times of each shard.
+        :return: The first tick and the tick after the last of each shard.
+        """
+        bounds = np.cumsum([0] + sizes) * self.ticks // max(sum(sizes), 1)
+        # A shard too small for a tick of its own still draws from one tick.
+        return [
+            (int(low), max(int(high), int(low) + 1))
+            for low, high in zip(bounds[:-1], bounds[1:])
+        ]
+
+
+def day_seed(seed: int, day: date) -> int:
+    """Derives the seed of a day from the run seed and the date,
+    so that a day is reproduced by any run with the same seed, and the days differ from each other.
+    """
+    state = np.random.SeedSequence([seed, day.toordinal()]).generate_state(
+        1, dtype=np.uint64
+    )
+    return int(state[0])
+
+
+def random_time_after(start_time: datetime, rng: random.Random = None) -> datetime:
+    """Draws the time of the next step of the funnel. If no generator is provided, the 'random' module will be used.
+    The time interval between customer behaviors is between five minutes and two hours.
+    """
+    return start_time + timedelta(
+        seconds=(rng or random).randint(
+            BehaviorAttributeConstants.FUNNEL_GAP_MIN_SECONDS,
+            BehaviorAttributeConstants.FUNNEL_GAP_MAX_SECONDS,
+        )
+    )
+
+
+def draw_funnel_offsets(rng: np.random.Generator, size: int, steps: int) -> np.ndarray:
+    """Draws the offsets of the funnel steps after the view, for a batch at once.
+    Each step happens between five minutes and two hours after the previous step.
+
+    :param rng: The random number generator.
+    :param size: The number of funnels.
+    :param steps: The number of steps after the view.
+    :return: The cumulative offsets from the view, as 'timedelta64[s]' of shape (size, steps).
+    """
+    gaps = rng.integers(
+        BehaviorAttributeConstants.FUNNEL_GAP_MIN_SECONDS,
+        BehaviorAttributeConstants.FUNNEL_GAP_MAX_SECONDS,
+        size=(size, steps),
+        endpoint=True,
+    )
+    return np.cumsum(gaps, axis=1).astype("timedelta64[s]")
@@ -9,180 +9,235 @@ The transaction data generator.
 
 
 import random
-from datetime import datetime, timedelta
-from typing import Optional, Dict
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Iterator, List, Optional
 
+import numpy as np
 import sqlalchemy as sa
 
 from .database import ds
-from .models import ProductSource, CustomerSource
+from .catalog import (
+    CatalogProduct,
+    ProductCatalog,
+    load_product_catalog,
+    load_customer_ids,
+)
+from .batch import split_chunks
+from .sampler import AliasSampler, popularity_sampler
+from .profile import get_profile
+from .timestamps import DayWindow, random_time_after
 from .schemas import (
-    CustomerRecord,
-    ProductRecord,
     CustomerActivityData,
     CustomerBehaviorData,
     CustomerBehaviorRecord,
     TransactionData,
     TransactionRecord,
     PromotionConstants,
-    PromotionData,
-    PromotionRecord,
 )
-
-from .constants import PROMO_PRODUCT_PREFERENCES
+from .constants import BehaviorAttributeConstants, PopularityConstants
 
 
 class CustomerActivityGenerator:
     """The customer behavior data and transaction data generator."""
 
     def generate(
-        self, promotion_constants: PromotionConstants, session: sa.orm.Session = None
+        self,
+        promotion_constants: PromotionConstants,
+        session: sa.orm.Session = None,
+        catalog: ProductCatalog = None,
+        day: datetime = None,
+        rng: random.Random = None,
     ) -> CustomerActivityData:
         """Generates and returns the customer behavior data and transaction data.
 
         :param promotion_constants: The constants based on the different promotion type.
         :param session: Passes the test database for testing purposes. If no parameters are provided, the source database will be used.
+        :param catalog: The product catalog loaded for this run. If no parameters are provided, it will be loaded from the database.
+        :param day: The day of the customer behaviors. If no parameters are provided, the previous day will be used.
+        :param rng: The random number generator. If no parameters are provided, the 'random' module will be used.
         :return:
             - The customer behavior data.
             - The transaction data.
         """
+        return next(
+            self.iter_generate(
+                promotion_constants, session=session, catalog=catalog, day=day, rng=rng
+            )
+        )
+
+    def iter_generate(
+        self,
+        promotion_constants: PromotionConstants,
+        chunk_size: int = None,
+        session: sa.orm.Session = None,
+        catalog: ProductCatalog = None,
+        day: datetime = None,
+        customer_ids: np.ndarray = None,
+        rng: random.Random = None,
+    ) -> Iterator[CustomerActivityData]:
+        """Generates the customer behavior data and transaction data in chunks,
+        so that only one chunk is kept in memory at a time.
+
+        :param promotion_constants: The constants based on the different promotion type.
+        :param chunk_size: The maximum number of viewed products in a chunk. If no parameters are provided, the whole day is one chunk.
+        :param session: Passes the test database for testing purposes. If no parameters are provided, the source database will be used.
+        :param catalog: The product catalog loaded for this run. If no parameters are provided, it will be loaded from the database.
+        :param day: The day of the customer behaviors. If no parameters are provided, the previous day will be used.
+        :param customer_ids: The IDs of the customers to choose from. If no parameters are provided, every customer will be loaded from the database.
+        :param rng: The random number generator, for example seeded by the backfill. If no parameters are provided, the 'random' module will be used.
+        :return: The customer behavior data and the transaction data of each chunk.
+        """
+        rng = rng or random
+        # The day is fixed once, so a run crossing midnight still generates a single day.
+        unit = get_profile().timestamp_unit
+        window = (
+            DayWindow.previous_day(unit=unit)
+            if day is None
+            else DayWindow.of(day, unit=unit)
+        )
+
         num_behavior: int = self.__gen_random_count(
+            rng,
             promotion_constants.behavior_avg,
             promotion_constants.behavior_sigma,
             promotion_constants.behavior_min,
             promotion_constants.behavior_max,
         )
 
-        product_probabilities = self.__get_product_prob(
+        if catalog is None or customer_ids is None:
+            # A session opened here is closed as soon as the catalog and the customers are loaded.
+            with nullcontext(session) if session else ds.get_db() as db:
+                if catalog is None:
+                    catalog = load_product_catalog(db)
+                if customer_ids is None:
+                    customer_ids = load_customer_ids(db)
+
+        categories, category_sampler = catalog.get_category_sampler(
             promotion_constants.promotion_type
         )
+        customer_sampler = popularity_sampler(
+            len(customer_ids), PopularityConstants.CUSTOMER_EXPONENT
+        )
 
-        if session:
-            db = session
-        else:
-            db = ds.get_db()
-
-        with db:
-            customers = db.query(CustomerSource).all()
-
-        customer_behavior_record: CustomerBehaviorData = []
-        transaction_record: TransactionData = []
-
-        for _ in range(num_behavior):
-            customer: CustomerRecord = random.choice(customers)
-            product: ProductRecord = self.__get_product_based_on_prob(
-                product_probabilities, db
-            )
-
-            view_behavior: CustomerBehaviorRecord = self.__gen_behavior(
-                customer, product, action_type="view"
-            )
-            customer_behavior_record.append(view_behavior)
-
-            device_type = view_behavior.device_type
-            referrer = view_behavior.referrer
-            last_action_time = view_behavior.action_at
+        # Each chunk draws its views from its own span of the day, so that the chunks are written in time order.
+        chunk_sizes = split_chunks(num_behavior, chunk_size)
+        for num_chunk_behavior, span in zip(
+            chunk_sizes, window.split_ticks(chunk_sizes)
+        ):
+            customer_behavior_record: CustomerBehaviorData = []
+            transaction_record: TransactionData = []
+
+            for _ in range(num_chunk_behavior):
+                customer_id: str = self.__choose_customer(
+                    rng, customer_ids, customer_sampler
+                )
+                product: CatalogProduct = self.__get_product_based_on_prob(
+                    rng, categories, category_sampler, catalog
+                )
 
-            if random.choice([True, False]):
-                add_to_cart_behavior: CustomerBehaviorRecord = self.__gen_behavior(
-                    customer,
+                view_behavior: CustomerBehaviorRecord = self.__gen_behavior(
+                    rng,
+                    customer_id,
                     product,
-                    action_type="add_to_cart",
-                    device_type=device_type,
-                    referrer=referrer,
-                    action_at=self.__random_timestamp_after(last_action_time),
+                    action_type="view",
+                    action_at=window.random_time(rng, span=span),
                 )
-                customer_behavior_record.append(add_to_cart_behavior)
+                customer_behavior_record.append(view_behavior)
 
-                last_action_time = add_to_cart_behavior.action_at
+                device_type = view_behavior.device_type
+                referrer = view_behavior.referrer
+                last_action_time = view_behavior.action_at
 
-                if random.choice([True, False]):
-                    purchase_behavior: CustomerBehaviorRecord = self.__gen_behavior(
-                        customer,
+                if rng.choice([True, False]):
+                    add_to_cart_behavior: CustomerBehaviorRecord = self.__gen_behavior(
+                        rng,
+                        customer_id,
                         product,
-                        action_type="purchase",
+                        action_type="add_to_cart",
                         device_type=device_type,
                         referrer=referrer,
-                        action_at=self.__random_timestamp_after(last_action_time),
+                        action_at=random_time_after(last_action_time, rng),
                     )
-                    customer_behavior_record.append(purchase_behavior)
-
-                    num_quantity: int = self.__gen_random_count(
-                        promotion_constants.quantity_avg,
-                        promotion_constants.quantity_sigma,
-                        promotion_constants.quantity_min,
-                        promotion_constants.quantity_max,
-                    )
-
-                    transaction = self.__gen_transaction(
-                        customer,
-                        product,
-                        purchase_behavior,
-                        num_quantity,
-                        promotion_constants,
-                    )
-                    transaction_record.append(transaction)
-
-        customer_behavior_data = CustomerBehaviorData(root=customer_behavior_record)
-        transaction_data = TransactionData(root=transaction_record)
-
-        return CustomerActivityData(
-            customer_behavior=customer_behavior_data,
-            transaction=transaction_data,
-        )
+                    customer_behavior_record.append(add_to_cart_behavior)
+
+                    last_action_time = add_to_cart_behavior.action_at
+
+                    if rng.choice([True, False]):
+                        purchase_behavior: CustomerBehaviorRecord = self.__gen_behavior(
+                            rng,
+                            customer_id,
+                            product,
+                            action_type="purchase",
+                            device_type=device_type,
+                            referrer=referrer,
+                            action_at=random_time_after(last_action_time, rng),
+                        )
+                        customer_behavior_record.append(purchase_behavior)
+
+                        num_quantity: int = self.__gen_random_count(
+                            rng,
+                            promotion_constants.quantity_avg,
+                            promotion_constants.quantity_sigma,
+                            promotion_constants.quantity_min,
+                            promotion_constants.quantity_max,
+                        )
+
+                        transaction = self.__gen_transaction(
+                            customer_id,
+                            product,
+                            purchase_behavior,
+                            num_quantity,
+                            promotion_constants,
+                        )
+                        transaction_record.append(transaction)
+
+            # The records are written in time order, which keeps the time indexes compact.
+            customer_behavior_record.sort(key=lambda record: record.action_at)
+            transaction_record.sort(key=lambda record: record["transaction_at"])
+            customer_behavior_data = CustomerBehaviorData(root=customer_behavior_record)
+            transaction_data = TransactionData(root=transaction_record)
+
+            yield CustomerActivityData(
+                customer_behavior=customer_behavior_data,
+                transaction=transaction_data,
+            )
 
-    def __gen_random_count(self, mu, sigma, minimum, maximum) -> int:
+    def __gen_random_count(
+        self, rng: random.Random, mu, sigma, minimum, maximum
+    ) -> int:
         """Generates a random customer behavior count within a defined minimum and maximum range."""
-        num_behavior = int(random.normalvariate(mu, sigma))
+        num_behavior = int(rng.normalvariate(mu, sigma))
         return max(minimum, min(num_behavior, maximum))
 
-    def __get_product_prob(self, promotion_type: str) -> Dict[str, float]:
-        """Returns the probabilities for choosing product according to the promotion type."""
-        if promotion_type == "免運滿額贈":
-            return PROMO_PRODUCT_PREFERENCES["免運滿額贈"]
-        elif promotion_type == "滿額折扣":
-            return PROMO_PRODUCT_PREFERENCES["滿額折扣"]
-        elif promotion_type == "多件優惠":
-            return PROMO_PRODUCT_PREFERENCES["多件優惠"]
+    def __choose_customer(
+        self,
+        rng: random.Random,
+        customer_ids: np.ndarray,
+        customer_sampler: Optional[AliasSampler],
+    ) -> str:
+        """Chooses a customer by popularity, or uniformly if no sampler is provided."""
+        if customer_sampler is None:
+            return customer_ids[rng.randrange(len(customer_ids))]
+        return customer_ids[customer_sampler.draw_one(rng)]
 
     def __get_product_based_on_prob(
-        self, product_probabilities: Dict[str, float], db: sa.orm.Session
-    ) -> ProductRecord:
-        products = list(product_probabilities.keys())
-        probabilities = list(product_probabilities.values())
-
-        category = random.choices(products, probabilities)[0]
-
-        with db:
-            selected_category = (
-                db.query(ProductSource).filter(ProductSource.category == category).all()
-            )
-        selected_product = random.choice(selected_category)
-
-        return selected_product
+        self,
+        rng: random.Random,
+        categories: List[str],
+        category_sampler: AliasSampler,
+        catalog: ProductCatalog,
+    ) -> CatalogProduct:
+        """Chooses a category by its preference, then a product of the category from the catalog."""
+        category = categories[category_sampler.draw_one(rng)]
 
-    def __random_timestamp_previous_day(self) -> datetime:
-        """Generates a random timestamp from the previous day."""
-        start_time = (datetime.now() - timedelta(days=1)).replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
-        end_time = start_time.replace(hour=23, minute=59, second=59)
-        random_time = start_time + timedelta(
-            seconds=random.randint(0, int((end_time - start_time).total_seconds()))
-        )
-        return random_time
-
-    def __random_timestamp_after(self, start_time) -> datetime:
-        """Generates a random timestamp for customer behavior that follows a specific sequence.
-        The time interval between customer behaviors is between five minutes and two hours.
-        """
-        random_time = start_time + timedelta(seconds=random.randint(300, 7200))
-        return random_time
+        return catalog.sample(category, rng)
 
     def __gen_behavior(
         self,
-        customer: CustomerRecord,
-        product: ProductRecord,
+        rng: random.Random,
+        customer_id: str,
+        product: CatalogProduct,
         action_type: str,
         device_type: str = None,
         referrer: str = None,
@@ -195,30 +250,14 @@ class CustomerActivityGenerator:
 
         :return: The customer behavior record.
         """
-        device_list = ["mobile", "tablet", "desktop", "laptop", "unknown"]
-        referrer_list = [
-            "direct",
-            "search_engine",
-            "social_media",
-            "email",
-            "paid_ads",
-            "referral",
-            "unknown",
-        ]
-
         if device_type is None:
             """When a customer view a product for the first time, meaning the action_type is 'view', the device_type will be null."""
-            device_type = random.choice(device_list)
+            device_type = rng.choice(BehaviorAttributeConstants.DEVICE_TYPE)
 
         if referrer is None:
             """When a customer view a product for the first time, meaning the action_type is 'view', the referrer will be null."""
-            referrer = random.choice(referrer_list)
-
-        if action_at is None:
-            """When a customer view a product for the first time, meaning the action_type is 'view', the action_at will be null."""
-            action_at = self.__random_timestamp_previous_day()
+            referrer = rng.choice(BehaviorAttributeConstants.REFERRER)
 
-        customer_id = customer.customer_id
         product_id = product.product_id
 
         behavior_record = CustomerBehaviorRecord(
@@ -233,26 +272,20 @@ class CustomerActivityGenerator:
 
     def __gen_transaction(
         self,
-        customer: CustomerRecord,
-        product: ProductRecord,
+        customer_id: str,
+        product: CatalogProduct,
         behavior: CustomerBehaviorRecord,
         quantity: int,
         promotion_constants: PromotionConstants,
     ) -> TransactionRecord:
         """Generates and returns the transaction record."""
-        customer_id = customer.customer_id
         product_id = product.product_id
         quantity = quantity
         promotion_price = product.promotion_price
         amount = quantity * promotion_price
         transaction_at = behavior.action_at
 
-        applied_promotion = self.__select_promotion(
-            promotion_constants.promotion_type,
-            promotion_constants.promotion_detail,
-            quantity,
-            amount,
-        )
+        applied_promotion = promotion_constants.promotion_index.select(quantity, amount)
         if applied_promotion is None:
             transaction_record = {
                 "customer_id": customer_id,
@@ -295,43 +328,6 @@ class CustomerActivityGenerator:
             }
             return transaction_record
 
-    def __select_promotion(
-        self,
-        promotion_type: str,
-        promotion_detail: PromotionData,
-        quantity: int,
-        amount: int,
-    ) -> Optional[PromotionRecord]:
-        """根據促銷類型選擇要用購買金額或購買數量，排序促銷活動，以擇優選擇促銷活動(可能無適用活動)"""
-
-        if promotion_type == "滿額折扣" or promotion_type == "免運滿額贈":
-            sorted_promotions = sorted(
-                promotion_detail.root,
-                key=lambda promo: promo.cash_threshold,
-                reverse=True,
-            )
-        elif promotion_type == "多件優惠":
-            sorted_promotions = sorted(
-                promotion_detail.root,
-                key=lambda promo: promo.quantity_threshold,
-                reverse=True,
-            )
-        else:
-            sorted_promotions = []
-
-        for promotion in sorted_promotions:
-            if promotion_type == "免運滿額贈" and amount >= promotion.cash_threshold:
-                return promotion
-            elif promotion_type == "滿額折扣" and amount >= promotion.cash_threshold:
-                return promotion
-            elif (
-                promotion_type == "多件優惠"
-                and quantity >= promotion.quantity_threshold
-            ):
-                return promotion
-
-        return None
-
 
 activity_gen: CustomerActivityGenerator = CustomerActivityGenerator()
 """The customer activity data generator."""
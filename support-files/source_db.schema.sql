@@ -23,6 +23,8 @@ CREATE TABLE public.product (
 
 ALTER TABLE public.product OWNER TO source_db;
 
+CREATE INDEX product_category_idx ON public.product (category);
+
 -- Name: customer; Type: TABLE; Schema: public; Owner: source_db
 
 CREATE TABLE public.customer (
@@ -38,6 +40,8 @@ CREATE TABLE public.customer (
 
 ALTER TABLE public.customer OWNER TO source_db;
 
+CREATE INDEX customer_registered_at_idx ON public.customer (registered_at);
+
 -- Name: customer_behavior; Type: TABLE; Schema: public; Owner: source_db
 
 CREATE TABLE public.customer_behavior (
@@ -49,10 +53,14 @@ CREATE TABLE public.customer_behavior (
     action_at TIMESTAMPTZ NOT NULL,
 
     PRIMARY KEY (customer_id, product_id, action_at)
-);
+) PARTITION BY RANGE (action_at);
 
 ALTER TABLE public.customer_behavior OWNER TO source_db;
 
+-- The monthly partitions, such as customer_behavior_2025_03, are created by the data generator before inserting.
+
+CREATE INDEX customer_behavior_action_at_brin ON public.customer_behavior USING brin (action_at);
+
 -- Name: transaction; Type: TABLE; Schema: public; Owner: source_db
 
 CREATE TABLE public.transaction (
@@ -68,10 +76,14 @@ CREATE TABLE public.transaction (
 
     PRIMARY KEY (customer_id, product_id, transaction_at)
     
-);
+) PARTITION BY RANGE (transaction_at);
 
 ALTER TABLE public.transaction OWNER TO source_db;
 
+-- The monthly partitions, such as transaction_2025_03, are created by the data generator before inserting.
+
+CREATE INDEX transaction_transaction_at_brin ON public.transaction USING brin (transaction_at);
+
 -- Name: promotion_date; Type: TABLE; Schema: public; Owner: source_db
 
 CREATE TABLE public.promotion_date (
@@ -109,6 +121,8 @@ CREATE TABLE public.promotion (
 
 ALTER TABLE public.promotion OWNER TO source_db;
 
+CREATE INDEX promotion_published_at_idx ON public.promotion (published_at);
+
 INSERT INTO public.promotion (promotion_name, promotion_type, cash_threshold, quantity_threshold, discount_rate, gift, published_at)
 VALUES
     ('滿1000打95折', '滿額折扣', 1000, NULL, 0.05, NULL,'2024-01-01'),
@@ -0,0 +1,341 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The history data backfill test cases.
+"""
+
+
+import os
+import random
+import yaml
+from datetime import date, datetime
+
+import pytest
+
+from company_operation_data_gen import backfill
+from company_operation_data_gen.backfill import activity_backfill, date_range, day_seed
+from company_operation_data_gen.database import ds, SBase
+from company_operation_data_gen.history_customer import history_customer
+from company_operation_data_gen.journal import DAY_SHARD, BackfillJournal
+from company_operation_data_gen.models import (
+    CustomerSource,
+    ProductSource,
+    PromotionDateSource,
+    PromotionSource,
+    CustomerBehaviorSource,
+    TransactionSource,
+)
+from company_operation_data_gen.schemas import (
+    CustomerRecord,
+    ProductRecord,
+    PromotionDateRecord,
+    PromotionRecord,
+)
+
+
+@pytest.fixture
+def setup_test_db():
+    """Sets up the SQLite in memory database for testing."""
+    session = ds.get_db(env="test")
+    SBase.metadata.create_all(session.get_bind())
+
+    current_dir = os.path.dirname(__file__)
+    file_path = os.path.join(current_dir, "fixtures", "test_data.yaml")
+    with open(file_path, "r") as f:
+        data = yaml.safe_load(f)
+
+    for model, schema, key in [
+        (CustomerSource, CustomerRecord, "customers"),
+        (ProductSource, ProductRecord, "products"),
+        (PromotionDateSource, PromotionDateRecord, "promotion_date"),
+        (PromotionSource, PromotionRecord, "promotion"),
+    ]:
+        session.query(model).delete()
+        session.bulk_save_objects(
+            [model(**schema(**record).model_dump()) for record in data[key]]
+        )
+    session.commit()
+
+    yield session
+
+    for model in [
+        CustomerSource,
+        ProductSource,
+        PromotionDateSource,
+        PromotionSource,
+        CustomerBehaviorSource,
+        TransactionSource,
+    ]:
+        session.query(model).delete()
+    session.commit()
+    session.close()
+
+
+def fetch_behaviors(session) -> list:
+    """Returns the inserted customer behaviors in a stable order."""
+    return [
+        (
+            behavior.customer_id,
+            behavior.product_id,
+            behavior.action_type,
+            behavior.action_at,
+        )
+        for behavior in session.query(CustomerBehaviorSource)
+        .order_by(
+            CustomerBehaviorSource.action_at,
+            CustomerBehaviorSource.customer_id,
+            CustomerBehaviorSource.product_id,
+        )
+        .all()
+    ]
+
+
+def test_backfill(setup_test_db):
+    """Test every day of the range is backfilled on its own day, and the seed reproduces the days."""
+    behavior_count, transaction_count = activity_backfill.run(
+        date(2025, 3, 17), date(2025, 3, 18), seed=7, engine="vectorized", env="test"
+    )
+    behaviors = fetch_behaviors(setup_test_db)
+
+    assert behavior_count == len(behaviors) > 0
+    assert transaction_count == setup_test_db.query(TransactionSource).count()
+    views = [behavior for behavior in behaviors if behavior[2] == "view"]
+    assert all(
+        datetime(2025, 3, 17) <= view[3] < datetime(2025, 3, 19) for view in views
+    )
+    assert {view[3].date() for view in views} == {date(2025, 3, 17), date(2025, 3, 18)}
+
+    setup_test_db.query(CustomerBehaviorSource).delete()
+    setup_test_db.query(TransactionSource).delete()
+    setup_test_db.commit()
+    activity_backfill.run(
+        date(2025, 3, 17), date(2025, 3, 18), seed=7, engine="vectorized", env="test"
+    )
+    assert fetch_behaviors(setup_test_db) == behaviors
+
+
+def test_backfill_resume(setup_test_db, tmp_path, monkeypatch):
+    """Test an interrupted backfill continues from its journal, and inserts the same records as an uninterrupted one."""
+    activity_backfill.run(
+        date(2025, 3, 17), date(2025, 3, 18), seed=7, chunk_size=5, env="test"
+    )
+    expected = fetch_behaviors(setup_test_db)
+    setup_test_db.query(CustomerBehaviorSource).delete()
+    setup_test_db.query(TransactionSource).delete()
+    setup_test_db.commit()
+
+    journal = str(tmp_path / "journal.sqlite3")
+    insert_activity_chunk = backfill.insert_activity_chunk
+    calls = []
+
+    def interrupt(db, chunk, **kwargs):
+        calls.append(None)
+        if len(calls) == 3:
+            raise RuntimeError("Interrupted.")
+        return insert_activity_chunk(db, chunk, **kwargs)
+
+    monkeypatch.setattr(backfill, "insert_activity_chunk", interrupt)
+    with pytest.raises(RuntimeError):
+        activity_backfill.run(
+            date(2025, 3, 17),
+            date(2025, 3, 18),
+            seed=7,
+            chunk_size=5,
+            env="test",
+            journal=journal,
+        )
+    monkeypatch.undo()
+
+    activity_backfill.run(
+        date(2025, 3, 17), date(2025, 3, 18), chunk_size=5, env="test", journal=journal
+    )
+    assert fetch_behaviors(setup_test_db) == expected
+    assert activity_backfill.run(
+        date(2025, 3, 17), date(2025, 3, 18), env="test", journal=journal
+    ) == (0, 0)
+    with pytest.raises(ValueError):
+        activity_backfill.run(
+            date(2025, 3, 17), date(2025, 3, 18), seed=8, env="test", journal=journal
+        )
+
+
+def test_backfill_resume_after_commit(setup_test_db, tmp_path, monkeypatch):
+    """Test a chunk committed but not recorded before an interruption is skipped by the rerun instead of failing on its keys."""
+    activity_backfill.run(
+        date(2025, 3, 17), date(2025, 3, 17), seed=7, chunk_size=5, env="test"
+    )
+    expected = fetch_behaviors(setup_test_db)
+    setup_test_db.query(CustomerBehaviorSource).delete()
+    setup_test_db.query(TransactionSource).delete()
+    setup_test_db.commit()
+
+    journal = str(tmp_path / "journal.sqlite3")
+    record = BackfillJournal.record
+    calls = []
+
+    def interrupt(self, day, shard, row_counts, **kwargs):
+        calls.append(shard)
+        if len(calls) == 2:
+            raise RuntimeError("Interrupted after the commit.")
+        return record(self, day, shard, row_counts, **kwargs)
+
+    monkeypatch.setattr(BackfillJournal, "record", interrupt)
+    with pytest.raises(RuntimeError):
+        activity_backfill.run(
+            date(2025, 3, 17),
+            date(2025, 3, 17),
+            seed=7,
+            chunk_size=5,
+            env="test",
+            journal=journal,
+        )
+    monkeypatch.undo()
+    assert len(fetch_behaviors(setup_test_db)) > 0
+
+    activity_backfill.run(
+        date(2025, 3, 17), date(2025, 3, 17), chunk_size=5, env="test", journal=journal
+    )
+    assert fetch_behaviors(setup_test_db) == expected
+    progress = BackfillJournal(journal)
+    assert progress.get_units(CustomerBehaviorSource.__tablename__, date(2025, 3, 17))[
+        DAY_SHARD
+    ].row_count == len(expected)
+    progress.close()
+
+
+def test_history_customer_resume_after_commit(setup_test_db, tmp_path, monkeypatch):
+    """Test a customer day committed but not recorded before an interruption is skipped by the rerun,
+    and the journal records the seed."""
+    registered_days = [datetime(2025, 1, 1), datetime(2025, 1, 2)]
+
+    def fetch_customers():
+        return sorted(
+            (customer.customer_id, customer.customer_name)
+            for customer in setup_test_db.query(CustomerSource).filter(
+                CustomerSource.registered_at.in_(registered_days)
+            )
+        )
+
+    history_customer(5, 15, "2025-01-01", "2025-01-02", seed=7, env="test")
+    expected = fetch_customers()
+    setup_test_db.query(CustomerSource).filter(
+        CustomerSource.registered_at.in_(registered_days)
+    ).delete()
+    setup_test_db.commit()
+
+    journal = BackfillJournal(str(tmp_path / "journal.sqlite3"))
+    record = BackfillJournal.record
+
+    def interrupt(self, day, shard, row_counts, **kwargs):
+        if day == date(2025, 1, 2):
+            raise RuntimeError("Interrupted after the commit.")
+        return record(self, day, shard, row_counts, **kwargs)
+
+    monkeypatch.setattr(BackfillJournal, "record", interrupt)
+    with pytest.raises(RuntimeError):
+        history_customer(
+            5, 15, "2025-01-01", "2025-01-02", journal=journal, seed=7, env="test"
+        )
+    monkeypatch.undo()
+    assert fetch_customers() == expected
+
+    history_customer(5, 15, "2025-01-01", "2025-01-02", journal=journal, env="test")
+    assert fetch_customers() == expected
+    units = journal.get_units(CustomerSource.__tablename__, date(2025, 1, 2))
+    assert units[DAY_SHARD].seed == 7
+    assert (
+        units[DAY_SHARD].row_count
+        == setup_test_db.query(CustomerSource)
+        .filter(CustomerSource.registered_at == registered_days[1])
+        .count()
+    )
+    journal.close()
+
+
+@pytest.mark.parametrize("engine", ["vectorized", "loop"])
+def test_backfill_sessions_closed(setup_test_db, monkeypatch, engine):
+    """Test the backfill closes every session it opens, so that no pooled connection is left checked out."""
+    get_db = ds.get_db
+    sessions = []
+    closed = []
+
+    def record_db(*args, **kwargs):
+        session = get_db(*args, **kwargs)
+        close = session.close
+
+        def record_close():
+            closed.append(session)
+            close()
+
+        session.close = record_close
+        sessions.append(session)
+        return session
+
+    monkeypatch.setattr(ds, "get_db", record_db)
+    activity_backfill.run(
+        date(2025, 3, 17),
+        date(2025, 3, 18),
+        seed=7,
+        engine=engine,
+        chunk_size=5,
+        env="test",
+    )
+
+    assert sessions
+    assert all(session in closed for session in sessions)
+
+
+def test_backfill_loop_seed(setup_test_db):
+    """Test the loop engine reproduces a day from the seed without touching the global 'random' state."""
+    results = []
+    for _ in range(2):
+        random.seed(1)
+        state = random.getstate()
+        activity_backfill.run(
+            date(2025, 3, 17), date(2025, 3, 17), seed=7, engine="loop", env="test"
+        )
+        assert random.getstate() == state
+        results.append(fetch_behaviors(setup_test_db))
+        setup_test_db.query(CustomerBehaviorSource).delete()
+        setup_test_db.query(TransactionSource).delete()
+        setup_test_db.commit()
+
+    assert results[0] == results[1]
+    assert len(results[0]) > 0
+
+
+def test_backfill_before_registration(setup_test_db):
+    """Test the days before any customer registered are skipped."""
+    assert activity_backfill.run(
+        date(2024, 11, 11), date(2024, 11, 11), seed=7, env="test"
+    ) == (0, 0)
+
+
+def test_backfill_before_promotion(setup_test_db):
+    """Test the days before any promotion was published are skipped instead of getting a later promotion."""
+    setup_test_db.query(CustomerSource).update(
+        {CustomerSource.registered_at: datetime(2024, 1, 1)}
+    )
+    setup_test_db.commit()
+
+    assert activity_backfill.run(
+        date(2024, 11, 4), date(2024, 11, 4), seed=7, env="test"
+    ) == (0, 0)
+    assert setup_test_db.query(CustomerBehaviorSource).count() == 0
+    assert activity_backfill.run(
+        date(2024, 11, 18), date(2024, 11, 18), seed=7, env="test"
+    ) != (0, 0)
+
+
+def test_date_range():
+    """Test the range includes both ends, and the day seeds differ by day but not by run."""
+    days = date_range(date(2025, 3, 17), date(2025, 3, 19))
+
+    assert days == [date(2025, 3, 17), date(2025, 3, 18), date(2025, 3, 19)]
+    assert len({day_seed(7, day) for day in days}) == 3
+    assert day_seed(7, days[0]) == day_seed(7, date(2025, 3, 17))
+    with pytest.raises(ValueError):
+        date_range(date(2025, 3, 19), date(2025, 3, 17))
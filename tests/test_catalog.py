@@ -0,0 +1,137 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The in-memory catalog test cases.
+"""
+
+
+import os
+import yaml
+from datetime import datetime
+
+import pytest
+
+from company_operation_data_gen.catalog import (
+    load_product_catalog,
+    load_customer_ids,
+    load_customer_snapshots,
+)
+from company_operation_data_gen.database import ds, SBase
+from company_operation_data_gen.models import ProductSource, CustomerSource
+from company_operation_data_gen.schemas import (
+    CustomerRecord,
+    CustomerData,
+    ProductRecord,
+    ProductData,
+)
+
+
+@pytest.fixture
+def setup_test_db():
+    """Sets up the SQLite in memory database for testing."""
+    session = ds.get_db(env="test")
+    SBase.metadata.create_all(session.get_bind())
+    session.query(CustomerSource).delete()
+    session.query(ProductSource).delete()
+
+    current_dir = os.path.dirname(__file__)
+    file_path = os.path.join(current_dir, "fixtures", "test_data.yaml")
+    with open(file_path, "r") as f:
+        data = yaml.safe_load(f)
+
+    customers = CustomerData(
+        root=[CustomerRecord(**record) for record in data["customers"]]
+    )
+    orm_customer = [CustomerSource(**record.model_dump()) for record in customers.root]
+    session.bulk_save_objects(orm_customer)
+
+    products = ProductData(
+        root=[ProductRecord(**record) for record in data["products"]]
+    )
+    orm_product = [ProductSource(**record.model_dump()) for record in products.root]
+    session.bulk_save_objects(orm_product)
+    session.commit()
+
+    yield session
+
+    session.query(CustomerSource).delete()
+    session.query(ProductSource).delete()
+    session.commit()
+    session.close()
+
+
+def test_product_catalog(setup_test_db):
+    """Test the catalog groups the products by category and samples from the category."""
+    catalog = load_product_catalog(setup_test_db)
+
+    assert len(catalog) == 8
+    assert set(catalog.categories) == {
+        "零食",
+        "潔牙骨",
+        "保健食品",
+        "清潔用品",
+        "凍乾",
+        "尿布墊",
+        "狗飼料",
+        "狗罐頭",
+    }
+    for _ in range(10):
+        product = catalog.sample("狗飼料")
+        assert product.product_id == "p007"
+        assert product.promotion_price == 1199
+
+
+def test_available_probabilities(setup_test_db):
+    """Test the categories without products are excluded from the probabilities."""
+    catalog = load_product_catalog(setup_test_db)
+
+    probabilities = catalog.available_probabilities(
+        {"潔牙骨": 0.3, "寵物零食": 0.3, "狗飼料": 0.4}
+    )
+    assert probabilities == {"潔牙骨": 0.3, "狗飼料": 0.4}
+
+    with pytest.raises(ValueError):
+        catalog.available_probabilities({"寵物零食": 1.0})
+
+
+def test_load_customer_ids(setup_test_db):
+    """Test only the customer IDs are loaded, across several partitions."""
+    customer_ids = load_customer_ids(setup_test_db, yield_per=1)
+
+    assert customer_ids.tolist() == ["a001", "a002"]
+
+
+def test_customer_snapshots(setup_test_db):
+    """Test the customers of a point in time are those registered before it, in registration order."""
+    customer = setup_test_db.get(CustomerSource, "a001")
+    setup_test_db.add(
+        CustomerSource(
+            customer_id="a000",
+            customer_name=customer.customer_name,
+            gender=customer.gender,
+            birth=customer.birth,
+            email=customer.email,
+            phone_number=customer.phone_number,
+            city=customer.city,
+            registered_at=datetime(2025, 3, 17, 8),
+        )
+    )
+    setup_test_db.commit()
+
+    customers = load_customer_snapshots(setup_test_db, yield_per=1)
+
+    assert len(customers) == 3
+    assert customers.customer_id.tolist() == ["a001", "a002", "a000"]
+    assert customers.registered_before(datetime(2024, 11, 15)).tolist() == []
+    assert customers.registered_before(datetime(2025, 3, 17, 8)).tolist() == [
+        "a001",
+        "a002",
+    ]
+    assert customers.registered_before(datetime(2025, 3, 18)).tolist() == [
+        "a001",
+        "a002",
+        "a000",
+    ]
@@ -11,27 +11,29 @@ The customer data test cases.
 import datetime
 
 from company_operation_data_gen.customer import customer_gen
+from company_operation_data_gen.batch import concat_batches
 from company_operation_data_gen.schemas import CustomerData
-from company_operation_data_gen.constants import CustomerCountConstants
+from company_operation_data_gen.profile import get_profile
 
 
 def test_customer_count():
     """Test generating a random number of customer data."""
+    profile = get_profile()
     for _ in range(10):
         data = customer_gen.gen_new_customer(
-            min=CustomerCountConstants.CUSTOMER_COUNT_MIN,
-            max=CustomerCountConstants.CUSTOMER_COUNT_MAX,
+            min=profile.customer_count_min,
+            max=profile.customer_count_max,
         )
         assert isinstance(data, CustomerData)
-        assert len(data.root) >= CustomerCountConstants.CUSTOMER_COUNT_MIN
-        assert len(data.root) <= CustomerCountConstants.CUSTOMER_COUNT_MAX
+        assert len(data.root) >= profile.customer_count_min
+        assert len(data.root) <= profile.customer_count_max
 
 
 def test_customer_data_content():
     """Test customer data content."""
     data = customer_gen.gen_new_customer(
-        min=CustomerCountConstants.CUSTOMER_COUNT_MIN,
-        max=CustomerCountConstants.CUSTOMER_COUNT_MAX,
+        min=get_profile().customer_count_min,
+        max=get_profile().customer_count_max,
     )
     customer = data.root[0]
     assert isinstance(customer.customer_name, str)
@@ -40,3 +42,31 @@ def test_customer_data_content():
     assert "@" in customer.email
     assert "縣" or "市" in customer.city
     assert isinstance(customer.registered_at, datetime.date)
+
+
+def test_customer_chunks():
+    """Test the customers are generated in chunks, and the seed reproduces them across workers."""
+    registered_at = datetime.datetime(2025, 3, 17)
+    chunks = list(
+        customer_gen.iter_generate(
+            25, chunk_size=10, workers=1, seed=7, registered_at=registered_at
+        )
+    )
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+
+    parallel = concat_batches(
+        list(
+            customer_gen.iter_generate(
+                25, chunk_size=10, workers=2, seed=7, registered_at=registered_at
+            )
+        )
+    )
+    single = concat_batches(chunks)
+    for field in ["customer_name", "gender", "birth", "email", "phone_number"]:
+        assert single.columns[field].tolist() == parallel.columns[field].tolist()
+    assert len(set(single.columns["customer_id"].tolist())) == 25
+    assert (
+        single.columns["customer_id"].tolist()
+        == parallel.columns["customer_id"].tolist()
+    )
+    assert set(single.columns["registered_at"].tolist()) == {registered_at}
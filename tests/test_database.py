@@ -0,0 +1,77 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The database connection test cases.
+"""
+
+
+from datetime import datetime
+
+import pytest
+
+from company_operation_data_gen import database
+from company_operation_data_gen.config import Settings
+from company_operation_data_gen.database import DataSource, SBase, ds, engine_options
+from company_operation_data_gen.models import PromotionDateSource
+
+
+def test_engine_options():
+    """Test the pool settings only apply to the server databases, and the timeout only to PostgreSQL."""
+    settings = Settings(
+        SQLALCHEMY_SOURCE_DATABASE_URL="sqlite://",
+        SQLALCHEMY_TEST_DATABASE_URL="sqlite://",
+        SQLALCHEMY_POOL_SIZE=8,
+        SQLALCHEMY_STATEMENT_TIMEOUT=60_000,
+        SQLALCHEMY_INSERTMANYVALUES_PAGE_SIZE=5_000,
+    )
+
+    assert engine_options("sqlite:///:memory:", settings) == {
+        "pool_pre_ping": True,
+        "insertmanyvalues_page_size": 5_000,
+    }
+    options = engine_options("postgresql+psycopg2://user@localhost/db", settings)
+    assert options["pool_size"] == 8
+    assert options["max_overflow"] == 10
+    assert options["executemany_mode"] == "values_only"
+    assert options["connect_args"] == {"options": "-c statement_timeout=60000"}
+    assert "connect_args" not in engine_options(
+        "mysql+pymysql://user@localhost/db", settings
+    )
+
+
+def test_session_scope():
+    """Test the scope commits when the block succeeds, and rolls back when it raises."""
+    with ds.session_scope(env="test") as db:
+        SBase.metadata.create_all(db.bind)
+        db.query(PromotionDateSource).delete()
+        db.add(
+            PromotionDateSource(
+                day_of_week=0,
+                promotion_type="滿額折扣",
+                published_at=datetime(2025, 3, 17),
+            )
+        )
+
+    with pytest.raises(RuntimeError):
+        with ds.session_scope(env="test") as db:
+            db.query(PromotionDateSource).delete()
+            raise RuntimeError("Rolled back.")
+
+    with ds.session_scope(env="test") as db:
+        assert db.query(PromotionDateSource).count() == 1
+        db.query(PromotionDateSource).delete()
+
+
+def test_engine_after_fork(monkeypatch):
+    """Test a process other than the creator gets a new engine."""
+    data_source = DataSource()
+    engine = data_source.get_db(env="test").get_bind()
+    assert data_source.get_db(env="test").get_bind() is engine
+
+    monkeypatch.setattr(database.os, "getpid", lambda: -1)
+    child_engine = data_source.get_db(env="test").get_bind()
+    assert child_engine is not engine
+    assert data_source.get_db(env="test").get_bind() is child_engine
@@ -0,0 +1,297 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The vectorized customer activity data test cases.
+"""
+
+
+import os
+import yaml
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from company_operation_data_gen.engine import vectorized_activity_gen
+from company_operation_data_gen.batch import ActivityBatch, concat_batches, split_chunks
+from company_operation_data_gen.database import ds, SBase
+from company_operation_data_gen.models import ProductSource, CustomerSource
+from company_operation_data_gen.schemas import (
+    CustomerRecord,
+    CustomerData,
+    ProductRecord,
+    ProductData,
+    CustomerBehaviorRecord,
+    TransactionRecord,
+    PromotionConstants,
+    PromotionData,
+    PromotionRecord,
+)
+from company_operation_data_gen.constants import (
+    BehaviorCountConstants,
+    QuantityCountConstants,
+)
+
+
+current_dir = os.path.dirname(__file__)
+file_path = os.path.join(current_dir, "fixtures", "test_data.yaml")
+with open(file_path, "r") as f:
+    data = yaml.safe_load(f)
+
+test_promotion_type = "多件優惠"
+
+promotion_detail = PromotionData(
+    root=[
+        PromotionRecord(**record)
+        for record in data["promotion"]
+        if record["promotion_type"] == test_promotion_type
+    ]
+)
+
+promotion_constants = PromotionConstants(
+    promotion_type=test_promotion_type,
+    promotion_detail=promotion_detail,
+    behavior_avg=BehaviorCountConstants.MULTI_BEHAVIOR_AVG,
+    behavior_sigma=BehaviorCountConstants.MULTI_BEHAVIOR_SIGMA,
+    behavior_min=BehaviorCountConstants.MULTI_BEHAVIOR_MIN,
+    behavior_max=BehaviorCountConstants.MULTI_BEHAVIOR_MAX,
+    quantity_avg=QuantityCountConstants.MULTI_QUANTITY_AVG,
+    quantity_sigma=QuantityCountConstants.MULTI_QUANTITY_SIGMA,
+    quantity_min=QuantityCountConstants.MULTI_QUANTITY_MIN,
+    quantity_max=QuantityCountConstants.MULTI_QUANTITY_MAX,
+)
+
+
+@pytest.fixture
+def setup_test_db():
+    """Sets up the SQLite in memory database for testing."""
+    session = ds.get_db(env="test")
+    SBase.metadata.create_all(session.get_bind())
+    session.query(CustomerSource).delete()
+    session.query(ProductSource).delete()
+
+    customers = CustomerData(
+        root=[CustomerRecord(**record) for record in data["customers"]]
+    )
+    orm_customer = [CustomerSource(**record.model_dump()) for record in customers.root]
+    session.bulk_save_objects(orm_customer)
+
+    products = ProductData(
+        root=[ProductRecord(**record) for record in data["products"]]
+    )
+    orm_product = [ProductSource(**record.model_dump()) for record in products.root]
+    session.bulk_save_objects(orm_product)
+    session.commit()
+
+    yield session
+
+    session.query(CustomerSource).delete()
+    session.query(ProductSource).delete()
+    session.commit()
+    session.close()
+
+
+def test_vectorized_generate(setup_test_db):
+    """Test the vectorized funnel matches the schemas, keeps the counts, the order of behaviors and the discount."""
+    day = datetime(2025, 3, 17)
+    activity = vectorized_activity_gen.generate(
+        promotion_constants=promotion_constants,
+        session=setup_test_db,
+        rng=np.random.default_rng(7),
+        day=day,
+    )
+    behavior = [
+        CustomerBehaviorRecord(**record)
+        for record in activity.customer_behavior.to_records()
+    ]
+    transaction = [
+        TransactionRecord(**record) for record in activity.transaction.to_records()
+    ]
+
+    views = [record for record in behavior if record.action_type == "view"]
+    carts = [record for record in behavior if record.action_type == "add_to_cart"]
+    purchases = [record for record in behavior if record.action_type == "purchase"]
+    assert promotion_constants.behavior_min <= len(views)
+    assert len(views) <= promotion_constants.behavior_max
+    assert len(purchases) <= len(carts) <= len(views)
+    assert len(transaction) == len(purchases)
+
+    for record in views:
+        assert day <= record.action_at < day + timedelta(days=1)
+
+    for record in transaction:
+        related = [
+            behavior_record
+            for behavior_record in behavior
+            if behavior_record.customer_id == record.customer_id
+            and behavior_record.product_id == record.product_id
+            and behavior_record.action_at <= record.transaction_at
+        ]
+        assert {"view", "add_to_cart", "purchase"} <= {
+            behavior_record.action_type for behavior_record in related
+        }
+
+        assert (
+            promotion_constants.quantity_min
+            <= record.quantity
+            <= promotion_constants.quantity_max
+        )
+        applied = [
+            promo
+            for promo in promotion_detail.root
+            if record.quantity >= promo.quantity_threshold
+        ]
+        if applied:
+            best = max(applied, key=lambda promo: promo.quantity_threshold)
+            assert record.discount == int(round(record.amount * best.discount_rate))
+        else:
+            assert record.discount == 0
+        assert record.total == record.amount - record.discount
+
+
+def test_vectorized_generate_seed(setup_test_db):
+    """Test the same seed generates the same data."""
+    day = datetime(2025, 3, 17)
+    first = vectorized_activity_gen.generate(
+        promotion_constants,
+        session=setup_test_db,
+        rng=np.random.default_rng(1),
+        day=day,
+    )
+    second = vectorized_activity_gen.generate(
+        promotion_constants,
+        session=setup_test_db,
+        rng=np.random.default_rng(1),
+        day=day,
+    )
+    for field in first.customer_behavior.fields:
+        assert np.array_equal(
+            first.customer_behavior.columns[field],
+            second.customer_behavior.columns[field],
+        )
+    for field in first.transaction.fields:
+        assert np.array_equal(
+            first.transaction.columns[field], second.transaction.columns[field]
+        )
+
+
+def test_split_chunks():
+    """Test the total count is split into chunks no larger than the chunk size."""
+    assert split_chunks(10, None) == [10]
+    assert split_chunks(0, 4) == [0]
+    assert split_chunks(10, 4) == [4, 4, 2]
+    assert split_chunks(8, 4) == [4, 4]
+
+
+def test_vectorized_iter_generate(setup_test_db):
+    """Test the chunks together keep the view count within the specified range, and are drawn in time order."""
+    chunks = list(
+        vectorized_activity_gen.iter_generate(
+            promotion_constants,
+            chunk_size=7,
+            session=setup_test_db,
+            rng=np.random.default_rng(3),
+        )
+    )
+    view_counts = [
+        int(np.count_nonzero(chunk.customer_behavior.columns["action_type"] == "view"))
+        for chunk in chunks
+    ]
+    assert len(chunks) > 1
+    assert all(count <= 7 for count in view_counts)
+    for chunk in chunks:
+        assert np.all(np.diff(chunk.customer_behavior.columns["action_at"]) >= 0)
+        assert np.all(np.diff(chunk.transaction.columns["transaction_at"]) >= 0)
+    views = [
+        chunk.customer_behavior.columns["action_at"][
+            chunk.customer_behavior.columns["action_type"] == "view"
+        ]
+        for chunk in chunks
+    ]
+    assert all(
+        earlier.max() <= later.min()
+        for earlier, later in zip(views, views[1:])
+        if len(earlier) and len(later)
+    )
+    assert (
+        promotion_constants.behavior_min
+        <= sum(view_counts)
+        <= promotion_constants.behavior_max
+    )
+
+
+def test_vectorized_seed_workers(setup_test_db):
+    """Test the shards generate the same data for a seed regardless of the number of workers."""
+    day = datetime(2025, 3, 17)
+    results = []
+    for workers in [1, 2]:
+        chunks = list(
+            vectorized_activity_gen.iter_generate(
+                promotion_constants,
+                chunk_size=5,
+                session=setup_test_db,
+                day=day,
+                seed=2025,
+                workers=workers,
+            )
+        )
+        results.append(chunks)
+
+    assert len(results[0]) == len(results[1]) > 1
+    for first, second in zip(*results):
+        for field in first.customer_behavior.fields:
+            assert np.array_equal(
+                first.customer_behavior.columns[field],
+                second.customer_behavior.columns[field],
+            )
+        for field in first.transaction.fields:
+            assert np.array_equal(
+                first.transaction.columns[field], second.transaction.columns[field]
+            )
+
+
+def test_vectorized_seed_chunk_size(setup_test_db):
+    """Test the same seed generates the same records in time order regardless of the chunk size."""
+    day = datetime(2025, 3, 17)
+    results = []
+    for chunk_size in [None, 5, 7]:
+        chunks = list(
+            vectorized_activity_gen.iter_generate(
+                promotion_constants,
+                chunk_size=chunk_size,
+                session=setup_test_db,
+                day=day,
+                seed=2025,
+            )
+        )
+        view_counts = [
+            int(
+                np.count_nonzero(
+                    chunk.customer_behavior.columns["action_type"] == "view"
+                )
+            )
+            for chunk in chunks
+        ]
+        assert all(count <= (chunk_size or sum(view_counts)) for count in view_counts)
+        results.append(
+            ActivityBatch(
+                customer_behavior=concat_batches(
+                    [chunk.customer_behavior for chunk in chunks]
+                ),
+                transaction=concat_batches([chunk.transaction for chunk in chunks]),
+            )
+        )
+
+    for batch in results[1:]:
+        for field in batch.customer_behavior.fields:
+            assert np.array_equal(
+                batch.customer_behavior.columns[field],
+                results[0].customer_behavior.columns[field],
+            )
+        for field in batch.transaction.fields:
+            assert np.array_equal(
+                batch.transaction.columns[field], results[0].transaction.columns[field]
+            )
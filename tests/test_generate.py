@@ -8,21 +8,33 @@ The data generation test cases.
 """
 
 
+import os
+import yaml
+
 import pytest
 
-from company_operation_data_gen.database import ds
-from company_operation_data_gen.constants import CustomerCountConstants
+from company_operation_data_gen.database import ds, SBase
 from company_operation_data_gen.models import (
     ProductSource,
     CustomerSource,
     CustomerBehaviorSource,
     TransactionSource,
+    PromotionDateSource,
+    PromotionSource,
+)
+from company_operation_data_gen.schemas import (
+    CustomerRecord,
+    ProductRecord,
+    PromotionDateRecord,
+    PromotionRecord,
 )
 from company_operation_data_gen.generate import (
     init_customer,
     weekly_scrape_product,
     daily_behavior_transaction,
+    daily_register_customer,
 )
+from company_operation_data_gen.profile import get_profile, set_profile
 
 
 @pytest.fixture
@@ -41,7 +53,13 @@ def setup_test_db():
 def test_init_customer(setup_test_db):
     init_customer(env="test")
     count_customer = setup_test_db.query(CustomerSource).all()
-    assert len(count_customer) == CustomerCountConstants.CUSTOMER_COUNT_INIT
+    assert len(count_customer) == get_profile().customer_count_init
+
+
+def test_init_customer_chunks(setup_test_db):
+    init_customer(env="test", count=25, chunk_size=10, seed=7)
+    count_customer = setup_test_db.query(CustomerSource).all()
+    assert len(count_customer) == 25
 
 
 def test_weekly_product(setup_test_db):
@@ -50,9 +68,81 @@ def test_weekly_product(setup_test_db):
     assert len(count_product) > 0
 
 
-def test_daily_behavior_transaction(setup_test_db):
+@pytest.fixture
+def setup_activity_db(setup_test_db):
+    """Sets up the customers, the products and a promotion of every weekday in the test database."""
+    session = setup_test_db
+    SBase.metadata.create_all(session.get_bind())
+
+    current_dir = os.path.dirname(__file__)
+    file_path = os.path.join(current_dir, "fixtures", "test_data.yaml")
+    with open(file_path, "r") as f:
+        data = yaml.safe_load(f)
+
+    promotion_types = [record["promotion_type"] for record in data["promotion_date"]]
+    promotion_date = [
+        PromotionDateRecord(
+            day_of_week=day_of_week,
+            promotion_type=promotion_types[day_of_week % len(promotion_types)],
+            published_at=data["promotion_date"][0]["published_at"],
+        )
+        for day_of_week in range(7)
+    ]
+    for model, records in [
+        (CustomerSource, [CustomerRecord(**record) for record in data["customers"]]),
+        (ProductSource, [ProductRecord(**record) for record in data["products"]]),
+        (PromotionDateSource, promotion_date),
+        (PromotionSource, [PromotionRecord(**record) for record in data["promotion"]]),
+    ]:
+        session.query(model).delete()
+        session.bulk_save_objects([model(**record.model_dump()) for record in records])
+    session.commit()
+
+    yield session
+
+    for model in [
+        PromotionDateSource,
+        PromotionSource,
+        CustomerBehaviorSource,
+        TransactionSource,
+    ]:
+        session.query(model).delete()
+    session.commit()
+
+
+def test_daily_behavior_transaction(setup_activity_db):
+    """Test the promotions, the catalog and the customers are read from the database of the environment."""
     daily_behavior_transaction(env="test")
-    count_behavior = setup_test_db.query(CustomerBehaviorSource).all()
-    count_transaction = setup_test_db.query(TransactionSource).all()
+    count_behavior = setup_activity_db.query(CustomerBehaviorSource).all()
+    count_transaction = setup_activity_db.query(TransactionSource).all()
     assert len(count_behavior) > 0
     assert len(count_transaction) > 0
+
+
+def test_daily_rerun(setup_activity_db):
+    """Test a rerun of the day with the same seed skips every record instead of inserting another day,
+    even with another chunk size."""
+    profile = get_profile()
+    set_profile(profile.model_copy(update={"on_conflict": "nothing"}))
+    counts = []
+    try:
+        for chunk_size in [None, 7]:
+            daily_register_customer(env="test", seed=7)
+            daily_behavior_transaction(
+                env="test", engine="vectorized", chunk_size=chunk_size, seed=7
+            )
+            counts.append(
+                [
+                    setup_activity_db.query(model).count()
+                    for model in [
+                        CustomerSource,
+                        CustomerBehaviorSource,
+                        TransactionSource,
+                    ]
+                ]
+            )
+    finally:
+        set_profile(profile)
+
+    assert counts[0] == counts[1]
+    assert counts[0][1] > 0
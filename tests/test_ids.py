@@ -0,0 +1,49 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The ID allocator test cases.
+"""
+
+
+import uuid
+
+import pytest
+
+from company_operation_data_gen.ids import id_allocator
+
+
+def test_random_ids():
+    """Test the random IDs are distinct version 4 UUID strings."""
+    ids = id_allocator.allocate(10_000).tolist()
+
+    assert len(set(ids)) == 10_000
+    for value in ids[:100]:
+        assert str(uuid.UUID(value)) == value
+        assert uuid.UUID(value).version == 4
+    assert len(id_allocator.allocate(0)) == 0
+
+
+def test_seeded_ids():
+    """Test the seeded IDs are reproducible, and never collide across shards and counters."""
+    first = id_allocator.allocate(1_000, seed=7, shard=0).tolist()
+    assert first == id_allocator.allocate(1_000, seed=7, shard=0).tolist()
+    assert (
+        first[500:] == id_allocator.allocate(500, seed=7, shard=0, start=500).tolist()
+    )
+
+    ids = set(first)
+    for shard in range(1, 5):
+        ids.update(id_allocator.allocate(1_000, seed=7, shard=shard).tolist())
+    ids.update(id_allocator.allocate(1_000, seed=8, shard=0).tolist())
+    assert len(ids) == 6_000
+
+    for value in first[:100]:
+        assert str(uuid.UUID(value)) == value
+        assert uuid.UUID(value).version == 8
+        assert uuid.UUID(value).variant == uuid.RFC_4122
+
+    with pytest.raises(ValueError):
+        id_allocator.allocate(1, seed=7, shard=2**14)
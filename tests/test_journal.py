@@ -0,0 +1,69 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The backfill progress journal test cases.
+"""
+
+
+from datetime import date
+
+import pytest
+
+from company_operation_data_gen.journal import DAY_SHARD, BackfillJournal
+
+
+def test_journal(tmp_path):
+    """Test the recorded units are kept in the file, and a day is finished once its day unit is recorded."""
+    path = str(tmp_path / "journal.sqlite3")
+    journal = BackfillJournal(path)
+    day = date(2025, 3, 17)
+    seed = 2**100
+    journal.record(
+        day, 0, {"customer_behavior": 5, "transaction": 1}, seed=seed, chunk_size=5
+    )
+    journal.record(
+        day, 1, {"customer_behavior": 3, "transaction": 0}, seed=seed, chunk_size=5
+    )
+    journal.close()
+
+    journal = BackfillJournal(path)
+    units = journal.get_units("customer_behavior", day)
+    assert sorted(units) == [0, 1]
+    assert units[0].row_count == 5
+    assert units[1].seed == seed
+    assert units[1].chunk_size == 5
+    assert not journal.is_finished("customer_behavior", day)
+    assert journal.get_units("customer_behavior", date(2025, 3, 18)) == {}
+
+    journal.record(day, DAY_SHARD, {"customer_behavior": 8}, seed=seed, chunk_size=5)
+    assert journal.is_finished("customer_behavior", day)
+    assert not journal.is_finished("transaction", day)
+
+
+def test_journal_seed(tmp_path):
+    """Test the recorded seed is returned for the days, and different seeds are refused."""
+    journal = BackfillJournal(str(tmp_path / "journal.sqlite3"))
+    assert (
+        journal.get_seed(["customer_behavior"], date(2025, 3, 1), date(2025, 3, 31))
+        is None
+    )
+
+    journal.record(date(2025, 3, 17), 0, {"customer_behavior": 5}, seed=7)
+    assert (
+        journal.get_seed(["customer_behavior"], date(2025, 3, 1), date(2025, 3, 31))
+        == 7
+    )
+    assert (
+        journal.get_seed(["transaction"], date(2025, 3, 1), date(2025, 3, 31)) is None
+    )
+
+    journal.record(date(2025, 3, 18), 0, {"customer_behavior": 5}, seed=8)
+    assert (
+        journal.get_seed(["customer_behavior"], date(2025, 3, 1), date(2025, 3, 17))
+        == 7
+    )
+    with pytest.raises(ValueError):
+        journal.get_seed(["customer_behavior"], date(2025, 3, 1), date(2025, 3, 31))
@@ -0,0 +1,196 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The bulk table loader test cases.
+"""
+
+
+import csv
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+import sqlalchemy as sa
+
+from company_operation_data_gen.batch import RecordBatch
+from company_operation_data_gen.database import ds, SBase
+from company_operation_data_gen.generate import insert_table
+from company_operation_data_gen.loader import (
+    copy_csv,
+    format_csv,
+    iter_batches,
+    load_table,
+    supports_copy,
+)
+from company_operation_data_gen.models import TransactionSource
+from company_operation_data_gen.schemas import TransactionRecord
+
+
+def make_transactions() -> RecordBatch:
+    """Returns two transactions, one of them without a gift."""
+    return RecordBatch(
+        schema=TransactionRecord,
+        columns={
+            "customer_id": np.array(["a001", "a002"], dtype=object),
+            "product_id": np.array(["p001", "p002"], dtype=object),
+            "quantity": np.array([1, 2]),
+            "promotion_price": np.array([100, 250]),
+            "amount": np.array([100, 500]),
+            "discount": np.array([0, 50]),
+            "gift": np.array([None, '毛毯 "大"'], dtype=object),
+            "total": np.array([100, 450]),
+            "transaction_at": np.array(
+                ["2025-03-17T08:00:00.5", "2025-03-17T09:30:00"],
+                dtype="datetime64[us]",
+            ),
+        },
+    )
+
+
+def test_format_csv():
+    """Test the NULLs are unquoted empty fields, the strings are quoted, and the times are ISO formatted."""
+    buffer = format_csv(
+        [
+            np.array([1, 2]),
+            ["", None],
+            np.array(["2025-03-17T08:00", "NaT"], dtype="datetime64[us]"),
+            [date(2025, 3, 17), datetime(2025, 3, 17, 8, 30)],
+            np.array(['a,"b"\nc', None], dtype=object),
+            np.array([True, False]),
+        ]
+    )
+    text = buffer.getvalue()
+
+    assert text.splitlines()[0] == '1,"",2025-03-17T08:00:00.000000,2025-03-17,"a,""b""'
+    assert list(csv.reader(buffer)) == [
+        ["1", "", "2025-03-17T08:00:00.000000", "2025-03-17", 'a,"b"\nc', "t"],
+        ["2", "", "", "2025-03-17T08:30:00", "", "f"],
+    ]
+    assert text.endswith(",,,2025-03-17T08:30:00,,f\n")
+
+
+def test_load_table_executemany():
+    """Test the databases without COPY fall back to executemany, in the transaction of the session."""
+    session = ds.get_db(env="test")
+    SBase.metadata.create_all(session.get_bind())
+    session.query(TransactionSource).delete()
+
+    assert not supports_copy(session)
+    assert load_table(session, TransactionSource.__table__, make_transactions()) == 2
+    session.commit()
+
+    rows = session.query(TransactionSource).order_by(TransactionSource.customer_id)
+    assert [(row.gift, row.total) for row in rows] == [
+        (None, 100),
+        ('毛毯 "大"', 450),
+    ]
+    with pytest.raises(ValueError):
+        load_table(session, TransactionSource.__table__, make_transactions(), "bulk")
+
+    session.query(TransactionSource).delete()
+    session.commit()
+    session.close()
+
+
+def test_iter_batches():
+    """Test the batches are slices of the record batch, and the lazy records are consumed one batch at a time."""
+    transactions = make_transactions()
+    batches = list(iter_batches(transactions, 1))
+    assert [batch.columns["customer_id"].tolist() for batch in batches] == [
+        ["a001"],
+        ["a002"],
+    ]
+
+    consumed = []
+
+    def records():
+        for record in transactions.to_records():
+            consumed.append(record["customer_id"])
+            yield TransactionRecord(**record)
+
+    batches = iter_batches(records(), 1)
+    assert [record.customer_id for record in next(batches)] == ["a001"]
+    assert consumed == ["a001"]
+    assert [record.customer_id for record in next(batches)] == ["a002"]
+    assert list(batches) == []
+
+
+def test_insert_table_batches():
+    """Test the lazy records are inserted in batches of the batch size."""
+    session = ds.get_db(env="test")
+    SBase.metadata.create_all(session.get_bind())
+    session.query(TransactionSource).delete()
+    session.commit()
+
+    records = (
+        TransactionRecord(**record) for record in make_transactions().to_records()
+    )
+    assert insert_table(session, TransactionSource, records, batch_size=1) == 2
+    assert insert_table(session, TransactionSource, [], batch_size=1) == 0
+    assert session.query(TransactionSource).count() == 2
+
+    session.query(TransactionSource).delete()
+    session.commit()
+    session.close()
+
+
+class FakeCursor:
+    """Records the COPY statements instead of sending them."""
+
+    def __init__(self):
+        self.copies = []
+
+    def copy_expert(self, statement, buffer):
+        self.copies.append((statement, buffer.read()))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+class FakeSession:
+    """A session of a PostgreSQL engine which never connects."""
+
+    def __init__(self):
+        self.engine = sa.create_engine("postgresql+psycopg2://user@localhost/db")
+        self.cursor = FakeCursor()
+
+    def get_bind(self):
+        return self.engine
+
+    def connection(self):
+        session = self
+
+        class Connection:
+            class connection:
+                @staticmethod
+                def cursor():
+                    return session.cursor
+
+        return Connection()
+
+
+def test_load_table_copy():
+    """Test PostgreSQL uses COPY with the table and column names quoted as needed, and the CSV rows."""
+    session = FakeSession()
+
+    assert supports_copy(session)
+    assert load_table(session, TransactionSource.__table__, make_transactions()) == 2
+    statement, text = session.cursor.copies[0]
+    assert statement.startswith("COPY transaction (customer_id, product_id, ")
+    assert statement.endswith("transaction_at) FROM STDIN WITH (FORMAT csv)")
+    assert text.splitlines() == [
+        '"a001","p001",1,100,100,0,,100,2025-03-17T08:00:00.500000',
+        '"a002","p002",2,250,500,50,"毛毯 ""大""",450,2025-03-17T09:30:00.000000',
+    ]
+
+    copy_csv(session, TransactionSource.__table__, ["gift"], format_csv([[None]]))
+    assert session.cursor.copies[1] == (
+        "COPY transaction (gift) FROM STDIN WITH (FORMAT csv)",
+        "\n",
+    )
@@ -0,0 +1,168 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The process pool, writer thread and concurrent loader helper test cases.
+"""
+
+
+import threading
+import time
+from datetime import datetime
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from company_operation_data_gen.database import SBase
+from company_operation_data_gen.generate import insert_table, insert_table_chunks
+from company_operation_data_gen.models import PromotionDateSource
+from company_operation_data_gen.parallel import iter_pipelined, run_in_transactions
+from company_operation_data_gen.schemas import PromotionDateData, PromotionDateRecord
+
+
+def test_pipelined_order():
+    """Test the results keep the task order, whichever writer finishes first."""
+
+    def write(task):
+        time.sleep(0.01 * (task % 3))
+        return task, threading.current_thread().name
+
+    results = list(iter_pipelined(write, range(12), writers=3))
+
+    assert [task for task, _ in results] == list(range(12))
+    assert all(name.startswith("writer") for _, name in results)
+    assert list(iter_pipelined(lambda task: task * 2, range(3), writers=0)) == [0, 2, 4]
+
+
+def test_pipelined_backpressure():
+    """Test the tasks are only generated while fewer than the maximum are in flight."""
+    generated = []
+    consumed = []
+
+    def tasks():
+        for task in range(10):
+            assert len(generated) - len(consumed) <= 2
+            generated.append(task)
+            yield task
+
+    for result in iter_pipelined(
+        lambda task: task, tasks(), writers=2, max_in_flight=2
+    ):
+        consumed.append(result)
+
+    assert consumed == list(range(10))
+
+
+def test_pipelined_error():
+    """Test an error of a writer stops the generation and is raised."""
+    generated = []
+
+    def tasks():
+        for task in range(100):
+            generated.append(task)
+            yield task
+
+    def write(task):
+        if task == 3:
+            raise RuntimeError("The database is gone.")
+        return task
+
+    with pytest.raises(RuntimeError):
+        list(iter_pipelined(write, tasks(), writers=2, max_in_flight=2))
+    assert len(generated) < 10
+
+
+def test_insert_table_chunks_writers(tmp_path):
+    """Test the chunks are committed by the writer threads on their own sessions."""
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'writers.db'}")
+    SBase.metadata.create_all(engine)
+    chunks = (
+        PromotionDateData(
+            root=[
+                PromotionDateRecord(
+                    day_of_week=day_of_week,
+                    promotion_type="滿額折扣",
+                    published_at=datetime(2025, 3, week + 1),
+                )
+                for day_of_week in range(7)
+            ]
+        )
+        for week in range(4)
+    )
+
+    with Session(bind=engine) as db:
+        assert insert_table_chunks(db, PromotionDateSource, chunks, writers=2) == 28
+    with Session(bind=engine) as db:
+        assert db.query(PromotionDateSource).count() == 28
+    engine.dispose()
+
+
+def make_promotion_dates() -> PromotionDateData:
+    """Returns the promotion of every weekday."""
+    return PromotionDateData(
+        root=[
+            PromotionDateRecord(
+                day_of_week=day_of_week,
+                promotion_type="滿額折扣",
+                published_at=datetime(2025, 3, 1),
+            )
+            for day_of_week in range(7)
+        ]
+    )
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    """Creates the tables in a SQLite file, which every connection of the engine shares."""
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'loaders.db'}")
+    SBase.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_run_in_transactions(file_engine):
+    """Test the functions run at the same time on their own sessions, and are committed after all of them."""
+    barrier = threading.Barrier(2, timeout=5)
+
+    def load(db):
+        count = insert_table(
+            db, PromotionDateSource, make_promotion_dates(), commit=False
+        )
+        barrier.wait()
+        return count, threading.current_thread().name
+
+    def wait(db):
+        barrier.wait()
+        return 0, threading.current_thread().name
+
+    results = run_in_transactions(file_engine, {"load": load, "wait": wait})
+
+    assert results["load"][0] == 7
+    assert results["load"][1].startswith("loader")
+    assert results["wait"][1] != results["load"][1]
+    with Session(bind=file_engine) as db:
+        assert db.query(PromotionDateSource).count() == 7
+
+
+def test_run_in_transactions_failure(file_engine):
+    """Test a failing function rolls back the writes of the other functions."""
+    barrier = threading.Barrier(2, timeout=5)
+
+    def load(db):
+        count = insert_table(
+            db, PromotionDateSource, make_promotion_dates(), commit=False
+        )
+        barrier.wait()
+        return count
+
+    def fail(db):
+        barrier.wait()
+        raise RuntimeError("The database is gone.")
+
+    with pytest.raises(RuntimeError):
+        run_in_transactions(file_engine, {"load": load, "fail": fail})
+    with Session(bind=file_engine) as db:
+        assert db.query(PromotionDateSource).count() == 0
@@ -0,0 +1,97 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The monthly partition test cases.
+"""
+
+
+from datetime import date
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from company_operation_data_gen.database import ds
+from company_operation_data_gen.models import CustomerBehaviorSource, TransactionSource
+from company_operation_data_gen.partition import (
+    ensure_partitions,
+    iter_months,
+    next_month,
+    partition_name,
+)
+
+
+class FakeSession:
+    """A session of a PostgreSQL database whose tables are partitioned, which records the statements."""
+
+    def __init__(self):
+        self.engine = sa.create_engine("postgresql+psycopg2://user@localhost/db")
+        self.statements = []
+
+    def get_bind(self):
+        return self.engine
+
+    def execute(self, statement, parameters=None):
+        self.statements.append(str(statement))
+
+        class Result:
+            @staticmethod
+            def scalar():
+                return 1
+
+        return Result()
+
+
+def test_months():
+    """Test the months include both ends, across the end of a year."""
+    assert next_month(date(2024, 12, 31)) == date(2025, 1, 1)
+    assert iter_months(date(2024, 11, 15), date(2025, 1, 1)) == [
+        date(2024, 11, 1),
+        date(2024, 12, 1),
+        date(2025, 1, 1),
+    ]
+    assert partition_name(TransactionSource.__table__, date(2025, 3, 1)) == (
+        "transaction_2025_03"
+    )
+
+
+def test_ensure_partitions():
+    """Test the missing partitions of each month are created on PostgreSQL, and nothing is done on SQLite."""
+    session = FakeSession()
+
+    assert ensure_partitions(session, date(2025, 3, 17), date(2025, 4, 1)) == [
+        "customer_behavior_2025_03",
+        "customer_behavior_2025_04",
+        "transaction_2025_03",
+        "transaction_2025_04",
+    ]
+    creates = [
+        statement
+        for statement in session.statements
+        if statement.startswith("CREATE TABLE")
+    ]
+    assert creates[0] == (
+        "CREATE TABLE IF NOT EXISTS customer_behavior_2025_03 PARTITION OF customer_behavior"
+        " FOR VALUES FROM ('2025-03-01') TO ('2025-04-01')"
+    )
+    assert len(creates) == 4
+
+    test_session = ds.get_db(env="test")
+    assert ensure_partitions(test_session, date(2025, 3, 17), date(2025, 4, 1)) == []
+    test_session.close()
+
+
+def test_partitioned_tables():
+    """Test the time-series tables are partitioned by their timestamp with a BRIN index on PostgreSQL only."""
+    for model, column in [
+        (CustomerBehaviorSource, "action_at"),
+        (TransactionSource, "transaction_at"),
+    ]:
+        table = model.__table__
+        create = str(sa.schema.CreateTable(table).compile(dialect=postgresql.dialect()))
+        assert create.rstrip().endswith(f"PARTITION BY RANGE ({column})")
+        (index,) = table.indexes
+        assert index.dialect_options["postgresql"]["using"] == "brin"
+        assert [indexed.name for indexed in index.columns] == [column]
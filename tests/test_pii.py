@@ -0,0 +1,65 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The bulk personal data test cases.
+"""
+
+
+import re
+from datetime import date
+
+import numpy as np
+
+from company_operation_data_gen.constants import CustomerAttributeConstants
+from company_operation_data_gen.pii import pii_gen
+from company_operation_data_gen.schemas import CustomerRecord
+
+
+def test_pii_columns():
+    """Test every column has one value per customer, and the values are valid customer fields."""
+    columns = pii_gen.generate(1_000, rng=np.random.default_rng(7))
+
+    assert set(columns) == {
+        "customer_name",
+        "gender",
+        "birth",
+        "email",
+        "phone_number",
+        "city",
+    }
+    assert all(len(column) == 1_000 for column in columns.values())
+    assert set(columns["gender"].tolist()) == set(CustomerAttributeConstants.GENDER)
+    assert set(columns["city"].tolist()) <= set(CustomerAttributeConstants.CITY)
+    for email in columns["email"].tolist():
+        assert re.fullmatch(r"[a-z\-]+\.[a-z\-]+\d{1,2}@example\.(org|com|net)", email)
+    for phone_number in columns["phone_number"].tolist():
+        assert re.fullmatch(r"[\d()\- ]+", phone_number)
+        assert phone_number.startswith(("0", "(0"))
+
+    CustomerRecord(
+        customer_id="a001",
+        registered_at=date(2025, 3, 17),
+        **{field: column[0].item() for field, column in columns.items()},
+    )
+
+
+def test_pii_birth():
+    """Test the customers are between the minimum and maximum ages."""
+    columns = pii_gen.generate(
+        10_000, rng=np.random.default_rng(7), today=date(2025, 3, 18)
+    )
+
+    assert columns["birth"].min() > np.datetime64("1954-03-18")
+    assert columns["birth"].max() <= np.datetime64("2009-03-18")
+
+
+def test_pii_seed():
+    """Test the same random number generator seed gives the same customers."""
+    first = pii_gen.generate(100, rng=np.random.default_rng(7))
+    second = pii_gen.generate(100, rng=np.random.default_rng(7))
+
+    for field in first:
+        assert first[field].tolist() == second[field].tolist()
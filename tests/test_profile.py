@@ -0,0 +1,65 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The scale profile test cases.
+"""
+
+
+import pytest
+
+from company_operation_data_gen.constants import (
+    BehaviorCountConstants,
+    CrawlerConstants,
+)
+from company_operation_data_gen.profile import (
+    get_profile,
+    list_profiles,
+    load_profile,
+    set_profile,
+)
+
+
+@pytest.fixture
+def restore_profile():
+    """Restores the default profile after the test."""
+    yield
+    set_profile(load_profile("default"))
+
+
+def test_default_profile():
+    """Test the default profile keeps the volumes of the constants."""
+    profile = load_profile("default")
+
+    assert profile.customer_count_init == 100
+    assert profile.customer_count_min == 5
+    assert profile.customer_count_max == 15
+    assert profile.crawler_pages == CrawlerConstants.PAGES
+    assert profile.engine == "loop"
+    assert profile.workers == 1
+    assert (
+        profile.scale_behavior(BehaviorCountConstants.GIFT_BEHAVIOR_AVG)
+        == BehaviorCountConstants.GIFT_BEHAVIOR_AVG
+    )
+
+
+def test_xl_profile():
+    """Test the xl profile generates more than ten million behaviors on the busiest days."""
+    assert {"default", "xl"} <= set(list_profiles())
+
+    profile = load_profile("xl")
+    assert profile.engine == "vectorized"
+    assert profile.scale_behavior(BehaviorCountConstants.GIFT_BEHAVIOR_AVG) >= 10**7
+
+
+def test_set_profile(restore_profile):
+    """Test the profile of the run can be switched, and an unknown profile is rejected."""
+    assert get_profile().name == "default"
+
+    set_profile(load_profile("large"))
+    assert get_profile().name == "large"
+
+    with pytest.raises(ValueError):
+        load_profile("huge")
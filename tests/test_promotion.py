@@ -10,10 +10,17 @@ The promotion data test cases.
 
 import os
 import yaml
+from datetime import datetime, timedelta, timezone
 
+import numpy as np
 import pytest
 
-from company_operation_data_gen.promotion import promotion_choose
+from company_operation_data_gen.promotion import (
+    PromotionCalendar,
+    load_promotion_calendar,
+    promotion_choose,
+)
+from company_operation_data_gen.promotion_index import PromotionIndex
 from company_operation_data_gen.database import ds, SBase
 from company_operation_data_gen.models import PromotionDateSource, PromotionSource
 from company_operation_data_gen.schemas import (
@@ -59,13 +66,16 @@ def setup_test_db():
 
     yield session
 
+    session.query(PromotionDateSource).delete()
+    session.query(PromotionSource).delete()
+    session.commit()
     session.close()
 
 
 def test_promotion_choose(setup_test_db):
     test_weekday = 5
     promotion_constants = promotion_choose.get_promotion_constants(
-        today_weekday=test_weekday, session=setup_test_db
+        yesterday_weekday=test_weekday, session=setup_test_db
     )
 
     assert isinstance(promotion_constants, PromotionConstants)
@@ -82,3 +92,139 @@ def test_promotion_choose(setup_test_db):
     promotion_data = promotion_constants.promotion_detail.root
     actual_promotion_names = {promotion.promotion_name for promotion in promotion_data}
     assert actual_promotion_names == expected_promotion_names
+
+
+def test_promotion_calendar(setup_test_db):
+    """Test the calendar answers the promotion in effect at any time, from the publications before it."""
+    assert (
+        load_promotion_calendar(setup_test_db).get_promotion_constants(5).promotion_type
+        == "免運滿額贈"
+    )
+    promotions = [
+        PromotionRecord.model_validate(promotion)
+        for promotion in setup_test_db.query(PromotionSource).all()
+    ]
+    later = datetime(2025, 3, 1)
+    calendar = PromotionCalendar(
+        schedule={
+            0: [(datetime(2024, 11, 15), "滿額折扣"), (later, "多件優惠")],
+            5: [(datetime(2024, 11, 15), "免運滿額贈")],
+        },
+        promotions=promotions
+        + [
+            PromotionRecord(
+                promotion_id=7,
+                promotion_name="滿3件打95折",
+                promotion_type="多件優惠",
+                cash_threshold=None,
+                quantity_threshold=3,
+                discount_rate=0.05,
+                gift=None,
+                published_at=later,
+            )
+        ],
+    )
+
+    before = calendar.get_promotion_constants(0, effective_at=datetime(2025, 2, 1))
+    assert before.promotion_type == "滿額折扣"
+    assert {promotion.promotion_name for promotion in before.promotion_detail.root} == {
+        "滿1000打9折",
+        "滿2000打8折",
+    }
+    assert (
+        calendar.get_promotion_constants(0, effective_at=datetime(2024, 1, 1)) is None
+    )
+    assert calendar.get_promotion_constants(
+        0, effective_at=datetime(2024, 11, 15)
+    ) is calendar.get_promotion_constants(0, effective_at=datetime(2024, 12, 1))
+
+    after = calendar.get_promotion_constants(0, effective_at=datetime(2025, 3, 2))
+    assert after is calendar.get_promotion_constants(0)
+    assert after.promotion_type == "多件優惠"
+    assert after.behavior_avg == BehaviorCountConstants.MULTI_BEHAVIOR_AVG
+    assert [promotion.promotion_name for promotion in after.promotion_detail.root] == [
+        "滿3件打95折"
+    ]
+
+    with pytest.raises(ValueError):
+        calendar.get_promotion_constants(3)
+
+
+class AwareSession:
+    """A session which returns the publication times as aware times, like PostgreSQL does for TIMESTAMPTZ."""
+
+    def __init__(self, session):
+        zone = timezone(timedelta(hours=8))
+        self.schedule = [
+            (day_of_week, promotion_type, published_at.replace(tzinfo=zone))
+            for day_of_week, promotion_type, published_at in session.query(
+                PromotionDateSource.day_of_week,
+                PromotionDateSource.promotion_type,
+                PromotionDateSource.published_at,
+            )
+        ]
+        self.promotions = [
+            PromotionRecord.model_validate(promotion).model_copy(
+                update={"published_at": promotion.published_at.replace(tzinfo=zone)}
+            )
+            for promotion in session.query(PromotionSource).all()
+        ]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, statement):
+        return self.schedule
+
+    def scalars(self, statement):
+        return self.promotions
+
+
+def test_promotion_calendar_aware(setup_test_db):
+    """Test the aware publication times of PostgreSQL are looked up with the naive day ends of the backfill."""
+    calendar = load_promotion_calendar(AwareSession(setup_test_db))
+
+    promotion = calendar.get_promotion_constants(5, effective_at=datetime(2025, 3, 18))
+    assert promotion.promotion_type == "免運滿額贈"
+    assert all(
+        record.published_at.tzinfo is None for record in promotion.promotion_detail.root
+    )
+
+
+def test_promotion_index():
+    """Test the lookup table chooses the promotion with the highest threshold reached, for one or many transactions."""
+    current_dir = os.path.dirname(__file__)
+    file_path = os.path.join(current_dir, "fixtures", "test_data.yaml")
+    with open(file_path, "r") as f:
+        data = yaml.safe_load(f)
+    promotions = [PromotionRecord(**record) for record in data["promotion"]]
+
+    multi = PromotionIndex(
+        "多件優惠",
+        [promo for promo in promotions if promo.promotion_type == "多件優惠"],
+    )
+    assert multi.select(quantity=4, amount=5000) is None
+    assert multi.select(quantity=5, amount=0).promotion_name == "滿5件打9折"
+    assert multi.select(quantity=9, amount=0).promotion_name == "滿8件打8件"
+    assert multi.select(quantity=15, amount=0).promotion_name == "滿10件打7件"
+
+    quantity = np.array([4, 5, 9, 15])
+    amount = np.array([1000, 1250, 2250, 3750])
+    discount, gift, total = multi.apply(quantity, amount)
+    assert discount.tolist() == [0, 125, 450, 1125]
+    assert gift.tolist() == [None, None, None, None]
+    assert total.tolist() == (amount - discount).tolist()
+
+    gift_index = PromotionIndex(
+        "免運滿額贈",
+        [promo for promo in promotions if promo.promotion_type == "免運滿額贈"],
+    )
+    discount, gift, total = gift_index.apply(
+        np.array([1, 1, 1]), np.array([999, 1000, 2500])
+    )
+    assert discount.tolist() == [0, 0, 0]
+    assert gift.tolist() == [None, "零食", "毛毯"]
+    assert total.tolist() == [999, 1000, 2500]
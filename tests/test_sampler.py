@@ -0,0 +1,71 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The weighted sampler test cases.
+"""
+
+
+import random
+
+import numpy as np
+import pytest
+
+from company_operation_data_gen.sampler import (
+    AliasSampler,
+    popularity_sampler,
+    zipf_weights,
+)
+
+
+def test_alias_sampler():
+    """Test the draws follow the weights, both in batches and one at a time."""
+    weights = [0.5, 0.0, 0.3, 0.2]
+    sampler = AliasSampler(weights)
+    assert len(sampler) == 4
+
+    draws = sampler.draw(np.random.default_rng(7), 200_000)
+    frequencies = np.bincount(draws, minlength=4) / len(draws)
+    assert np.allclose(frequencies, weights, atol=0.01)
+
+    random.seed(7)
+    draws = [sampler.draw_one() for _ in range(50_000)]
+    frequencies = np.bincount(draws, minlength=4) / len(draws)
+    assert np.allclose(frequencies, weights, atol=0.01)
+
+
+def test_alias_sampler_many_outcomes():
+    """Test the pairing of many small and large columns at once keeps the weights."""
+    weights = np.random.default_rng(3).random(1_000) ** 4
+    sampler = AliasSampler(weights)
+
+    draws = sampler.draw(np.random.default_rng(7), 2_000_000)
+    frequencies = np.bincount(draws, minlength=len(weights)) / len(draws)
+    assert np.allclose(frequencies, weights / weights.sum(), atol=0.001)
+
+    sampler = popularity_sampler(100_000, 1.0)
+    draws = sampler.draw(np.random.default_rng(7), 2_000_000)
+    frequencies = np.bincount(draws, minlength=100_000) / len(draws)
+    weights = zipf_weights(100_000, 1.0)
+    assert np.allclose(frequencies[:10], weights[:10] / weights.sum(), atol=0.002)
+
+
+def test_alias_sampler_invalid_weights():
+    """Test the sampler rejects the weights which are not a distribution."""
+    for weights in [[], [0.0, 0.0], [0.5, -0.1]]:
+        with pytest.raises(ValueError):
+            AliasSampler(weights)
+
+
+def test_popularity_sampler():
+    """Test the uniform popularity needs no sampler, and the Zipf popularity favors the first items."""
+    assert popularity_sampler(10, 0.0) is None
+    assert popularity_sampler(0, 1.0) is None
+
+    sampler = popularity_sampler(3, 1.0)
+    draws = sampler.draw(np.random.default_rng(7), 200_000)
+    frequencies = np.bincount(draws, minlength=3) / len(draws)
+    weights = zipf_weights(3, 1.0)
+    assert np.allclose(frequencies, weights / weights.sum(), atol=0.01)
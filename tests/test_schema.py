@@ -0,0 +1,69 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The versioned schema manager test cases.
+"""
+
+
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from company_operation_data_gen.database import SBase
+from company_operation_data_gen.models import SchemaVersionSource
+from company_operation_data_gen.schema import SCHEMA_VERSION, SchemaManager
+
+
+def test_ensure_schema(tmp_path):
+    """Test a new database gets every table, index and version, and is only checked once per process."""
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    manager = SchemaManager()
+    statements = []
+    sa.event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    with Session(bind=engine) as db:
+        assert manager.ensure_schema(db) == 0
+        statement_count = len(statements)
+        assert manager.ensure_schema(db) == SCHEMA_VERSION
+        assert len(statements) == statement_count
+        assert [row.version for row in db.query(SchemaVersionSource).all()] == list(
+            range(1, SCHEMA_VERSION + 1)
+        )
+
+    inspector = sa.inspect(engine)
+    assert set(inspector.get_table_names()) == set(SBase.metadata.tables)
+    assert [index["name"] for index in inspector.get_indexes("product")] == [
+        "product_category_idx"
+    ]
+    engine.dispose()
+
+
+def test_ensure_schema_upgrade(tmp_path):
+    """Test a database of an earlier version only gets the missing migrations."""
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    SBase.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(sa.text("DROP INDEX customer_registered_at_idx"))
+        connection.execute(
+            sa.insert(SchemaVersionSource.__table__).values(
+                version=1, applied_at=datetime(2025, 3, 17)
+            )
+        )
+
+    with Session(bind=engine) as db:
+        assert SchemaManager().ensure_schema(db) == 1
+        assert db.get(SchemaVersionSource, 1).applied_at == datetime(2025, 3, 17)
+        assert db.query(SchemaVersionSource).count() == SCHEMA_VERSION
+
+    assert [index["name"] for index in sa.inspect(engine).get_indexes("customer")] == [
+        "customer_registered_at_idx"
+    ]
+    engine.dispose()
@@ -0,0 +1,239 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The staged merge loader test cases.
+"""
+
+
+from datetime import datetime
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from sqlalchemy.dialects import postgresql
+
+from company_operation_data_gen.database import ds, SBase
+from company_operation_data_gen import generate
+from company_operation_data_gen.generate import insert_activity_chunk, insert_table
+from company_operation_data_gen.loader import supports_concurrent_load
+from company_operation_data_gen.models import (
+    CustomerBehaviorSource,
+    ProductSource,
+    TransactionSource,
+)
+from company_operation_data_gen.profile import get_profile, set_profile
+from company_operation_data_gen.schemas import (
+    CustomerActivityData,
+    CustomerBehaviorData,
+    CustomerBehaviorRecord,
+    ProductRecord,
+    TransactionData,
+    TransactionRecord,
+)
+from company_operation_data_gen.staging import create_staging_table, merge_statement
+
+
+def make_activity(transaction_count: int = 1) -> CustomerActivityData:
+    """Returns a purchase, with the same transaction repeated the given times."""
+    purchased_at = datetime(2025, 3, 17, 8, 0)
+    return CustomerActivityData(
+        customer_behavior=CustomerBehaviorData(
+            root=[
+                CustomerBehaviorRecord(
+                    customer_id="a001",
+                    product_id="p001",
+                    action_type=action_type,
+                    device_type="mobile",
+                    referrer="direct",
+                    action_at=purchased_at.replace(minute=minute),
+                )
+                for minute, action_type in enumerate(["view", "purchase"])
+            ]
+        ),
+        transaction=TransactionData(
+            root=[
+                TransactionRecord(
+                    customer_id="a001",
+                    product_id="p001",
+                    quantity=1,
+                    promotion_price=100,
+                    amount=100,
+                    discount=0,
+                    gift=None,
+                    total=100,
+                    transaction_at=purchased_at.replace(minute=1),
+                )
+            ]
+            * transaction_count
+        ),
+    )
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    """Creates the tables in a SQLite file, which every connection of the engine shares."""
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'staging.db'}")
+    SBase.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_insert_activity_chunk(file_engine):
+    """Test both tables are committed, loaded in turn on SQLite, and no staging tables are left."""
+    with Session(bind=file_engine) as db:
+        assert insert_activity_chunk(db, make_activity(), concurrent=True) == (2, 1)
+        assert db.query(CustomerBehaviorSource).count() == 2
+        assert db.query(TransactionSource).count() == 1
+
+    assert set(sa.inspect(file_engine).get_table_names()) == set(SBase.metadata.tables)
+
+
+def test_insert_activity_chunk_failure(file_engine):
+    """Test a table which fails to insert leaves the other table unchanged too."""
+    with Session(bind=file_engine) as db:
+        with pytest.raises(sa.exc.IntegrityError):
+            insert_activity_chunk(db, make_activity(2), concurrent=True)
+        db.rollback()
+        assert db.query(CustomerBehaviorSource).count() == 0
+        assert db.query(TransactionSource).count() == 0
+
+
+def test_insert_activity_chunk_opt_in(file_engine, monkeypatch):
+    """Test the tables are only loaded concurrently when the profile opts in."""
+    calls = []
+
+    def run_in_transactions(bind, functions):
+        calls.append(sorted(functions))
+        with Session(bind=bind) as db:
+            counts = {name: function(db) for name, function in functions.items()}
+            db.commit()
+        return counts
+
+    monkeypatch.setattr(generate, "supports_concurrent_load", lambda db: True)
+    monkeypatch.setattr(generate, "run_in_transactions", run_in_transactions)
+    profile = get_profile()
+    with Session(bind=file_engine) as db:
+        assert not profile.concurrent_load
+        assert insert_activity_chunk(db, make_activity()) == (2, 1)
+        assert calls == []
+
+        set_profile(profile.model_copy(update={"concurrent_load": True}))
+        try:
+            assert insert_activity_chunk(
+                db, make_activity(), on_conflict="nothing"
+            ) == (0, 0)
+        finally:
+            set_profile(profile)
+        assert calls == [["customer_behavior", "transaction"]]
+
+
+def test_staging_table():
+    """Test the staging table keeps the columns but not the keys, and is unlogged on PostgreSQL only."""
+    staging = create_staging_table(
+        TransactionSource.__table__, sa.MetaData(), "postgresql", "t1"
+    )
+    assert staging.name == "transaction_staging_t1"
+    assert staging.c.keys() == TransactionSource.__table__.c.keys()
+    assert not staging.primary_key.columns
+    assert staging._prefixes == ["UNLOGGED"]
+    assert (
+        create_staging_table(
+            TransactionSource.__table__, sa.MetaData(), "sqlite", "t1"
+        )._prefixes
+        == []
+    )
+
+    session = ds.get_db(env="test")
+    assert not supports_concurrent_load(session)
+    session.close()
+
+
+def make_product(price: int) -> ProductRecord:
+    """Returns a product with the given price."""
+    return ProductRecord(
+        product_id="p001",
+        product_name="貓砂",
+        brand_name=None,
+        category="貓砂",
+        price=price,
+        promotion_price=price,
+        fetched_at=datetime(2025, 3, 17),
+    )
+
+
+def test_insert_table_on_conflict():
+    """Test a rerun skips or overwrites the existing records instead of failing on their keys."""
+    session = ds.get_db(env="test")
+    SBase.metadata.create_all(session.get_bind())
+    session.query(ProductSource).delete()
+    session.commit()
+
+    assert insert_table(session, ProductSource, [make_product(100)]) == 1
+    with pytest.raises(sa.exc.IntegrityError):
+        insert_table(session, ProductSource, [make_product(100)], on_conflict="error")
+    session.rollback()
+    assert (
+        insert_table(
+            session,
+            ProductSource,
+            [make_product(120), make_product(100)],
+            on_conflict="nothing",
+        )
+        == 0
+    )
+    assert session.get(ProductSource, "p001").price == 100
+    assert (
+        insert_table(session, ProductSource, [make_product(120)], on_conflict="update")
+        == 1
+    )
+    session.expire_all()
+    assert session.get(ProductSource, "p001").price == 120
+    assert set(sa.inspect(session.get_bind()).get_table_names()) == set(
+        SBase.metadata.tables
+    )
+
+    session.query(ProductSource).delete()
+    session.commit()
+    session.close()
+
+
+def test_insert_activity_chunk_rerun(file_engine):
+    """Test a rerun of a committed chunk merges nothing with "nothing"."""
+    with Session(bind=file_engine) as db:
+        assert insert_activity_chunk(db, make_activity()) == (2, 1)
+        assert insert_activity_chunk(db, make_activity(), on_conflict="nothing") == (
+            0,
+            0,
+        )
+        assert db.query(CustomerBehaviorSource).count() == 2
+
+    assert set(sa.inspect(file_engine).get_table_names()) == set(SBase.metadata.tables)
+
+
+def test_merge_statement():
+    """Test PostgreSQL merges a repeated key once on update, and the unknown modes fail."""
+    table = TransactionSource.__table__
+    staging = create_staging_table(table, sa.MetaData(), "postgresql", "t1")
+    statement = str(
+        merge_statement(table, staging, "postgresql", "update").compile(
+            dialect=postgresql.dialect()
+        )
+    )
+
+    assert (
+        "row_number() OVER (PARTITION BY transaction_staging_t1.customer_id, "
+        in statement
+    )
+    assert "WHERE anon_1.key_rank = %(key_rank_1)s" in statement
+    assert statement.endswith("total = excluded.total")
+    assert (
+        "ON CONFLICT (customer_id, product_id, transaction_at) DO UPDATE" in statement
+    )
+    with pytest.raises(ValueError):
+        merge_statement(table, staging, "postgresql", "replace")
+    with pytest.raises(ValueError):
+        merge_statement(table, staging, "mysql", "nothing")
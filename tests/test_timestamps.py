@@ -0,0 +1,97 @@
+# The Data Generator for company operations data.
+# Authors:
+#   Hailey Hsiao, 2025
+
+
+"""
+The timestamp generator test cases.
+"""
+
+
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from company_operation_data_gen.timestamps import (
+    DayWindow,
+    draw_funnel_offsets,
+    random_time_after,
+)
+
+
+def test_day_window():
+    """Test the window is the previous day, wherever the current time falls in the day."""
+    assert DayWindow.previous_day(now=datetime(2025, 3, 18, 0, 0, 1)) == DayWindow(
+        start=datetime(2025, 3, 17)
+    )
+    assert DayWindow.previous_day(
+        now=datetime(2025, 3, 18, 23, 59, 59)
+    ) == DayWindow.of(datetime(2025, 3, 17, 12, 30))
+    assert DayWindow.of(datetime(2025, 3, 17, 12, 30)).weekday == 0
+
+
+def test_draw_times():
+    """Test the times of a batch fall in the day, to the second."""
+    window = DayWindow(start=datetime(2025, 3, 17))
+    times = window.draw_times(np.random.default_rng(7), 10_000)
+
+    assert times.dtype == np.dtype("datetime64[us]")
+    assert times.min() >= np.datetime64("2025-03-17T00:00:00")
+    assert times.max() <= np.datetime64("2025-03-17T23:59:59")
+    assert np.all(times.astype("datetime64[s]") == times)
+
+    random.seed(7)
+    for _ in range(1_000):
+        time = window.random_time()
+        assert window.start <= time < window.start + timedelta(days=1)
+        assert time.microsecond == 0
+
+
+def test_draw_times_unit():
+    """Test the times are drawn to the millisecond with the millisecond unit."""
+    window = DayWindow.previous_day(now=datetime(2025, 3, 18), unit="ms")
+    times = window.draw_times(np.random.default_rng(7), 10_000)
+
+    assert times.min() >= np.datetime64("2025-03-17T00:00:00")
+    assert times.max() < np.datetime64("2025-03-18T00:00:00")
+    assert np.all(times.astype("datetime64[ms]") == times)
+    assert np.any(times.astype("datetime64[s]") != times)
+
+    random.seed(7)
+    times = [window.random_time() for _ in range(1_000)]
+    assert all(time.microsecond % 1_000 == 0 for time in times)
+    assert any(time.microsecond != 0 for time in times)
+
+
+def test_split_ticks():
+    """Test the spans of the shards follow each other over the whole day, in proportion to the sizes."""
+    window = DayWindow(start=datetime(2025, 3, 17))
+    spans = window.split_ticks([3, 3, 2])
+
+    assert spans == [(0, 32_400), (32_400, 64_800), (64_800, 86_400)]
+    times = window.draw_times(np.random.default_rng(7), 1_000, span=spans[1])
+    assert times.min() >= np.datetime64("2025-03-17T09:00:00")
+    assert times.max() < np.datetime64("2025-03-17T18:00:00")
+    assert window.split_ticks([0]) == [(0, 1)]
+
+    random.seed(7)
+    times = [window.random_time(span=spans[1]) for _ in range(1_000)]
+    assert min(times) >= datetime(2025, 3, 17, 9)
+    assert max(times) < datetime(2025, 3, 17, 18)
+
+
+def test_funnel_offsets():
+    """Test each funnel step happens five minutes to two hours after the previous step."""
+    offsets = draw_funnel_offsets(np.random.default_rng(7), 10_000, steps=2)
+    seconds = offsets.astype(np.int64)
+
+    assert offsets.shape == (10_000, 2)
+    gaps = np.diff(seconds, axis=1, prepend=0)
+    assert gaps.min() >= 300
+    assert gaps.max() <= 7200
+
+    start_time = datetime(2025, 3, 17, 23, 0)
+    for _ in range(1_000):
+        gap = random_time_after(start_time) - start_time
+        assert timedelta(minutes=5) <= gap <= timedelta(hours=2)
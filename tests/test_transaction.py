@@ -91,9 +91,43 @@ def setup_test_db():
 
     yield session
 
+    session.query(CustomerSource).delete()
+    session.query(ProductSource).delete()
+    session.commit()
     session.close()
 
 
+def test_iter_generate_time_order(setup_test_db):
+    """Test the chunks draw their views from consecutive spans of the day, so that they are in time order."""
+    chunks = list(
+        activity_gen.iter_generate(
+            promotion_constants,
+            chunk_size=7,
+            session=setup_test_db,
+            day=datetime(2025, 3, 17),
+            rng=random.Random(3),
+        )
+    )
+    assert len(chunks) > 1
+    views = []
+    for chunk in chunks:
+        times = [behavior.action_at for behavior in chunk.customer_behavior.root]
+        assert times == sorted(times)
+        views.append(
+            [
+                behavior.action_at
+                for behavior in chunk.customer_behavior.root
+                if behavior.action_type == "view"
+            ]
+        )
+    assert all(len(chunk_views) <= 7 for chunk_views in views)
+    assert all(
+        max(earlier) <= min(later)
+        for earlier, later in zip(views, views[1:])
+        if earlier and later
+    )
+
+
 class TestGenerate:
     def test_generate(self, setup_test_db):
         activity: CustomerActivityData = activity_gen.generate(